@@ -116,6 +116,13 @@ def configure_style():
         foreground=colours["fg0"],
         pady=10,
     )
+    style.configure(
+        "Std.Horizontal.TProgressbar",
+        background=colours["accent1"],
+        troughcolor=colours["bg1"],
+        bordercolor=colours["bg0"],
+        relief="flat",
+    )
     style.configure(
         "Cell.TEntry",
         background=colours["bg1"],
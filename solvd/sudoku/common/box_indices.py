@@ -157,3 +157,16 @@ def calculate_tripledoku(): ...
 
 
 def calculate_twodoku(): ...
+
+
+def calculate_9x9(row: int, col: int) -> int:
+    """Calculate the box value for cells in a 9 x 9 variant with 3 x 3 boxes.
+
+    Args:
+        row: row value of the cell.
+        col: column value of the cell.
+
+    Returns:
+        box value of the cell.
+    """
+    return (row // 3) * 3 + col // 3
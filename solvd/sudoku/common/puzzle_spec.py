@@ -0,0 +1,148 @@
+"""Description of a sudoku puzzle's layout, independent of the UI."""
+
+import re
+
+import solvd.sudoku.common.box_indices as common_bi
+import solvd.sudoku.common.box_lookup_tables as box_lookup
+import solvd.sudoku.common.sudoku_var as common_sv
+
+MULTIDOKU_LOOKUPS = {
+    "Butterfly Sudoku": box_lookup.BUTTERFLY_LOOKUP,
+    "Cross Sudoku": box_lookup.CROSS_LOOKUP,
+    "Flower Sudoku": box_lookup.FLOWER_LOOKUP,
+    "Gattai-3": box_lookup.GATTAI_LOOKUP,
+    "Kazaguruma": box_lookup.KAZAGURUMA_LOOKUP,
+    "Samurai Sudoku": box_lookup.SAMURAI_LOOKUP,
+    "Sohei Sudoku": box_lookup.SOHEI_LOOKUP,
+}
+
+MULTIDOKU_DIMENSIONS = {
+    "Butterfly Sudoku": 12,
+    "Cross Sudoku": 21,
+    "Flower Sudoku": 15,
+    "Gattai-3": 15,
+    "Kazaguruma": 21,
+    "Samurai Sudoku": 21,
+    "Sohei Sudoku": 21,
+    "Tripledoku": 15,
+    "Twodoku": 15,
+}
+
+VARIANT_DIMENSIONS = {
+    "Argyle Sudoku": 9,
+    "Asterisk Sudoku": 9,
+    "Center Dot Sudoku": 9,
+    "Chain Sudoku": 9,
+    "Chain Sudoku 6 x 6": 6,
+    "Consecutive Sudoku": 9,
+    "Even-Odd Sudoku": 9,
+    "Girandola Sudoku": 9,
+    "Greater Than Sudoku": 9,
+    "Jigsaw Sudoku": 9,
+    "Killer Sudoku": 9,
+    "Little Killer Sudoku": 9,
+    "Rossini Sudoku": 9,
+    "Skyscraper Sudoku": 9,
+    "Sudoku DG": 9,
+    "Sudoku Mine": 9,
+    "Sudoku X": 9,
+    "Sudoku XV": 9,
+    "Sujiken": 9,
+    "Vudoku": 9,
+    "Windoku": 9,
+}
+
+STANDARD_PATTERN = re.compile(r"(\d+) x \1( \((wide|tall) boxes\))?")
+
+# pseudo-boolean encodings of the sums of Little Killer diagonals, named as in
+# pysat.pb.EncType, with the default first
+PB_ENCODINGS = ("bdd", "sortnetwrk", "adder")
+
+
+class PuzzleSpec:
+    """The parts of a sudoku puzzle needed to solve it, without any UI.
+
+    Has the attributes the solving backend reads from a PuzzlePage, so it can
+    be passed to it in place of one.
+
+    Attributes:
+        subtype: subtype of sudoku, named as in the configure page (e.g.
+            "9 x 9", "6 x 6 (wide boxes)", "Samurai Sudoku").
+        type: type of sudoku (standard, multidoku, variant).
+        dimension: width of the puzzle (number of cells).
+        ratio: shape of the boxes of a standard sudoku (square, wide, tall).
+        max_num: highest number a cell can take.
+        constraints: the clues of a variant other than the cells' values,
+            e.g. the cages of a Killer Sudoku.
+        pb_encoding: encoding of pseudo-boolean constraints, e.g. the sums of
+            Little Killer diagonals. One of PB_ENCODINGS.
+    """
+
+    def __init__(
+        self,
+        subtype: str,
+        constraints: list[common_sv.Constraint] | None = None,
+        pb_encoding: str = PB_ENCODINGS[0],
+    ):
+        """Create the PuzzleSpec.
+
+        Args:
+            subtype: subtype of sudoku, named as in the configure page.
+            constraints: the clues of a variant other than the cells'
+                values. None if there are none.
+            pb_encoding: encoding of pseudo-boolean constraints, one of
+                PB_ENCODINGS.
+
+        Raises:
+            ValueError: if the subtype or encoding is not recognised.
+        """
+        if pb_encoding not in PB_ENCODINGS:
+            raise ValueError(f"Unknown pseudo-boolean encoding: {pb_encoding}")
+        self.subtype = subtype
+        self.constraints = [] if constraints is None else constraints
+        self.pb_encoding = pb_encoding
+        self.ratio = "square"
+        if subtype in MULTIDOKU_DIMENSIONS:
+            self.type = "multidoku"
+            self.dimension = MULTIDOKU_DIMENSIONS[subtype]
+            self.max_num = 9
+        elif subtype in VARIANT_DIMENSIONS:
+            self.type = "variant"
+            self.dimension = VARIANT_DIMENSIONS[subtype]
+            self.max_num = self.dimension
+            if self.dimension == 6:
+                self.ratio = "wide"
+        else:
+            match = STANDARD_PATTERN.fullmatch(subtype)
+            if match is None:
+                raise ValueError(f"Unknown sudoku subtype: {subtype}")
+            self.type = "standard"
+            self.dimension = int(match.group(1))
+            self.max_num = self.dimension
+            if match.group(3) is not None:
+                self.ratio = match.group(3)
+
+    def __str__(self) -> str:
+        return self.subtype
+
+    def cells(self) -> list[tuple[int, int, int]]:
+        """List the cells that make up the puzzle.
+
+        Returns:
+            the row, column and box of every cell, in row-major order.
+
+        Raises:
+            NotImplementedError: if the layout of the subtype is not known yet.
+        """
+        if self.type == "multidoku":
+            if self.subtype not in MULTIDOKU_LOOKUPS:
+                raise NotImplementedError(f"No layout for {self.subtype}")
+            lookup = MULTIDOKU_LOOKUPS[self.subtype]
+            return [
+                (row, col, lookup[(row, col)]) for row, col in sorted(lookup)
+            ]
+        return [
+            (row, col, common_bi.calculate_standard(self, col, row))
+            for row in range(self.dimension)
+            for col in range(self.dimension)
+        ]
@@ -1,5 +1,7 @@
 """Miscellaneous data structures/classes"""
 
+from typing import ClassVar
+
 
 class SudokuVar:
     """Represents a Sudoku cell in an abstract way.
@@ -27,3 +29,224 @@ class SudokuVar:
 
     def __str__(self) -> str:
         return f"v {self.value}, r {self.row}, c {self.col}, b {self.box}"
+
+
+class Cage:
+    """A cage of a Killer Sudoku, whose values add up to its total.
+
+    No value is repeated within a cage.
+
+    Attributes:
+        cells: the row and column of each of the cage's cells.
+        total: the sum of the cage's values.
+    """
+
+    def __init__(self, cells: list[tuple[int, int]], total: int):
+        """Create the Cage.
+
+        Args:
+            cells: the row and column of each of the cage's cells.
+            total: the sum of the cage's values.
+        """
+        self.cells = cells
+        self.total = total
+
+    def __str__(self) -> str:
+        cells = " ".join(f"r {row} c {col}" for row, col in sorted(self.cells))
+        return f"cage {self.total}: {cells}"
+
+
+class Line:
+    """A clue outside the grid about the line of cells it looks along.
+
+    The line runs straight from the edge of the grid next to the clue
+    until it leaves the grid.
+
+    Attributes:
+        start: the row and column of the line's first cell, on the edge of
+            the grid next to the clue.
+        direction: the step in rows and in columns (each -1, 0 or 1) from
+            one cell of the line to the next.
+    """
+
+    def __init__(self, start: tuple[int, int], direction: tuple[int, int]):
+        """Create the Line.
+
+        Args:
+            start: the row and column of the line's first cell.
+            direction: the step in rows and in columns from one cell of the
+                line to the next.
+        """
+        self.start = start
+        self.direction = direction
+
+    def cells(self, dimension: int) -> list[tuple[int, int]]:
+        """List the cells of the line, from its start to the grid's edge.
+
+        Args:
+            dimension: width of the puzzle (number of cells).
+
+        Returns:
+            the row and column of each cell.
+        """
+        (row, col), (row_step, col_step) = self.start, self.direction
+        cells = []
+        while 0 <= row < dimension and 0 <= col < dimension:
+            cells.append((row, col))
+            row += row_step
+            col += col_step
+        return cells
+
+
+class Diagonal(Line):
+    """A diagonal of a Little Killer Sudoku, whose values add up to its total.
+
+    The total is written outside the grid, pointing along the diagonal.
+    Values may repeat along a diagonal.
+
+    Attributes:
+        start: the row and column of the diagonal's first cell, on the edge
+            of the grid next to the clue.
+        direction: the step in rows and in columns (each 1 or -1) from one
+            cell of the diagonal to the next.
+        total: the sum of the diagonal's values.
+    """
+
+    def __init__(
+        self, start: tuple[int, int], direction: tuple[int, int], total: int
+    ):
+        """Create the Diagonal.
+
+        Args:
+            start: the row and column of the diagonal's first cell.
+            direction: the step in rows and in columns (each 1 or -1) from
+                one cell of the diagonal to the next.
+            total: the sum of the diagonal's values.
+        """
+        Line.__init__(self, start, direction)
+        self.total = total
+
+    def __str__(self) -> str:
+        (row, col), (row_step, col_step) = self.start, self.direction
+        return (
+            f"diagonal {self.total}: r {row} c {col} step {row_step} {col_step}"
+        )
+
+
+class SkyscraperClue(Line):
+    """A clue of a Skyscraper Sudoku: how many skyscrapers it can see.
+
+    Each value is the height of a skyscraper, and a skyscraper is visible
+    from the clue if it is taller than all those in front of it.
+
+    Attributes:
+        start: the row and column of the first cell seen from the clue, on
+            the edge of the grid.
+        direction: the step in rows and in columns (one of them 0) from one
+            cell of the line to the next, looking from the clue.
+        visible: the number of skyscrapers visible from the clue.
+    """
+
+    def __init__(
+        self, start: tuple[int, int], direction: tuple[int, int], visible: int
+    ):
+        """Create the SkyscraperClue.
+
+        Args:
+            start: the row and column of the first cell seen from the clue.
+            direction: the step in rows and in columns (one of them 0) from
+                one cell of the line to the next, looking from the clue.
+            visible: the number of skyscrapers visible from the clue.
+        """
+        Line.__init__(self, start, direction)
+        self.visible = visible
+
+    def __str__(self) -> str:
+        (row, col), (row_step, col_step) = self.start, self.direction
+        return (
+            f"skyscraper {self.visible}: r {row} c {col} "
+            f"step {row_step} {col_step}"
+        )
+
+
+class Inequality:
+    """A sign of a Greater Than Sudoku between two neighbouring cells.
+
+    Attributes:
+        greater: the row and column of the cell with the higher value.
+        lesser: the row and column of the cell with the lower value.
+    """
+
+    def __init__(self, greater: tuple[int, int], lesser: tuple[int, int]):
+        """Create the Inequality.
+
+        Args:
+            greater: the row and column of the cell with the higher value.
+            lesser: the row and column of the cell with the lower value.
+        """
+        self.greater = greater
+        self.lesser = lesser
+
+    def __str__(self) -> str:
+        (g_row, g_col), (l_row, l_col) = self.greater, self.lesser
+        return f"r {g_row} c {g_col} > r {l_row} c {l_col}"
+
+
+class ConsecutivePair:
+    """A bar of a Consecutive Sudoku between two neighbouring cells.
+
+    The values of the cells differ by 1. Neighbouring cells without a bar
+    between them do not.
+
+    Attributes:
+        cells: the row and column of each of the two cells.
+    """
+
+    def __init__(self, cells: tuple[tuple[int, int], tuple[int, int]]):
+        """Create the ConsecutivePair.
+
+        Args:
+            cells: the row and column of each of the two cells.
+        """
+        self.cells = cells
+
+    def __str__(self) -> str:
+        cells = " ".join(f"r {row} c {col}" for row, col in sorted(self.cells))
+        return f"consecutive: {cells}"
+
+
+class XVMark:
+    """An X or V of a Sudoku XV between two neighbouring cells.
+
+    The values of the cells add up to 10 for an X and 5 for a V.
+    Neighbouring cells without a mark between them add up to neither.
+
+    Attributes:
+        cells: the row and column of each of the two cells.
+        total: the sum of the cells' values, a key of LETTERS.
+    """
+
+    # the letter of the mark for each total
+    LETTERS: ClassVar[dict[int, str]] = {10: "X", 5: "V"}
+
+    def __init__(
+        self, cells: tuple[tuple[int, int], tuple[int, int]], total: int
+    ):
+        """Create the XVMark.
+
+        Args:
+            cells: the row and column of each of the two cells.
+            total: the sum of the cells' values, a key of LETTERS.
+        """
+        self.cells = cells
+        self.total = total
+
+    def __str__(self) -> str:
+        cells = " ".join(f"r {row} c {col}" for row, col in sorted(self.cells))
+        return f"{self.LETTERS[self.total]}: {cells}"
+
+
+# the clues of variants other than the cells' values
+Constraint = (
+    Cage | Diagonal | SkyscraperClue | Inequality | ConsecutivePair | XVMark
+)
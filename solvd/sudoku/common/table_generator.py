@@ -137,4 +137,3 @@ def write_lookup_file():
 
 
 write_lookup_file()
-
@@ -0,0 +1,103 @@
+"""asyncio interface to sudoku solving.
+
+Solving runs in an executor (a thread pool by default), so an event loop can
+await many puzzles at once. pysat releases the GIL while it searches, so
+thread pool workers do solve in parallel.
+"""
+
+import asyncio
+import concurrent.futures
+import functools
+from collections.abc import Iterable
+
+import solvd.sudoku.common.puzzle_spec as common_ps
+import solvd.sudoku.solving.cache as solving_cache
+import solvd.sudoku.solving.headless as solving_headless
+import solvd.sudoku.solving.solution as solving_sltn
+import solvd.sudoku.solving.stats as solving_stats
+
+
+async def solve(
+    subtype: str,
+    grid: list[list[int]],
+    time_limit: float | None = None,
+    conflict_limit: int | None = None,
+    executor: concurrent.futures.Executor | None = None,
+    cache: "solving_cache.SolutionCache | None" = None,
+    stats: "solving_stats.SubtypeStats | None" = None,
+) -> list[list[int]] | int:
+    """Solve a puzzle without blocking the event loop.
+
+    Cancelling the awaiting task also cancels the solve.
+
+    Args:
+        subtype: subtype of sudoku, named as in the configure page.
+        grid: rows of the puzzle, with 0 for empty cells.
+        time_limit: wall-clock limit of the SAT search (seconds).
+        conflict_limit: maximum number of conflicts in the SAT search.
+        executor: executor to solve in. The loop's default executor if not
+            given.
+        cache: cache to check before solving and store the result in.
+        stats: totals to add the solve's statistics to.
+
+    Returns:
+        rows of the solved puzzle, or UNSOLVABLE or TIMED_OUT.
+    """
+    spec = common_ps.PuzzleSpec(subtype)
+    control = solving_sltn.SolveControl(time_limit, conflict_limit)
+    solve_grid = solving_headless.solve_grid if cache is None else cache.solve
+    loop = asyncio.get_running_loop()
+    try:
+        solution = await loop.run_in_executor(
+            executor, functools.partial(solve_grid, spec, grid, control)
+        )
+    except asyncio.CancelledError:
+        control.cancel()
+        raise
+    if stats is not None:
+        stats.add(subtype, control.stats)
+    return solution
+
+
+async def solve_many(
+    puzzles: Iterable[tuple[str, list[list[int]]]],
+    max_concurrent: int = 4,
+    time_limit: float | None = None,
+    conflict_limit: int | None = None,
+    executor: concurrent.futures.Executor | None = None,
+    cache: "solving_cache.SolutionCache | None" = None,
+    stats: "solving_stats.SubtypeStats | None" = None,
+) -> list[list[list[int]] | int]:
+    """Solve many puzzles concurrently, with at most max_concurrent at once.
+
+    Args:
+        puzzles: subtype and grid of each puzzle.
+        max_concurrent: maximum number of puzzles being solved at once.
+        time_limit: wall-clock limit of each SAT search (seconds).
+        conflict_limit: maximum number of conflicts in each SAT search.
+        executor: executor to solve in. The loop's default executor if not
+            given.
+        cache: cache to check before solving and store results in.
+        stats: totals to add each solve's statistics to, by subtype.
+
+    Returns:
+        result of solve for each puzzle, in the same order as puzzles.
+    """
+    semaphore = asyncio.Semaphore(max_concurrent)
+
+    async def bounded_solve(subtype: str, grid: list[list[int]]):
+        """Solve once fewer than max_concurrent puzzles are being solved."""
+        async with semaphore:
+            return await solve(
+                subtype,
+                grid,
+                time_limit,
+                conflict_limit,
+                executor,
+                cache,
+                stats,
+            )
+
+    return await asyncio.gather(
+        *(bounded_solve(subtype, grid) for subtype, grid in puzzles)
+    )
@@ -0,0 +1,237 @@
+"""Solving many standard sudoku at once by propagating singles with numpy.
+
+The candidates of a batch of N puzzles are held as an (N, cells) array of
+bitmasks, as in bitboard (bit v - 1 is set if v is a candidate), and naked
+and hidden singles are propagated in all of them together, with a handful of
+array operations per round:
+
+- naked singles: a value which is a cell's only candidate is removed from the
+  candidates of every other cell in its row, column and box
+- hidden singles: a cell which is the only place in one of its groups for a
+  value has every other candidate removed
+
+Most puzzles which are not hard are solved by propagation alone. A puzzle
+left with a contradiction has no solution. The rest are solved one by one by
+an engine from headless, with the values found by propagation added as clues.
+"""
+
+import numpy as np
+
+import solvd.sudoku.common.puzzle_spec as common_ps
+import solvd.sudoku.solving.bitboard as solving_bitboard
+import solvd.sudoku.solving.headless as solving_headless
+import solvd.sudoku.solving.solution as solving_sltn
+import solvd.sudoku.solving.stats as solving_stats
+import solvd.sudoku.solving.timing as solving_timing
+
+# puzzles propagated together, which bounds the memory used
+CHUNK_SIZE = 4096
+
+# propagation states of a puzzle
+STALLED = 0
+SOLVED = 1
+CONTRADICTION = 2
+
+# number of bits set in each 16-bit number, for counting candidates with
+# numpy before 2.0, which has no bitwise_count
+BIT_COUNTS = (
+    np.unpackbits(np.arange(1 << 16, dtype=np.uint16).view(np.uint8))
+    .reshape(-1, 16)
+    .sum(axis=1, dtype=np.uint8)
+)
+
+
+def solve_batch(
+    spec: common_ps.PuzzleSpec,
+    grids: list[list[list[int]]],
+    time_limit: float | None = None,
+    conflict_limit: int | None = None,
+    engine: str = "glucose",
+    stats: "solving_stats.SubtypeStats | None" = None,
+) -> list[list[list[int]] | int]:
+    """Solve many puzzles of one standard subtype.
+
+    Args:
+        spec: the puzzles' layout.
+        grids: rows of each puzzle, with 0 for empty cells.
+        time_limit: wall-clock limit of each search of a puzzle not solved
+            by propagation (seconds).
+        conflict_limit: maximum number of conflicts in each such search.
+        engine: engine to search with, one of headless.ENGINES.
+        stats: totals to add the statistics of each search to.
+
+    Returns:
+        rows of each solved puzzle, or UNSOLVABLE or TIMED_OUT, in the same
+        order as grids.
+
+    Raises:
+        ValueError: if the subtype is not a standard sudoku.
+    """
+    if spec.type != "standard":
+        raise ValueError(f"Batch solving cannot solve {spec.subtype}")
+    layout = solving_bitboard.get_layout(spec.subtype)
+    solutions = []
+    for start in range(0, len(grids), CHUNK_SIZE):
+        chunk = grids[start : start + CHUNK_SIZE]
+        timer = solving_timing.start(spec.subtype)
+        with timer.stage("solve"):
+            candidates = to_candidates(chunk, spec.dimension)
+            states = propagate(candidates, layout)
+        with timer.stage("decode"):
+            values = to_values(candidates)
+        timer.finish()
+        for state, puzzle_values in zip(states.tolist(), values.tolist()):
+            if state == CONTRADICTION:
+                solutions.append(solving_sltn.UNSOLVABLE)
+                continue
+            grid = [
+                puzzle_values[row * spec.dimension : (row + 1) * spec.dimension]
+                for row in range(spec.dimension)
+            ]
+            if state == STALLED:
+                control = solving_sltn.SolveControl(time_limit, conflict_limit)
+                grid = solving_headless.solve_grid(spec, grid, control, engine)
+                if stats is not None:
+                    stats.add(spec.subtype, control.stats)
+            solutions.append(grid)
+    return solutions
+
+
+def to_candidates(grids: list[list[list[int]]], dimension: int) -> np.ndarray:
+    """Make the candidates of a batch of puzzles.
+
+    Args:
+        grids: rows of each puzzle, with 0 for empty cells.
+        dimension: width of the puzzles (number of cells).
+
+    Returns:
+        (puzzles, cells) array of each cell's candidates, with bit v - 1 set
+        if v is a candidate. A clue's cell has only the clue as a candidate,
+        and an empty cell every value.
+    """
+    # int64, as the masks of grids wider than 31 do not fit in an int32
+    clues = np.asarray(grids, dtype=np.int64).reshape(len(grids), -1)
+    full = (1 << dimension) - 1
+    return np.where(clues > 0, np.left_shift(1, clues - 1), full)
+
+
+def propagate(candidates: np.ndarray, layout: "solving_bitboard.Layout"):
+    """Propagate naked and hidden singles until no puzzle changes.
+
+    Puzzles which are solved, contradictory or unchanged by a round are left
+    out of the later rounds.
+
+    Args:
+        candidates: candidates of each puzzle, as made by to_candidates.
+            Updated in place.
+        layout: the groups of the puzzles.
+
+    Returns:
+        STALLED, SOLVED or CONTRADICTION for each puzzle.
+    """
+    groups = np.array(layout.groups)
+    cell_groups = np.array(layout.cell_groups)
+    states = np.full(len(candidates), STALLED)
+    active = np.arange(len(candidates))
+    while len(active):
+        current = candidates[active]
+        updated, contradiction = propagate_round(
+            current, groups, cell_groups, layout.full
+        )
+        candidates[active] = updated
+        solved = ~contradiction & np.all(count_candidates(updated) == 1, axis=1)
+        states[active[contradiction]] = CONTRADICTION
+        states[active[solved]] = SOLVED
+        changed = np.any(updated != current, axis=1)
+        active = active[changed & ~contradiction & ~solved]
+    return states
+
+
+def propagate_round(
+    candidates: np.ndarray,
+    groups: np.ndarray,
+    cell_groups: np.ndarray,
+    full: int,
+) -> tuple[np.ndarray, np.ndarray]:
+    """Apply one round of naked and then hidden singles.
+
+    Args:
+        candidates: (puzzles, cells) array of candidates.
+        groups: (groups, cells) array of the cells of every row, column and
+            box.
+        cell_groups: (cells, 3) array of the groups of each cell.
+        full: mask with a bit set for every value.
+
+    Returns:
+        the new candidates, and whether each puzzle has a contradiction: a
+        cell with no candidates, a value placed twice in a group, or a value
+        with nowhere to go in a group.
+    """
+    # naked singles: remove placed values from the cells around them
+    single = count_candidates(candidates) == 1
+    placed_cells = np.where(single, candidates, 0)[:, groups]
+    placed = np.bitwise_or.reduce(placed_cells, axis=2)
+    # values are distinct bits, so their sum differs from their union
+    # exactly when one is placed twice
+    contradiction = np.any(placed_cells.sum(axis=2) != placed, axis=1)
+    taken = np.bitwise_or.reduce(placed[:, cell_groups], axis=2)
+    candidates = np.where(single, candidates, candidates & ~taken)
+
+    # hidden singles: keep only the value a cell is the only place for
+    once = np.zeros_like(placed)
+    twice = np.zeros_like(placed)
+    for group_cells in groups.T:
+        cell_candidates = candidates[:, group_cells]
+        twice |= once & cell_candidates
+        once |= cell_candidates
+    contradiction |= np.any(once != full, axis=1)
+    hidden = np.bitwise_or.reduce((once & ~twice)[:, cell_groups], axis=2)
+    only_place = candidates & hidden
+    contradiction |= np.any(count_candidates(only_place) > 1, axis=1)
+    candidates = np.where(only_place, only_place, candidates)
+
+    contradiction |= np.any(candidates == 0, axis=1)
+    return candidates, contradiction
+
+
+def to_values(candidates: np.ndarray) -> np.ndarray:
+    """Read off the values of the cells with a single candidate.
+
+    Args:
+        candidates: (puzzles, cells) array of candidates.
+
+    Returns:
+        (puzzles, cells) array of the values, 0 for cells with more than one
+        candidate.
+    """
+    single = count_candidates(candidates) == 1
+    return np.where(single, np.log2(candidates).astype(np.int32) + 1, 0)
+
+
+def count_candidates(candidates: np.ndarray) -> np.ndarray:
+    """Count the candidates of each cell.
+
+    Args:
+        candidates: array of candidates, as made by to_candidates.
+
+    Returns:
+        array of the number of bits set in each mask.
+    """
+    if hasattr(np, "bitwise_count"):
+        return np.bitwise_count(candidates)
+    return count_bits(candidates)
+
+
+def count_bits(masks: np.ndarray) -> np.ndarray:
+    """Count the bits set in masks of up to 48 bits with BIT_COUNTS.
+
+    Args:
+        masks: array of non-negative masks.
+
+    Returns:
+        array of the number of bits set in each mask.
+    """
+    counts = np.zeros(masks.shape, dtype=np.uint8)
+    for shift in (0, 16, 32):
+        counts += BIT_COUNTS[(masks >> shift) & 0xFFFF]
+    return counts
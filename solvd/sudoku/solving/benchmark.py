@@ -0,0 +1,259 @@
+"""Benchmark of the solving pipeline on the corpus of puzzles in fixtures.
+
+Run with `python -m solvd.sudoku.solving.benchmark`. Every puzzle is solved
+repeatedly from scratch, timing each stage separately:
+
+- clauses: making the CNF clauses for the rules and the clues
+- preprocess: simplifying the clauses by unit propagation (see preprocess)
+- load: loading the clauses into a new solver
+- solve: the SAT search
+- decode: turning the model back into a grid (nothing if unsolvable)
+
+and the results are written as JSON, with the minimum, median, mean and
+standard deviation of each stage in seconds, and the size of the formula and
+effort of the search (see stats), per puzzle and totalled by subtype. With
+--engine bitboard, the backtracking solver in bitboard is benchmarked instead
+of Glucose, on the standard subtypes it handles; it has no clauses to make,
+preprocess or load, so those stages take no time. With --engine portfolio,
+several solvers are raced (see portfolio), and loading is timed as part of
+solving. Little Killer puzzles are benchmarked once for each of the
+pseudo-boolean encodings chosen with --pb-encodings, to compare them. With
+--profile, every stage is also profiled (see profiling); the timings are then
+not representative.
+"""
+
+import argparse
+import json
+import platform
+import statistics
+import sys
+
+import pysat
+
+import solvd.sudoku.common.puzzle_spec as common_ps
+import solvd.sudoku.solving.bitboard as solving_bitboard
+import solvd.sudoku.solving.fixtures as solving_fixtures
+import solvd.sudoku.solving.headless as solving_headless
+import solvd.sudoku.solving.profiling as solving_profiling
+import solvd.sudoku.solving.solution as solving_sltn
+import solvd.sudoku.solving.stats as solving_stats
+import solvd.sudoku.solving.timing as solving_timing
+
+STAGES = ("clauses", "preprocess", "load", "solve", "decode")
+
+# subtypes whose clauses depend on the pseudo-boolean encoding
+PB_SUBTYPES = ("Little Killer Sudoku",)
+
+
+def time_stages(
+    spec: common_ps.PuzzleSpec, grid: list[list[int]], engine: str = "glucose"
+) -> tuple[dict[str, float], dict[str, int]]:
+    """Solve a puzzle once, timing each stage.
+
+    The puzzle is solved through headless.solve_grid, as any other caller
+    would, so what is timed is what they run.
+
+    Args:
+        spec: the puzzle's layout.
+        grid: rows of the puzzle, with 0 for empty cells.
+        engine: solver to use, one of headless.ENGINES.
+
+    Returns:
+        the time taken by each stage (seconds), with 0 for stages the engine
+        does not go through, and the statistics of the formula and the search
+        (see stats).
+    """
+    timer = solving_timing.record(spec.subtype)
+    control = solving_sltn.SolveControl()
+    solving_headless.solve_grid(spec, grid, control, engine, timer)
+    times = dict.fromkeys(STAGES, 0.0)
+    times.update(timer.durations)
+    return times, control.stats
+
+
+def summarise(times: list[float]) -> dict[str, float]:
+    """Summarise repeated timings of a stage.
+
+    Args:
+        times: the timings (seconds).
+
+    Returns:
+        minimum, median, mean and standard deviation of the timings.
+    """
+    return {
+        "min": min(times),
+        "median": statistics.median(times),
+        "mean": statistics.fmean(times),
+        "stdev": statistics.stdev(times) if len(times) > 1 else 0.0,
+    }
+
+
+def benchmark_puzzle(
+    spec: common_ps.PuzzleSpec,
+    grid: list[list[int]],
+    repeat: int,
+    warmup: int,
+    engine: str = "glucose",
+) -> tuple[dict, dict[str, int]]:
+    """Benchmark solving a puzzle.
+
+    Args:
+        spec: the puzzle's layout.
+        grid: rows of the puzzle, with 0 for empty cells.
+        repeat: number of timed runs.
+        warmup: number of untimed runs beforehand.
+        engine: solver to use, one of headless.ENGINES.
+
+    Returns:
+        summaries of the timings of each stage and of the total, and the
+        statistics of the solve (the same for every run).
+    """
+    for _ in range(warmup):
+        time_stages(spec, grid, engine)
+    runs = {stage: [] for stage in STAGES}
+    for _ in range(repeat):
+        times, stats = time_stages(spec, grid, engine)
+        for stage in STAGES:
+            runs[stage].append(times[stage])
+    totals = [sum(run) for run in zip(*runs.values())]
+    timings = {stage: summarise(runs[stage]) for stage in STAGES}
+    timings["total"] = summarise(totals)
+    return timings, stats
+
+
+def run(
+    subtypes: list[str],
+    grades: list[str],
+    repeat: int,
+    warmup: int,
+    engine: str = "glucose",
+    pb_encodings: tuple[str, ...] = common_ps.PB_ENCODINGS,
+) -> dict:
+    """Benchmark solving the corpus puzzles of some subtypes.
+
+    Args:
+        subtypes: subtypes to benchmark. Those the engine cannot solve are
+            skipped.
+        grades: grades of puzzle to benchmark.
+        repeat: number of timed runs of each puzzle.
+        warmup: number of untimed runs of each puzzle beforehand.
+        engine: solver to use, one of headless.ENGINES.
+        pb_encodings: pseudo-boolean encodings to benchmark the puzzles of
+            PB_SUBTYPES with, each one of puzzle_spec.PB_ENCODINGS.
+
+    Returns:
+        the results, with details of the environment they were measured in.
+    """
+    results = []
+    subtype_stats = solving_stats.SubtypeStats()
+    for subtype in subtypes:
+        if engine == "bitboard" and not solving_bitboard.can_solve(
+            common_ps.PuzzleSpec(subtype)
+        ):
+            continue
+        uses_pb = subtype in PB_SUBTYPES
+        encodings = pb_encodings if uses_pb else common_ps.PB_ENCODINGS[:1]
+        for grade, name, grid, constraints in solving_fixtures.load(
+            subtype, grades
+        ):
+            for encoding in encodings:
+                spec = common_ps.PuzzleSpec(subtype, constraints, encoding)
+                timings, stats = benchmark_puzzle(
+                    spec, grid, repeat, warmup, engine
+                )
+                subtype_stats.add(subtype, stats)
+                result = {
+                    "subtype": subtype,
+                    "grade": grade,
+                    "name": name,
+                    "dimension": spec.dimension,
+                    "stages": timings,
+                    "stats": stats,
+                }
+                if uses_pb:
+                    result["pb_encoding"] = encoding
+                results.append(result)
+    return {
+        "python": platform.python_version(),
+        "pysat": pysat.__version__,
+        "machine": platform.machine(),
+        "engine": engine,
+        "repeat": repeat,
+        "warmup": warmup,
+        "results": results,
+        "stats_by_subtype": subtype_stats.summary(),
+    }
+
+
+def main(argv: list[str] | None = None):
+    """Run the benchmark and write the results.
+
+    Args:
+        argv: command line arguments. sys.argv if not given.
+    """
+    parser = argparse.ArgumentParser(description="Benchmark sudoku solving")
+    parser.add_argument(
+        "--subtypes",
+        nargs="*",
+        default=list(solving_fixtures.SUBTYPES),
+        choices=solving_fixtures.SUBTYPES,
+        metavar="SUBTYPE",
+        help="subtypes to benchmark (default: all)",
+    )
+    parser.add_argument(
+        "--grades",
+        nargs="*",
+        default=list(solving_fixtures.GRADES),
+        choices=solving_fixtures.GRADES,
+        help="grades of puzzle to benchmark (default: all)",
+    )
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--warmup", type=int, default=1)
+    parser.add_argument(
+        "--engine",
+        default="glucose",
+        choices=solving_headless.ENGINES,
+        help="solver to benchmark (default: glucose)",
+    )
+    parser.add_argument(
+        "--pb-encodings",
+        nargs="*",
+        default=list(common_ps.PB_ENCODINGS),
+        choices=common_ps.PB_ENCODINGS,
+        help="pseudo-boolean encodings to benchmark Little Killer with "
+        "(default: all)",
+    )
+    parser.add_argument("--output", help="file to write to (default: stdout)")
+    parser.add_argument(
+        "--profile",
+        metavar="DIR",
+        help="profile each stage, writing the profiles to DIR (see profiling)",
+    )
+    parser.add_argument(
+        "--profile-tools",
+        nargs="*",
+        default=list(solving_profiling.TOOLS),
+        choices=solving_profiling.TOOLS,
+    )
+    args = parser.parse_args(argv)
+    if args.profile is not None:
+        solving_profiling.enable(args.profile, tuple(args.profile_tools))
+    results = run(
+        args.subtypes,
+        args.grades,
+        args.repeat,
+        args.warmup,
+        args.engine,
+        tuple(args.pb_encodings),
+    )
+    solving_profiling.disable()
+    if args.output is None:
+        json.dump(results, sys.stdout, indent=2)
+        print()
+    else:
+        with open(args.output, "w") as file:
+            json.dump(results, file, indent=2)
+
+
+if __name__ == "__main__":
+    main()
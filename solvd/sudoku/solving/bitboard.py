@@ -0,0 +1,346 @@
+"""Backtracking solver for standard sudoku, using bitmasks of candidates.
+
+An alternative to the SAT solver for standard grids up to 16 x 16, which
+skips making and loading clauses altogether. Each row, column and box keeps
+an integer whose bit v - 1 is set once the value v is placed in it, so a
+cell's candidates are the bits set in none of its three groups.
+
+Between guesses, singles are propagated until nothing changes:
+
+- naked singles: a cell with only one candidate
+- hidden singles: a value with only one possible cell in a group
+
+and the next guess is made in the cell with the fewest candidates (minimum
+remaining values). Contradictions found while propagating count as
+conflicts, so limits on conflicts and time apply as with the SAT solver.
+"""
+
+import functools
+import time
+
+import solvd.sudoku.common.puzzle_spec as common_ps
+import solvd.sudoku.solving.solution as solving_sltn
+import solvd.sudoku.solving.timing as solving_timing
+
+MAX_DIMENSION = 16
+
+
+class Stopped(Exception):
+    """Raised inside the search when a limit is reached or it is cancelled."""
+
+
+class Layout:
+    """The groups of a standard sudoku, by cell index (row * dimension + col).
+
+    Attributes:
+        dimension: width of the puzzle (number of cells).
+        full: mask with a bit set for every value.
+        cell_groups: indices in groups of each cell's row, column and box.
+        groups: cell indices of every row, then every column, then every box.
+    """
+
+    def __init__(self, spec: common_ps.PuzzleSpec):
+        """Work out the layout of a subtype.
+
+        Args:
+            spec: the puzzle's layout.
+        """
+        n = spec.dimension
+        self.dimension = n
+        self.full = (1 << n) - 1
+        boxes = {}
+        self.cell_groups = []
+        self.groups = [[] for _ in range(3 * n)]
+        for row, col, box in spec.cells():
+            box = 2 * n + boxes.setdefault(box, len(boxes))
+            cell = row * n + col
+            self.cell_groups.append((row, n + col, box))
+            for group in (row, n + col, box):
+                self.groups[group].append(cell)
+
+
+@functools.cache
+def get_layout(subtype: str) -> Layout:
+    """Get the layout of a subtype, working it out only once.
+
+    Args:
+        subtype: subtype of standard sudoku.
+
+    Returns:
+        the layout.
+    """
+    return Layout(common_ps.PuzzleSpec(subtype))
+
+
+def can_solve(spec: common_ps.PuzzleSpec) -> bool:
+    """Check whether this solver handles a subtype.
+
+    Args:
+        spec: the puzzle's layout.
+
+    Returns:
+        whether the subtype is a standard sudoku up to MAX_DIMENSION wide.
+    """
+    return spec.type == "standard" and spec.dimension <= MAX_DIMENSION
+
+
+def solve(
+    spec: common_ps.PuzzleSpec,
+    grid: list[list[int]],
+    control: "solving_sltn.SolveControl | None" = None,
+    timer: "solving_timing.SolveTimer" = solving_timing.NULL_TIMER,
+) -> list[list[int]] | int:
+    """Solve a standard sudoku given as a grid of clues.
+
+    Args:
+        spec: the puzzle's layout.
+        grid: rows of the puzzle, with 0 for empty cells.
+        control: limits on the solve and a way to cancel it, which also
+            receives the solve's statistics. No limits if not given.
+        timer: records how long each stage takes.
+
+    Returns:
+        rows of the solved puzzle, or UNSOLVABLE or TIMED_OUT.
+
+    Raises:
+        ValueError: if the subtype is not handled (see can_solve).
+    """
+    if not can_solve(spec):
+        raise ValueError(f"Bitboard solver cannot solve {spec.subtype}")
+    if control is None:
+        control = solving_sltn.SolveControl()
+    search = Search(get_layout(spec.subtype), control)
+    with timer.stage("solve"):
+        try:
+            values = search.run(grid)
+        except Stopped:
+            values = solving_sltn.TIMED_OUT
+        finally:
+            control.stats.update(search.stats())
+    if values in (solving_sltn.UNSOLVABLE, solving_sltn.TIMED_OUT):
+        return values
+    with timer.stage("decode"):
+        n = spec.dimension
+        return [
+            [values[row * n + col].bit_length() for col in range(n)]
+            for row in range(n)
+        ]
+
+
+class Search:
+    """A single backtracking search.
+
+    The state of the search is the value placed in each cell, as a bit (0 if
+    empty), and the values placed in each group, as a mask. A guess copies
+    both, so backtracking is just returning to the previous copy.
+
+    Attributes:
+        layout: the groups of the puzzle.
+        control: limits on the search.
+        decisions: number of guesses made.
+        conflicts: number of contradictions found.
+        propagations: number of singles placed.
+    """
+
+    # how many guesses are made between checks of the time limit
+    poll_interval = 64
+
+    def __init__(self, layout: Layout, control: "solving_sltn.SolveControl"):
+        """Create the Search.
+
+        Args:
+            layout: the groups of the puzzle.
+            control: limits on the search.
+        """
+        self.layout = layout
+        self.control = control
+        self.decisions = 0
+        self.conflicts = 0
+        self.propagations = 0
+        self.deadline = None
+        if control.time_limit is not None:
+            self.deadline = time.monotonic() + control.time_limit
+
+    def stats(self) -> dict[str, int]:
+        """Get the search's statistics, named as for the SAT solver.
+
+        Returns:
+            numbers of decisions, conflicts and propagations.
+        """
+        return {
+            "decisions": self.decisions,
+            "conflicts": self.conflicts,
+            "propagations": self.propagations,
+        }
+
+    def run(self, grid: list[list[int]]) -> list[int] | int:
+        """Search for a solution.
+
+        Args:
+            grid: rows of the puzzle, with 0 for empty cells.
+
+        Returns:
+            the value of each cell as a bit, or UNSOLVABLE.
+
+        Raises:
+            Stopped: if a limit is reached or the solve is cancelled.
+        """
+        if self.control.cancelled:
+            raise Stopped
+        n = self.layout.dimension
+        values = [0] * (n * n)
+        used = [0] * (3 * n)
+        for row in range(n):
+            for col in range(n):
+                if grid[row][col] != 0:
+                    bit = 1 << (grid[row][col] - 1)
+                    if not self.place(values, used, row * n + col, bit):
+                        return solving_sltn.UNSOLVABLE
+        solution = self.search(values, used)
+        if solution is None:
+            return solving_sltn.UNSOLVABLE
+        return solution
+
+    def search(self, values: list[int], used: list[int]) -> list[int] | None:
+        """Propagate, then guess the value of a cell and search on.
+
+        Args:
+            values: value of each cell as a bit, 0 if empty.
+            used: values placed in each group.
+
+        Returns:
+            the value of each cell as a bit, or None if there is no solution.
+        """
+        candidates = self.propagate(values, used)
+        if candidates is None:
+            self.conflicts += 1
+            return None
+        best_cell = None
+        best_count = self.layout.dimension + 1
+        for cell, cell_candidates in enumerate(candidates):
+            if cell_candidates:
+                count = cell_candidates.bit_count()
+                if count < best_count:
+                    best_cell = cell
+                    best_count = count
+                    if count == 2:
+                        break
+        if best_cell is None:
+            return values
+        remaining = candidates[best_cell]
+        while remaining:
+            bit = remaining & -remaining
+            remaining ^= bit
+            self.decide()
+            new_values = values[:]
+            new_used = used[:]
+            self.place(new_values, new_used, best_cell, bit)
+            solution = self.search(new_values, new_used)
+            if solution is not None:
+                return solution
+        return None
+
+    def propagate(self, values: list[int], used: list[int]) -> list[int] | None:
+        """Place naked and hidden singles until there are none left.
+
+        Every value placed is forced by those before it, so any clash between
+        them means there is no solution from here.
+
+        Args:
+            values: value of each cell as a bit, 0 if empty. Updated in place.
+            used: values placed in each group. Updated in place.
+
+        Returns:
+            the candidates of each empty cell (0 for filled cells), or None if
+            a contradiction was found.
+        """
+        full = self.layout.full
+        cell_groups = self.layout.cell_groups
+        while True:
+            progress = False
+            candidates = [0] * len(values)
+            for cell, (row, col, box) in enumerate(cell_groups):
+                if values[cell]:
+                    continue
+                cell_candidates = full & ~(used[row] | used[col] | used[box])
+                if not cell_candidates:
+                    return None
+                if cell_candidates & (cell_candidates - 1) == 0:
+                    self.place(values, used, cell, cell_candidates)
+                    self.propagations += 1
+                    progress = True
+                else:
+                    candidates[cell] = cell_candidates
+            if progress:
+                continue
+            for group, cells in enumerate(self.layout.groups):
+                once = 0
+                twice = 0
+                for cell in cells:
+                    twice |= once & candidates[cell]
+                    once |= candidates[cell]
+                if once | used[group] != full:
+                    return None
+                hidden = once & ~twice & ~used[group]
+                if not hidden:
+                    continue
+                for cell in cells:
+                    bit = candidates[cell] & hidden
+                    if not bit:
+                        continue
+                    if bit & (bit - 1) or not self.place(
+                        values, used, cell, bit
+                    ):
+                        return None
+                    candidates[cell] = 0
+                    self.propagations += 1
+                    progress = True
+            if not progress:
+                return candidates
+
+    def place(
+        self, values: list[int], used: list[int], cell: int, bit: int
+    ) -> bool:
+        """Place a value in a cell, unless it breaks a rule.
+
+        Args:
+            values: value of each cell as a bit, 0 if empty. Updated in place.
+            used: values placed in each group. Updated in place.
+            cell: index of the cell.
+            bit: the value as a bit.
+
+        Returns:
+            whether the value could be placed. Placing the value a cell
+            already has counts as placed.
+        """
+        if values[cell]:
+            return values[cell] == bit
+        row, col, box = self.layout.cell_groups[cell]
+        if (used[row] | used[col] | used[box]) & bit:
+            return False
+        values[cell] = bit
+        used[row] |= bit
+        used[col] |= bit
+        used[box] |= bit
+        return True
+
+    def decide(self):
+        """Count a guess, and stop the search if a limit has been reached.
+
+        Raises:
+            Stopped: if a limit is reached or the solve is cancelled.
+        """
+        self.decisions += 1
+        control = self.control
+        if (
+            control.conflict_limit is not None
+            and self.conflicts >= control.conflict_limit
+        ):
+            raise Stopped
+        if self.decisions % self.poll_interval:
+            return
+        if control.cancelled:
+            raise Stopped
+        if self.deadline is not None and time.monotonic() >= self.deadline:
+            control.timed_out = True
+            raise Stopped
@@ -0,0 +1,221 @@
+"""Cache of solutions, so identical puzzles are only solved once."""
+
+import collections
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+
+import solvd.sudoku.common.puzzle_spec as common_ps
+import solvd.sudoku.solving.headless as solving_headless
+import solvd.sudoku.solving.solution as solving_sltn
+import solvd.sudoku.solving.symmetry as solving_symmetry
+
+
+def puzzle_key(
+    subtype: str, grid: list[list[int]], constraints: list | None = None
+) -> str:
+    """Hash a puzzle.
+
+    Args:
+        subtype: subtype of sudoku.
+        grid: rows of the puzzle, with 0 for empty cells.
+        constraints: the clues of a variant other than the cells' values.
+            None if it has none.
+
+    Returns:
+        hex digest identifying the puzzle.
+    """
+    text = subtype + "|" + ";".join(",".join(map(str, row)) for row in grid)
+    if constraints:
+        text += "|" + ";".join(sorted(map(str, constraints)))
+    return hashlib.sha256(text.encode()).hexdigest()
+
+
+def copy_solution(solution: list[list[int]] | int) -> list[list[int]] | int:
+    """Copy a solution's rows, so changing them leaves the original alone.
+
+    Args:
+        solution: rows of a solved puzzle, or UNSOLVABLE.
+
+    Returns:
+        a copy of the rows, or UNSOLVABLE.
+    """
+    if isinstance(solution, int):
+        return solution
+    return [row[:] for row in solution]
+
+
+class SolutionCache:
+    """LRU cache of solutions in memory, optionally backed by an SQLite file.
+
+    Lookups check memory first, then the file; solutions found in the file
+    are copied back into memory. Both are limited by number of entries, and
+    the least recently used entries are evicted first. Counting entries
+    rather than bytes is a deliberate simplification: no solution is larger
+    than a 36 x 36 grid, so the default limit keeps memory to about 13 MB at
+    worst. Unsolvable puzzles are cached too, but timed out solves are not.
+    Solutions are copied in and out, so callers can change the rows they are
+    given. Safe to use from many threads.
+
+    Attributes:
+        max_entries: maximum number of solutions kept in memory.
+        max_disk_entries: maximum number of solutions kept in the file.
+        hits: number of lookups which found a solution.
+        misses: number of lookups which did not.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 1024,
+        path: str | None = None,
+        max_disk_entries: int = 100_000,
+    ):
+        """Create the cache.
+
+        Args:
+            max_entries: maximum number of solutions kept in memory.
+            path: SQLite file to store solutions in. Memory only if not given.
+            max_disk_entries: maximum number of solutions kept in the file.
+        """
+        self.max_entries = max_entries
+        self.max_disk_entries = max_disk_entries
+        self.hits = 0
+        self.misses = 0
+        self._entries = collections.OrderedDict()
+        self._lock = threading.Lock()
+        self._db = None
+        if path is not None:
+            self._db = sqlite3.connect(path, check_same_thread=False)
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS solutions "
+                "(key TEXT PRIMARY KEY, solution TEXT, last_used REAL)"
+            )
+            self._db.commit()
+
+    def get(self, key: str) -> list[list[int]] | int | None:
+        """Look up a solution.
+
+        Args:
+            key: the puzzle's key, from puzzle_key.
+
+        Returns:
+            the cached result of solving the puzzle, or None if not cached.
+        """
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return copy_solution(self._entries[key])
+            solution = self._get_from_disk(key)
+            if solution is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self._put_in_memory(key, solution)
+            return copy_solution(solution)
+
+    def put(self, key: str, solution: list[list[int]] | int):
+        """Store a solution.
+
+        Args:
+            key: the puzzle's key, from puzzle_key.
+            solution: the result of solving the puzzle.
+        """
+        if solution == solving_sltn.TIMED_OUT:
+            return
+        with self._lock:
+            self._put_in_memory(key, copy_solution(solution))
+            if self._db is not None:
+                self._db.execute(
+                    "INSERT OR REPLACE INTO solutions VALUES (?, ?, ?)",
+                    (key, json.dumps(solution), time.time()),
+                )
+                self._db.execute(
+                    "DELETE FROM solutions WHERE key IN (SELECT key FROM "
+                    "solutions ORDER BY last_used DESC LIMIT -1 OFFSET ?)",
+                    (self.max_disk_entries,),
+                )
+                self._db.commit()
+
+    def solve(
+        self,
+        spec: common_ps.PuzzleSpec,
+        grid: list[list[int]],
+        control: "solving_sltn.SolveControl | None" = None,
+    ) -> list[list[int]] | int:
+        """Solve a puzzle, using the cached solution if there is one.
+
+        Solutions are cached in canonical form (see symmetry), so a puzzle
+        also hits the cache if an equivalent puzzle has been solved.
+
+        Args:
+            spec: the puzzle's layout.
+            grid: rows of the puzzle, with 0 for empty cells.
+            control: limits on the solve and a way to cancel it.
+
+        Returns:
+            rows of the solved puzzle, or UNSOLVABLE or TIMED_OUT.
+        """
+        canonical, transform = solving_symmetry.canonicalise(spec, grid)
+        key = puzzle_key(spec.subtype, canonical, spec.constraints)
+        solution = self.get(key)
+        if solution is None:
+            solution = solving_headless.solve_grid(spec, canonical, control)
+            self.put(key, solution)
+        return transform.undo(solution)
+
+    def stats(self) -> dict:
+        """Get the cache's counters.
+
+        Returns:
+            numbers of hits, misses and solutions held in memory.
+        """
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "entries": len(self._entries),
+            }
+
+    def close(self):
+        """Close the SQLite file, if there is one."""
+        if self._db is not None:
+            self._db.close()
+            self._db = None
+
+    def _put_in_memory(self, key: str, solution: list[list[int]] | int):
+        """Store a solution in memory, evicting the oldest if full.
+
+        Args:
+            key: the puzzle's key.
+            solution: the result of solving the puzzle.
+        """
+        self._entries[key] = solution
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def _get_from_disk(self, key: str) -> list[list[int]] | int | None:
+        """Look up a solution in the SQLite file.
+
+        Args:
+            key: the puzzle's key.
+
+        Returns:
+            the cached result of solving the puzzle, or None if not cached.
+        """
+        if self._db is None:
+            return None
+        row = self._db.execute(
+            "SELECT solution FROM solutions WHERE key = ?", (key,)
+        ).fetchone()
+        if row is None:
+            return None
+        self._db.execute(
+            "UPDATE solutions SET last_used = ? WHERE key = ?",
+            (time.time(), key),
+        )
+        self._db.commit()
+        return json.loads(row[0])
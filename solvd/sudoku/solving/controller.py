@@ -1,18 +1,97 @@
 """Bridging between the backend and UI for sudoku solving."""
 
+import queue
 import random
+import threading
+from collections.abc import Callable
 
 import solvd.common.ui_ctrl as solvd_ui_ctrl
 import solvd.sudoku.common.sudoku_var as common_sv
 import solvd.sudoku.solving.solution as solving_sltn
+import solvd.sudoku.solving.timing as solving_timing
 import solvd.sudoku.ui.puzzle_page as ui_pp
 
+# how often the Tk thread checks whether a background solve has finished
+POLL_INTERVAL_MS = 50
 
-def solve_sudoku(puzzle: "ui_pp.PuzzlePage"):
-    """Solve a standard sudoku puzzle.
+
+def solve_sudoku(
+    puzzle: "ui_pp.PuzzlePage",
+    on_finished: Callable[[list | int | Exception], None],
+) -> "solving_sltn.SolveControl":
+    """Solve a standard sudoku puzzle in a worker thread.
+
+    The clues are read on the Tk thread, clause generation and solving happen
+    in the worker, and the result is handed back to the Tk thread by polling
+    with after(), so the window stays responsive throughout.
 
     Args:
         puzzle: the puzzle to be solved.
+        on_finished: called on the Tk thread with the result of get_solution
+            once the cells' true values have been set, or with the error if
+            one of solution.SOLVE_ERRORS was raised.
+
+    Returns:
+        control which can be used to cancel the solve.
+
+    Raises:
+        ValueError: if the subtype cannot be solved yet.
+    """
+    if not solving_sltn.has_clause_generator(puzzle):
+        raise ValueError(f"{puzzle.subtype} is not supported yet")
+    known_vars, all_vars = read_cells(puzzle)
+    control = solving_sltn.SolveControl()
+    timer = solving_timing.start(puzzle.subtype)
+    results = queue.Queue()
+
+    def solve():
+        """Solve the puzzle, passing back the result or the error raised."""
+        try:
+            results.put(
+                solving_sltn.get_solution(
+                    known_vars, all_vars, puzzle, control, timer
+                )
+            )
+        except solving_sltn.SOLVE_ERRORS as error:
+            results.put(error)
+
+    def check_finished():
+        """Apply the result if the worker is done, otherwise check later."""
+        # checked before the queue, as the worker exits after putting a result
+        crashed = not worker.is_alive()
+        try:
+            solution = results.get_nowait()
+        except queue.Empty:
+            if crashed:
+                # the worker's traceback has already been printed
+                on_finished(RuntimeError("Solving stopped unexpectedly"))
+                return
+            puzzle.after(POLL_INTERVAL_MS, check_finished)
+            return
+        if isinstance(solution, Exception):
+            on_finished(solution)
+            return
+        with timer.stage("write_back"):
+            write_solution(puzzle, solution)
+        timer.finish()
+        on_finished(solution)
+
+    worker = threading.Thread(target=solve, daemon=True)
+    worker.start()
+    puzzle.after(POLL_INTERVAL_MS, check_finished)
+    return control
+
+
+def read_cells(
+    puzzle: "ui_pp.PuzzlePage",
+) -> tuple[list[common_sv.SudokuVar], list[common_sv.SudokuVar]]:
+    """Read the clues out of the grid.
+
+    Args:
+        puzzle: the puzzle to be solved.
+
+    Returns:
+        the known variables and all variables of the puzzle.
     """
     known_vars = []
     all_vars = []
@@ -29,17 +108,26 @@ def solve_sudoku(puzzle: "ui_pp.PuzzlePage"):
         all_vars.append(
             common_sv.SudokuVar(int(value), cell.row, cell.col, cell.box)
         )
-    solution = solving_sltn.get_solution(known_vars, all_vars, puzzle)
-    if solution == 0:
-        pass
-        # TODO: return error
-    else:
-        for cell in puzzle.puzzle_grid.cells:
-            for var in solution:
-                if (cell.row == var.row) and (cell.col == var.col):
-                    cell.true_value = var.value
-                    solution.remove(var)
-                    break
+    return known_vars, all_vars
+
+
+def write_solution(puzzle: "ui_pp.PuzzlePage", solution: list | int):
+    """Set the true values of the cells from a solution.
+
+    Args:
+        puzzle: the solved puzzle.
+        solution: result of get_solution. Nothing is set for UNSOLVABLE or
+            TIMED_OUT.
+    """
+    if solution in (solving_sltn.UNSOLVABLE, solving_sltn.TIMED_OUT):
+        # there are no values to set, and the page shows the status
+        return
+    for cell in puzzle.puzzle_grid.cells:
+        for var in solution:
+            if (cell.row == var.row) and (cell.col == var.col):
+                cell.true_value = var.value
+                solution.remove(var)
+                break
 
 
 def reveal_random_cell(puzzle: "ui_pp.PuzzlePage"):
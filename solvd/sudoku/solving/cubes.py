@@ -0,0 +1,235 @@
+"""Cube-and-conquer solving of large puzzles across a pool of processes.
+
+A single SAT solver uses one core, however hard the puzzle. Here the search
+space is split instead into cubes: a few variables are picked, and each cube
+fixes every one of them true or false, one cube for each combination. The
+cubes are independent, so a pool of worker processes solves them side by
+side, each worker keeping its solver (and what it learnt) from one cube to
+the next. The first satisfiable cube gives the solution, and the puzzle is
+unsolvable if every cube is.
+
+The formula is simplified first (see preprocess), and the variables split on
+are those in the most remaining clauses, as fixing them propagates furthest.
+"""
+
+import collections
+import itertools
+import multiprocessing
+import os
+import time
+
+import pysat.solvers
+
+import solvd.sudoku.common.sudoku_var as common_sv
+import solvd.sudoku.solving.preprocess as solving_preprocess
+import solvd.sudoku.solving.solution as solving_sltn
+import solvd.sudoku.solving.stats as solving_stats
+import solvd.sudoku.solving.timing as solving_timing
+import solvd.sudoku.ui.puzzle_page as ui_pp
+
+# cubes made per worker, so that workers finishing early have more to take
+CUBES_PER_WORKER = 4
+
+# how often the limits are checked while waiting for cubes (seconds)
+POLL_INTERVAL = 0.01
+
+# solver of the current worker process, loaded with the formula, and the
+# conflict and propagation limits of each cube it solves
+worker_solver: pysat.solvers.Solver | None = None
+worker_conflict_limit: int | None = None
+worker_propagation_limit: int | None = None
+
+
+def get_solution(
+    known_vars: list[common_sv.SudokuVar],
+    all_vars: list[common_sv.SudokuVar],
+    puzzle: "ui_pp.PuzzlePage",
+    control: "solving_sltn.SolveControl | None" = None,
+    timer: "solving_timing.SolveTimer" = solving_timing.NULL_TIMER,
+    workers: int | None = None,
+):
+    """Work out the solution to a sudoku by cube-and-conquer.
+
+    Like solution.get_solution, except that loading the formula into each
+    worker's solver is part of the solve stage.
+
+    Args:
+        known_vars: list of known true variables.
+        all_vars: list of all possible variables.
+        puzzle: the sudoku puzzle.
+        control: limits on the solve and a way to cancel it, which also
+            receives the statistics of the cubes solved, added up. No limits
+            if not given. The conflict and propagation limits apply to each
+            cube.
+        timer: records how long each stage takes.
+        workers: number of worker processes. The number of CPUs if not
+            given.
+
+    Returns:
+        the solution, UNSOLVABLE if no solution is found, or TIMED_OUT if a
+        limit was reached or the solve was cancelled first.
+    """
+    if control is None:
+        control = solving_sltn.SolveControl()
+    with timer.stage("clauses"):
+        all_clauses = solving_sltn.make_known_value_clauses(
+            known_vars, puzzle.dimension
+        ) + solving_sltn.make_puzzle_clauses(all_vars, puzzle)
+    with timer.stage("preprocess"):
+        formula = solving_preprocess.simplify(all_clauses)
+    control.stats.update(solving_stats.formula_stats(formula.clauses))
+    if formula.unsatisfiable:
+        return solving_sltn.UNSOLVABLE
+    with timer.stage("solve"):
+        workers = workers or os.cpu_count() or 1
+        cubes = make_cubes(
+            formula, puzzle.dimension, workers * CUBES_PER_WORKER
+        )
+        control.stats["cubes"] = len(cubes)
+        is_solvable, model = conquer(formula.clauses, cubes, control, workers)
+    if is_solvable is None:
+        return solving_sltn.TIMED_OUT
+    if not is_solvable:
+        return solving_sltn.UNSOLVABLE
+    with timer.stage("decode"):
+        return solving_sltn.model_to_sudokuvar(
+            formula.true_variables(model), puzzle
+        )
+
+
+def make_cubes(
+    formula: "solving_preprocess.Simplified", dimension: int, target: int
+) -> list[list[int]]:
+    """Split the search space of a simplified formula into cubes.
+
+    The variables split on are those of cells in the most clauses, each
+    taken both ways, so that the cubes cover every assignment. They are all
+    of different cells: the encoding has no clauses against a cell having two
+    values, which is only ruled out by counting, so a cube giving a cell two
+    values would be very slow to refute.
+
+    Args:
+        formula: the simplified formula.
+        dimension: size of sudoku, to find the cell of each variable.
+        target: number of cubes wanted. Rounded up to a power of 2.
+
+    Returns:
+        the cubes, each a list of the formula's (dense) literals to assume.
+        A single empty cube if there is nothing to split on.
+    """
+    occurrences = collections.Counter(
+        abs(literal) for clause in formula.clauses for literal in clause
+    )
+    depth = max(target - 1, 0).bit_length()
+    first_auxiliary = solving_sltn.first_auxiliary(dimension)
+    split = []
+    split_cells = set()
+    for variable, _ in occurrences.most_common():
+        if len(split) == depth:
+            break
+        original = int(formula.variables[variable - 1])
+        if original >= first_auxiliary:
+            continue
+        _, row, col = solving_sltn.decode_literal(original, dimension)
+        if (row, col) not in split_cells:
+            split.append(variable)
+            split_cells.add((row, col))
+    return [
+        [sign * variable for sign, variable in zip(signs, split)]
+        for signs in itertools.product((1, -1), repeat=len(split))
+    ]
+
+
+def conquer(
+    clauses: list[list[int]],
+    cubes: list[list[int]],
+    control: "solving_sltn.SolveControl",
+    workers: int,
+) -> tuple[bool | None, list[int] | None]:
+    """Solve the cubes of a formula in a pool until one is satisfiable.
+
+    Args:
+        clauses: the formula.
+        cubes: the cubes, as made by make_cubes.
+        control: limits on the solve and a way to cancel it, which also
+            receives the statistics of the cubes solved, added up.
+        workers: number of worker processes.
+
+    Returns:
+        True and the model if a cube is satisfiable, False and None if every
+        cube is unsatisfiable, or None and None if a limit was reached or
+        the solve was cancelled first.
+    """
+    deadline = None
+    if control.time_limit is not None:
+        deadline = time.monotonic() + control.time_limit
+    pool = multiprocessing.Pool(
+        min(workers, len(cubes)),
+        initializer=init_worker,
+        initargs=(clauses, control.conflict_limit, control.propagation_limit),
+    )
+    try:
+        results = pool.imap_unordered(solve_cube, cubes)
+        limited = False
+        for _ in cubes:
+            while True:
+                if control.cancelled:
+                    return None, None
+                if deadline is not None and time.monotonic() >= deadline:
+                    control.timed_out = True
+                    return None, None
+                try:
+                    is_solvable, model, stats = results.next(POLL_INTERVAL)
+                    break
+                except multiprocessing.TimeoutError:
+                    continue
+            for name, value in stats.items():
+                control.stats[name] = control.stats.get(name, 0) + value
+            if is_solvable:
+                return True, model
+            limited = limited or is_solvable is None
+        return (None if limited else False), None
+    finally:
+        pool.terminate()
+        pool.join()
+
+
+def init_worker(
+    clauses: list[list[int]],
+    conflict_limit: int | None,
+    propagation_limit: int | None,
+):
+    """Load the formula into the worker process's solver.
+
+    Args:
+        clauses: the formula.
+        conflict_limit: maximum number of conflicts in each cube's search.
+        propagation_limit: maximum number of propagations in each cube's
+            search.
+    """
+    global worker_solver, worker_conflict_limit, worker_propagation_limit
+    worker_solver = pysat.solvers.Glucose3(bootstrap_with=clauses)
+    worker_conflict_limit = conflict_limit
+    worker_propagation_limit = propagation_limit
+
+
+def solve_cube(cube: list[int]) -> tuple[bool | None, list[int] | None, dict]:
+    """Solve one cube in a worker process.
+
+    Args:
+        cube: literals to assume.
+
+    Returns:
+        whether the cube is satisfiable (None if the conflict or propagation
+        limit was reached), the model if it is, and the search's statistics.
+    """
+    before = worker_solver.accum_stats()
+    # as in SolveControl.run, the propagation budget goes first
+    if worker_propagation_limit is not None:
+        worker_solver.prop_budget(worker_propagation_limit)
+    if worker_conflict_limit is not None:
+        worker_solver.conf_budget(worker_conflict_limit)
+    is_solvable = worker_solver.solve_limited(cube)
+    model = worker_solver.get_model() if is_solvable else None
+    stats = solving_stats.search_stats(worker_solver, before)
+    return is_solvable, model, stats
@@ -0,0 +1,266 @@
+"""Corpus of fixed puzzles, used for benchmarking.
+
+There is a file in corpus/ for every implemented subtype: every standard size
+and box shape, every multidoku with a layout, and every variant. Each line of
+a file is one puzzle, written as
+
+    <grade> <name> <cells> [<constraint> ...]
+
+where cells has one character per cell, in row-major order: "." for an empty
+cell or a cell which is not part of the puzzle, otherwise the cell's value
+written with DIGITS. The constraints are a variant's clues other than the
+cells' values, written as <kind>:<numbers separated by commas>, with cells as
+a row then a column:
+
+- cage:<total>,<cells...>, e.g. cage:10,0,0,0,1 for a Killer cage of the
+  first two cells of row 0 adding up to 10
+- diagonal:<start>,<step>,<total>, e.g. diagonal:0,1,1,1,40 for a Little
+  Killer diagonal starting at row 0, column 1, running down and right, with
+  total 40
+- inequality:<greater>,<lesser>
+- consecutive:<cell>,<cell>
+- xv:<cell>,<cell>,<total>
+- skyscraper:<start>,<step>,<visible>
+
+Lines starting with "#" are comments.
+
+The grades, from easiest to hardest, are:
+
+- trivial: about 70% of cells given
+- easy: about 45% of cells given (about half for 36 x 36)
+- hard: minimal, i.e. no clue can be removed without losing uniqueness (up
+  to 16 x 16)
+- extreme: known to be hard for solvers (9 x 9 only)
+
+plus two pathological cases:
+
+- blank: no clues, so with very many solutions (up to 16 x 16)
+- unsolvable: a hard puzzle with one clue changed so it has no solution,
+  without breaking any rule directly (9 x 9, 16 x 16 and the variants only)
+
+Generated puzzles were made from a random solution by removing clues in a
+random order while the solution stayed unique. For 25 x 25 and 36 x 36,
+proving uniqueness gets too slow long before the puzzle is minimal, so
+removal stopped at the easy grade there. Little Killer puzzles were made the
+same way, after choosing diagonals of the solution at random; the same happens
+with few clues left, so its hard puzzle stopped at 10 clues rather than being
+minimal. The other variants were given every constraint their solution has
+(every cage of a random split of the grid into cages for Killer, and the signs
+within boxes for Greater Than), so their hard puzzles need only a few clues;
+their unsolvable puzzles change one constraint rather than a clue.
+"""
+
+import pathlib
+import re
+from collections.abc import Collection
+
+import solvd.sudoku.common.puzzle_spec as common_ps
+import solvd.sudoku.common.sudoku_var as common_sv
+
+DIGITS = "123456789ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz"
+
+GRADES = ("trivial", "easy", "hard", "extreme", "blank", "unsolvable")
+
+SUBTYPES = (
+    "4 x 4",
+    "6 x 6 (wide boxes)",
+    "6 x 6 (tall boxes)",
+    "8 x 8 (wide boxes)",
+    "8 x 8 (tall boxes)",
+    "9 x 9",
+    "10 x 10 (wide boxes)",
+    "10 x 10 (tall boxes)",
+    "12 x 12 (wide boxes)",
+    "12 x 12 (tall boxes)",
+    "16 x 16",
+    "25 x 25",
+    "36 x 36",
+    "Butterfly Sudoku",
+    "Cross Sudoku",
+    "Flower Sudoku",
+    "Gattai-3",
+    "Kazaguruma",
+    "Samurai Sudoku",
+    "Sohei Sudoku",
+    "Killer Sudoku",
+    "Little Killer Sudoku",
+    "Greater Than Sudoku",
+    "Consecutive Sudoku",
+    "Sudoku XV",
+    "Skyscraper Sudoku",
+)
+
+CORPUS_DIR = pathlib.Path(__file__).parent / "corpus"
+
+
+def corpus_path(subtype: str) -> pathlib.Path:
+    """Find the corpus file of a subtype.
+
+    Args:
+        subtype: subtype of sudoku.
+
+    Returns:
+        path of the file, e.g. corpus/9x9.txt, corpus/6x6-wide.txt or
+        corpus/samurai-sudoku.txt.
+    """
+    match = common_ps.STANDARD_PATTERN.fullmatch(subtype)
+    if match is None:
+        name = re.sub(r"[^a-z0-9]+", "-", subtype.lower()).strip("-")
+    else:
+        name = f"{match.group(1)}x{match.group(1)}"
+        if match.group(3) is not None:
+            name += "-" + match.group(3)
+    return CORPUS_DIR / f"{name}.txt"
+
+
+def load(
+    subtype: str, grades: Collection[str] = GRADES
+) -> list[tuple[str, str, list[list[int]], list[common_sv.Constraint]]]:
+    """Load the puzzles of a subtype.
+
+    Args:
+        subtype: subtype of sudoku, one of SUBTYPES.
+        grades: grades of puzzle to load.
+
+    Returns:
+        the grade, name, grid and constraints of each puzzle, in the file's
+        order.
+
+    Raises:
+        ValueError: if a line of the file is not a valid puzzle.
+    """
+    spec = common_ps.PuzzleSpec(subtype)
+    path = corpus_path(subtype)
+    puzzles = []
+    with open(path) as file:
+        for line_num, line in enumerate(file, 1):
+            line = line.strip()
+            if not line or line.startswith("#"):
+                continue
+            fields = line.split()
+            if (
+                len(fields) < 3
+                or fields[0] not in GRADES
+                or len(fields[2]) != spec.dimension**2
+            ):
+                raise ValueError(f"{path}:{line_num}: not a valid puzzle")
+            grade, name, cells = fields[:3]
+            try:
+                constraints = [parse_constraint(text) for text in fields[3:]]
+            except ValueError as error:
+                raise ValueError(f"{path}:{line_num}: {error}") from error
+            if grade in grades:
+                puzzles.append(
+                    (
+                        grade,
+                        name,
+                        parse_grid(cells, spec.dimension),
+                        constraints,
+                    )
+                )
+    return puzzles
+
+
+def parse_grid(cells: str, dimension: int) -> list[list[int]]:
+    """Convert a puzzle written as text to a grid of numbers.
+
+    Args:
+        cells: the puzzle's cells, as in the corpus files.
+        dimension: width of the puzzle (number of cells).
+
+    Returns:
+        rows of the puzzle, with 0 for empty cells.
+    """
+    values = [DIGITS.find(char) + 1 for char in cells]
+    return [
+        values[row * dimension : (row + 1) * dimension]
+        for row in range(dimension)
+    ]
+
+
+def format_grid(grid: list[list[int]]) -> str:
+    """Convert a grid of numbers to text.
+
+    Args:
+        grid: rows of the puzzle, with 0 for empty cells.
+
+    Returns:
+        the puzzle's cells, as in the corpus files.
+    """
+    return "".join(
+        "." if value == 0 else DIGITS[value - 1]
+        for row in grid
+        for value in row
+    )
+
+
+def parse_constraint(text: str) -> common_sv.Constraint:
+    """Convert a constraint written as text to a constraint.
+
+    Args:
+        text: the constraint, as in the corpus files.
+
+    Returns:
+        the constraint.
+
+    Raises:
+        ValueError: if the text is not a valid constraint.
+    """
+    kind, _, numbers = text.partition(":")
+    try:
+        values = [int(value) for value in numbers.split(",")]
+    except ValueError:
+        raise ValueError(f"Not a valid constraint: {text}") from None
+    cells = list(zip(values[::2], values[1::2]))
+    match kind, len(values):
+        case "cage", length if length >= 3 and length % 2:
+            return common_sv.Cage(
+                list(zip(values[1::2], values[2::2])), values[0]
+            )
+        case "diagonal", 5:
+            return common_sv.Diagonal(cells[0], cells[1], values[4])
+        case "skyscraper", 5:
+            return common_sv.SkyscraperClue(cells[0], cells[1], values[4])
+        case "inequality", 4:
+            return common_sv.Inequality(cells[0], cells[1])
+        case "consecutive", 4:
+            return common_sv.ConsecutivePair(tuple(cells))
+        case "xv", 5:
+            return common_sv.XVMark(tuple(cells[:2]), values[4])
+    raise ValueError(f"Not a valid constraint: {text}")
+
+
+def format_constraint(constraint: common_sv.Constraint) -> str:
+    """Convert a constraint to text.
+
+    Args:
+        constraint: the constraint.
+
+    Returns:
+        the constraint, as in the corpus files.
+    """
+    match constraint:
+        case common_sv.Cage():
+            kind = "cage"
+            numbers = [constraint.total]
+            for cell in constraint.cells:
+                numbers.extend(cell)
+        case common_sv.Diagonal():
+            kind = "diagonal"
+            numbers = [*constraint.start, *constraint.direction]
+            numbers.append(constraint.total)
+        case common_sv.SkyscraperClue():
+            kind = "skyscraper"
+            numbers = [*constraint.start, *constraint.direction]
+            numbers.append(constraint.visible)
+        case common_sv.Inequality():
+            kind = "inequality"
+            numbers = [*constraint.greater, *constraint.lesser]
+        case common_sv.ConsecutivePair():
+            kind = "consecutive"
+            numbers = [*constraint.cells[0], *constraint.cells[1]]
+        case common_sv.XVMark():
+            kind = "xv"
+            numbers = [*constraint.cells[0], *constraint.cells[1]]
+            numbers.append(constraint.total)
+    return f"{kind}:" + ",".join(map(str, numbers))
@@ -0,0 +1,193 @@
+"""Solving sudoku puzzles given as grids of numbers, without the UI."""
+
+import pysat.solvers
+
+import solvd.sudoku.common.puzzle_spec as common_ps
+import solvd.sudoku.common.sudoku_var as common_sv
+import solvd.sudoku.solving.bitboard as solving_bitboard
+import solvd.sudoku.solving.cubes as solving_cubes
+import solvd.sudoku.solving.portfolio as solving_portfolio
+import solvd.sudoku.solving.solution as solving_sltn
+import solvd.sudoku.solving.stats as solving_stats
+import solvd.sudoku.solving.timing as solving_timing
+
+# "glucose" solves with the SAT solver, "bitboard" with the backtracking
+# solver in bitboard (standard sudoku only), "portfolio" by racing several SAT
+# solvers (see portfolio), "cubes" by cube-and-conquer (see cubes)
+ENGINES = ("glucose", "bitboard", "portfolio", "cubes")
+
+
+def grid_to_vars(
+    spec: common_ps.PuzzleSpec, grid: list[list[int]]
+) -> tuple[list[common_sv.SudokuVar], list[common_sv.SudokuVar]]:
+    """Convert a grid of clues to variables.
+
+    Args:
+        spec: the puzzle's layout.
+        grid: rows of the puzzle, with 0 for empty cells. Cells which are not
+            part of the puzzle (e.g. the corners of a Samurai Sudoku) are
+            ignored.
+
+    Returns:
+        the known variables and all variables of the puzzle.
+    """
+    known_vars = []
+    all_vars = []
+    for row, col, box in spec.cells():
+        value = grid[row][col]
+        if value != 0:
+            known_vars.append(common_sv.SudokuVar(value, row, col, box))
+        all_vars.append(common_sv.SudokuVar(value, row, col, box))
+    return known_vars, all_vars
+
+
+def solution_to_grid(
+    spec: common_ps.PuzzleSpec, solution: list[common_sv.SudokuVar]
+) -> list[list[int]]:
+    """Convert a solution to a grid of numbers.
+
+    Args:
+        spec: the puzzle's layout.
+        solution: solution returned by get_solution.
+
+    Returns:
+        rows of the solved puzzle, with 0 for cells not part of the puzzle.
+    """
+    grid = blank_grid(spec)
+    for var in solution:
+        grid[var.row][var.col] = var.value
+    return grid
+
+
+def solve_grid(
+    spec: common_ps.PuzzleSpec,
+    grid: list[list[int]],
+    control: "solving_sltn.SolveControl | None" = None,
+    engine: str = "glucose",
+    timer: "solving_timing.SolveTimer | None" = None,
+) -> list[list[int]] | int:
+    """Solve a puzzle given as a grid of clues.
+
+    Args:
+        spec: the puzzle's layout.
+        grid: rows of the puzzle, with 0 for empty cells.
+        control: limits on the solve and a way to cancel it, which also
+            receives the solve's statistics.
+        engine: solver to use, one of ENGINES.
+        timer: records how long each stage takes. Started with
+            timing.start if not given.
+
+    Returns:
+        rows of the solved puzzle, or UNSOLVABLE or TIMED_OUT as returned by
+        get_solution.
+
+    Raises:
+        ValueError: if the engine is not recognised or cannot solve the
+            subtype.
+    """
+    if engine not in ENGINES:
+        raise ValueError(f"Unknown engine: {engine}")
+    if timer is None:
+        timer = solving_timing.start(spec.subtype)
+    if engine == "bitboard":
+        solution = solving_bitboard.solve(spec, grid, control, timer)
+        timer.finish()
+        return solution
+    known_vars, all_vars = grid_to_vars(spec, grid)
+    get_solution = {
+        "glucose": solving_sltn.get_solution,
+        "portfolio": solving_portfolio.get_solution,
+        "cubes": solving_cubes.get_solution,
+    }[engine]
+    solution = get_solution(known_vars, all_vars, spec, control, timer)
+    if solution not in (solving_sltn.UNSOLVABLE, solving_sltn.TIMED_OUT):
+        with timer.stage("decode"):
+            solution = solution_to_grid(spec, solution)
+    timer.finish()
+    return solution
+
+
+class SolverSession:
+    """A solver kept loaded with one subtype's rules, reused for many puzzles.
+
+    The rules are turned into clauses and loaded once. Each puzzle's clues
+    are then passed to the solver as assumptions, so they do not stay in the
+    solver after the solve, and clauses learnt solving one puzzle carry over
+    to the next.
+
+    Attributes:
+        spec: the layout of the puzzles solved.
+        all_vars: list of all possible variables.
+        formula_stats: numbers of variables, clauses and literals in the
+            rules.
+        sat_solver: the loaded solver.
+    """
+
+    def __init__(self, spec: common_ps.PuzzleSpec):
+        """Create the session and load the puzzle's rules.
+
+        Args:
+            spec: the layout of the puzzles to be solved.
+        """
+        self.spec = spec
+        _, self.all_vars = grid_to_vars(spec, blank_grid(spec))
+        clauses = solving_sltn.make_puzzle_clauses(self.all_vars, spec)
+        self.formula_stats = solving_stats.formula_stats(clauses)
+        self.sat_solver = pysat.solvers.Glucose3(bootstrap_with=clauses)
+
+    def solve(
+        self,
+        grid: list[list[int]],
+        control: "solving_sltn.SolveControl | None" = None,
+    ) -> list[list[int]] | int:
+        """Solve a puzzle given as a grid of clues.
+
+        Args:
+            grid: rows of the puzzle, with 0 for empty cells.
+            control: limits on the solve and a way to cancel it, which
+                also receives the solve's statistics.
+
+        Returns:
+            rows of the solved puzzle, or UNSOLVABLE or TIMED_OUT.
+        """
+        if control is None:
+            control = solving_sltn.SolveControl()
+        timer = solving_timing.start(self.spec.subtype)
+        with timer.stage("clauses"):
+            known_vars, _ = grid_to_vars(self.spec, grid)
+            clues = solving_sltn.make_known_value_clauses(
+                known_vars, self.spec.dimension
+            )
+        # the clues are counted as the unit clauses they replace, whose
+        # variables are all in the rules already
+        control.stats["variables"] = self.formula_stats["variables"]
+        control.stats["clauses"] = self.formula_stats["clauses"] + len(clues)
+        control.stats["literals"] = self.formula_stats["literals"] + len(clues)
+        solution = solving_sltn.solve_loaded(
+            self.sat_solver,
+            self.spec,
+            control,
+            [clause[0] for clause in clues],
+            timer,
+        )
+        if solution not in (solving_sltn.UNSOLVABLE, solving_sltn.TIMED_OUT):
+            with timer.stage("decode"):
+                solution = solution_to_grid(self.spec, solution)
+        timer.finish()
+        return solution
+
+    def close(self):
+        """Free the solver."""
+        self.sat_solver.delete()
+
+
+def blank_grid(spec: common_ps.PuzzleSpec) -> list[list[int]]:
+    """Make a grid with no clues.
+
+    Args:
+        spec: the puzzle's layout.
+
+    Returns:
+        rows of the puzzle, all 0.
+    """
+    return [[0] * spec.dimension for _ in range(spec.dimension)]
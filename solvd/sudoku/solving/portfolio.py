@@ -0,0 +1,186 @@
+"""Portfolio solving: racing several SAT solvers on the same formula.
+
+How long a solver takes on a hard formula varies a lot between solvers, and
+which one is fastest differs from formula to formula, so running a few
+different ones side by side and taking the first answer cuts the slowest
+solves down. Each solver runs in its own process, since only processes can be
+stopped at once when another solver answers first.
+
+The formula is made once, in the calling process, and the solver processes
+inherit it. Starting the processes costs some milliseconds, so the portfolio
+only pays off on formulas which take a while to solve, such as hard multidoku.
+"""
+
+import multiprocessing
+import queue
+import time
+
+import pysat.solvers
+
+import solvd.sudoku.common.sudoku_var as common_sv
+import solvd.sudoku.solving.preprocess as solving_preprocess
+import solvd.sudoku.solving.solution as solving_sltn
+import solvd.sudoku.solving.stats as solving_stats
+import solvd.sudoku.solving.timing as solving_timing
+import solvd.sudoku.ui.puzzle_page as ui_pp
+
+# pysat names of the solvers raced by default
+BACKENDS = ("glucose3", "cadical195", "maplechrono")
+
+# how often the limits are checked while waiting for an answer (seconds)
+POLL_INTERVAL = 0.01
+
+
+def get_solution(
+    known_vars: list[common_sv.SudokuVar],
+    all_vars: list[common_sv.SudokuVar],
+    puzzle: "ui_pp.PuzzlePage",
+    control: "solving_sltn.SolveControl | None" = None,
+    timer: "solving_timing.SolveTimer" = solving_timing.NULL_TIMER,
+    backends: tuple[str, ...] = BACKENDS,
+):
+    """Work out the solution to a sudoku by racing several solvers.
+
+    Like solution.get_solution, except that loading the formula into each
+    solver is part of the solve stage, as it happens in the solver processes.
+
+    Args:
+        known_vars: list of known true variables.
+        all_vars: list of all possible variables.
+        puzzle: the sudoku puzzle.
+        control: limits on the solve and a way to cancel it, which also
+            receives the statistics of the solver which answered. No limits
+            if not given. Each solver gets the conflict and propagation
+            limits; solvers without a propagation limit (CaDiCaL) drop out
+            of the race if one is set.
+        timer: records how long each stage takes.
+        backends: pysat names of the solvers to race.
+
+    Returns:
+        the solution, UNSOLVABLE if no solution is found, or TIMED_OUT if a
+        limit was reached by every solver, the time limit was reached or the
+        solve was cancelled first.
+    """
+    if control is None:
+        control = solving_sltn.SolveControl()
+    with timer.stage("clauses"):
+        all_clauses = solving_sltn.make_known_value_clauses(
+            known_vars, puzzle.dimension
+        ) + solving_sltn.make_puzzle_clauses(all_vars, puzzle)
+    with timer.stage("preprocess"):
+        formula = solving_preprocess.simplify(all_clauses)
+    control.stats.update(solving_stats.formula_stats(formula.clauses))
+    if formula.unsatisfiable:
+        return solving_sltn.UNSOLVABLE
+    with timer.stage("solve"):
+        is_solvable, model = race(formula.clauses, control, backends)
+    if is_solvable is None:
+        return solving_sltn.TIMED_OUT
+    if not is_solvable:
+        return solving_sltn.UNSOLVABLE
+    with timer.stage("decode"):
+        return solving_sltn.model_to_sudokuvar(
+            formula.true_variables(model), puzzle
+        )
+
+
+def race(
+    clauses: list[list[int]],
+    control: "solving_sltn.SolveControl",
+    backends: tuple[str, ...] = BACKENDS,
+) -> tuple[bool | None, list[int] | None]:
+    """Solve a formula with several solvers at once, taking the first answer.
+
+    The solvers still running once there is an answer are terminated, as
+    are all of them if the time limit is reached or the solve is cancelled.
+    A solver stopped by the conflict or propagation limit gives no answer.
+
+    Args:
+        clauses: the formula.
+        control: limits on the solve and a way to cancel it, which also
+            receives the search statistics of the solver which answered.
+        backends: pysat names of the solvers to race.
+
+    Returns:
+        True and the model if satisfiable, False and None if unsatisfiable,
+        or None and None if no solver answered.
+    """
+    deadline = None
+    if control.time_limit is not None:
+        deadline = time.monotonic() + control.time_limit
+    results = multiprocessing.Queue()
+    processes = [
+        multiprocessing.Process(
+            target=run_backend,
+            args=(
+                backend,
+                clauses,
+                control.conflict_limit,
+                control.propagation_limit,
+                results,
+            ),
+            daemon=True,
+        )
+        for backend in backends
+    ]
+    for process in processes:
+        process.start()
+    try:
+        unanswered = len(processes)
+        while unanswered and not control.cancelled:
+            if deadline is not None and time.monotonic() >= deadline:
+                control.timed_out = True
+                break
+            try:
+                is_solvable, model, stats = results.get(timeout=POLL_INTERVAL)
+            except queue.Empty:
+                # a solver which crashed never answers
+                if not any(process.is_alive() for process in processes):
+                    break
+                continue
+            unanswered -= 1
+            if is_solvable is not None:
+                control.stats.update(stats)
+                return is_solvable, model
+        return None, None
+    finally:
+        for process in processes:
+            if process.is_alive():
+                process.terminate()
+        for process in processes:
+            process.join()
+        results.close()
+
+
+def run_backend(
+    backend: str,
+    clauses: list[list[int]],
+    conflict_limit: int | None,
+    propagation_limit: int | None,
+    results: multiprocessing.Queue,
+):
+    """Solve a formula with one solver, in a solver process.
+
+    The time limit and cancelling are left to the calling process, which
+    terminates this one, as not every solver can be interrupted.
+
+    Args:
+        backend: pysat name of the solver.
+        clauses: the formula.
+        conflict_limit: maximum number of conflicts in the search.
+        propagation_limit: maximum number of propagations in the search.
+        results: queue to put whether the formula is satisfiable (None if
+            a limit was reached), the model if it is, and the search's
+            statistics on.
+    """
+    with pysat.solvers.Solver(name=backend, bootstrap_with=clauses) as solver:
+        # as in SolveControl.run, the propagation budget goes first
+        if propagation_limit is not None:
+            solver.prop_budget(propagation_limit)
+        if conflict_limit is not None:
+            solver.conf_budget(conflict_limit)
+        before = solver.accum_stats()
+        is_solvable = solver.solve_limited()
+        model = solver.get_model() if is_solvable else None
+        stats = solving_stats.search_stats(solver, before)
+    results.put((is_solvable, model, stats))
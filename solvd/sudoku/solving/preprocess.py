@@ -0,0 +1,132 @@
+"""Simplifying a formula by unit propagation before it is loaded.
+
+The clue clauses are unit clauses, and with the cell and group clauses they
+fix many more variables: a clue rules out the other values of its cell and
+itself from the other cells of its groups, which can leave a cell with one
+value, and so on. simplify propagates unit clauses until nothing changes,
+then:
+
+- deletes the clauses satisfied by the fixed variables
+- strips the literals they falsify from the remaining clauses
+- renumbers the variables left in the remaining clauses densely from 1
+
+so the solver is given a much smaller formula, with no unused variables
+between the sparse ids of the sudoku encoding. Simplified.true_variables
+maps the solver's model back to the original variables.
+
+Propagation works on whole arrays of literals at once, one round per step
+of the chain of implied units.
+"""
+
+import itertools
+
+import numpy as np
+
+
+class Simplified:
+    """A formula after unit propagation.
+
+    Attributes:
+        clauses: the remaining clauses, with variables numbered densely.
+        variables: original variable of each dense variable, i.e. dense
+            variable i is variables[i - 1].
+        fixed: original literals made true by propagation.
+        unsatisfiable: whether propagation found a contradiction. clauses is
+            then a single empty clause.
+    """
+
+    def __init__(
+        self,
+        clauses: list[list[int]],
+        variables: np.ndarray,
+        fixed: np.ndarray,
+        unsatisfiable: bool = False,
+    ):
+        """Create the Simplified.
+
+        Args:
+            clauses: the remaining clauses, with variables numbered densely.
+            variables: original variable of each dense variable.
+            fixed: original literals made true by propagation.
+            unsatisfiable: whether propagation found a contradiction.
+        """
+        self.clauses = clauses
+        self.variables = variables
+        self.fixed = fixed
+        self.unsatisfiable = unsatisfiable
+
+    def true_variables(self, model: list[int]) -> list[int]:
+        """Find the original variables made true by a model.
+
+        Args:
+            model: model of the simplified formula, from the solver.
+
+        Returns:
+            the original variables fixed true by propagation or true in the
+            model.
+        """
+        dense = np.asarray(model, dtype=np.int64)
+        true_in_model = self.variables[dense[dense > 0] - 1]
+        return self.fixed[self.fixed > 0].tolist() + true_in_model.tolist()
+
+
+def simplify(clauses: list[list[int]]) -> Simplified:
+    """Propagate the unit clauses of a formula and simplify it.
+
+    Args:
+        clauses: the formula, with no empty clauses.
+
+    Returns:
+        the simplified formula.
+    """
+    if not clauses:
+        empty = np.zeros(0, dtype=np.int64)
+        return Simplified([], empty, empty)
+    lengths = np.fromiter(map(len, clauses), dtype=np.int64, count=len(clauses))
+    literals = np.fromiter(
+        itertools.chain.from_iterable(clauses),
+        dtype=np.int64,
+        count=int(lengths.sum()),
+    )
+    # 1 if the variable is true, -1 if false, 0 if not fixed yet
+    assignment = np.zeros(int(np.abs(literals).max()) + 1, dtype=np.int8)
+    units = literals[np.cumsum(lengths)[lengths == 1] - 1]
+    while len(units):
+        unit_variables = np.abs(units)
+        unit_signs = np.sign(units).astype(np.int8)
+        assignment[unit_variables] = unit_signs
+        # a variable forced both ways keeps only the last sign assigned
+        if np.any(assignment[unit_variables] != unit_signs):
+            return unsatisfiable()
+        # drop the satisfied clauses and the falsified literals, so each
+        # round only looks at what is left
+        values = assignment[np.abs(literals)] * np.sign(literals)
+        starts = np.cumsum(lengths) - lengths
+        open_clauses = np.maximum.reduceat(values, starts) < 1
+        unfixed = np.add.reduceat(values == 0, starts, dtype=np.int64)
+        if np.any(open_clauses & (unfixed == 0)):
+            return unsatisfiable()
+        literals = literals[(values == 0) & np.repeat(open_clauses, lengths)]
+        lengths = unfixed[open_clauses]
+        units = literals[np.cumsum(lengths)[lengths == 1] - 1]
+        if not len(lengths):
+            break
+
+    kept_variables, dense = np.unique(np.abs(literals), return_inverse=True)
+    dense_literals = ((dense + 1) * np.sign(literals)).tolist()
+    bounds = np.cumsum(lengths).tolist()
+    remaining = [
+        dense_literals[start:end] for start, end in zip([0] + bounds, bounds)
+    ]
+    fixed = np.flatnonzero(assignment) * assignment[assignment != 0]
+    return Simplified(remaining, kept_variables, fixed.astype(np.int64))
+
+
+def unsatisfiable() -> Simplified:
+    """Make the simplified form of a formula with no solution.
+
+    Returns:
+        a formula of a single empty clause.
+    """
+    empty = np.zeros(0, dtype=np.int64)
+    return Simplified([[]], empty, empty, unsatisfiable=True)
@@ -0,0 +1,267 @@
+"""Profiling of the stages of each solve with cProfile and tracemalloc.
+
+Enabled by setting the SOLVD_PROFILE environment variable to an output
+directory, or with the --profile option of the benchmark and the solving
+service. SOLVD_PROFILE_TOOLS chooses the tools, "cprofile", "tracemalloc" or
+both (the default), separated by commas.
+
+Each stage (see timing) of every solve is profiled, and the profiles of a
+stage are added up over all the solves of a subtype, so a batch of solves
+gives one profile per subtype and stage. After every solve, the profiles of
+its subtype are written to the output directory as:
+
+- <subtype>-<pid>-<stage>.prof: cProfile statistics, readable with pstats or
+  snakeviz
+- <subtype>-<pid>-<stage>.alloc.txt: the lines which allocated the most memory
+  still held at the end of the stage, and the peak memory of the stage
+
+Profiling slows solving down a lot, and both tools are process-wide, so
+stages of solves running at the same time in other threads are profiled one
+after another rather than concurrently.
+"""
+
+import contextlib
+import cProfile
+import os
+import pathlib
+import re
+import threading
+import tracemalloc
+from collections.abc import Iterator
+
+import solvd.sudoku.solving.timing as solving_timing
+
+TOOLS = ("cprofile", "tracemalloc")
+
+# number of lines listed in each allocation report
+TOP_ALLOCATIONS = 25
+
+# number of frames tracemalloc keeps of each allocation's traceback
+TRACEBACK_FRAMES = 1
+
+output_dir: pathlib.Path | None = None
+tools: tuple[str, ...] = ()
+
+# (subtype, stage) -> profile or allocation totals
+profiles: dict[tuple[str, str], cProfile.Profile] = {}
+allocations: dict[tuple[str, str], "AllocationTotals"] = {}
+
+_lock = threading.Lock()
+_active = threading.local()
+
+
+def enable(
+    directory: str | os.PathLike, enabled_tools: tuple[str, ...] = TOOLS
+):
+    """Profile the stages of every solve from now on.
+
+    Args:
+        directory: directory to write the profiles to.
+        enabled_tools: tools to profile with, from TOOLS.
+
+    Raises:
+        ValueError: if a tool is not recognised.
+    """
+    global output_dir, tools
+    for tool in enabled_tools:
+        if tool not in TOOLS:
+            raise ValueError(f"Unknown profiling tool: {tool}")
+    output_dir = pathlib.Path(directory)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    tools = tuple(enabled_tools)
+    if "tracemalloc" in tools and not tracemalloc.is_tracing():
+        tracemalloc.start(TRACEBACK_FRAMES)
+    solving_timing.timer_class = ProfilingTimer
+
+
+def enable_from_environment():
+    """Enable profiling as set by SOLVD_PROFILE and SOLVD_PROFILE_TOOLS."""
+    enabled_tools = os.environ.get("SOLVD_PROFILE_TOOLS", ",".join(TOOLS))
+    enable(
+        os.environ["SOLVD_PROFILE"],
+        tuple(tool.strip() for tool in enabled_tools.split(",") if tool),
+    )
+
+
+def disable():
+    """Stop profiling, writing out what has been profiled so far."""
+    global output_dir
+    if output_dir is None:
+        return
+    write(None)
+    solving_timing.timer_class = solving_timing.SolveTimer
+    if tracemalloc.is_tracing():
+        tracemalloc.stop()
+    output_dir = None
+    profiles.clear()
+    allocations.clear()
+
+
+class AllocationTotals:
+    """Memory allocated by each line over many runs of a stage.
+
+    Attributes:
+        sizes: bytes allocated and still held at the end of the stage, by
+            (filename, line number).
+        counts: number of those allocations, by (filename, line number).
+        peak: highest memory use seen during the stage (bytes).
+        runs: number of runs of the stage added.
+    """
+
+    def __init__(self):
+        """Create the AllocationTotals."""
+        self.sizes = {}
+        self.counts = {}
+        self.peak = 0
+        self.runs = 0
+
+    def add(
+        self,
+        before: tracemalloc.Snapshot,
+        after: tracemalloc.Snapshot,
+        peak: int,
+    ):
+        """Add a run of the stage.
+
+        Args:
+            before: snapshot from the start of the stage.
+            after: snapshot from the end of the stage.
+            peak: peak memory use during the stage (bytes).
+        """
+        for diff in after.compare_to(before, "lineno"):
+            frame = diff.traceback[0]
+            key = (frame.filename, frame.lineno)
+            self.sizes[key] = self.sizes.get(key, 0) + diff.size_diff
+            self.counts[key] = self.counts.get(key, 0) + diff.count_diff
+        self.peak = max(self.peak, peak)
+        self.runs += 1
+
+    def report(self, title: str) -> str:
+        """Describe the lines which allocated the most.
+
+        Args:
+            title: first line of the report.
+
+        Returns:
+            the report.
+        """
+        lines = [
+            title,
+            f"runs: {self.runs}",
+            f"peak: {self.peak / 1024:.1f} KiB",
+            "",
+            "bytes held  allocations  line",
+        ]
+        top = sorted(self.sizes, key=self.sizes.get, reverse=True)
+        for filename, lineno in top[:TOP_ALLOCATIONS]:
+            key = (filename, lineno)
+            lines.append(
+                f"{self.sizes[key]:>10}  {self.counts[key]:>11}  "
+                f"{filename}:{lineno}"
+            )
+        return "\n".join(lines) + "\n"
+
+
+class ProfilingTimer(solving_timing.SolveTimer):
+    """A SolveTimer which also profiles each stage."""
+
+    @contextlib.contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        """Time and profile a stage.
+
+        A stage inside another stage is only timed, as the outer stage's
+        profile already covers it.
+
+        Args:
+            name: name of the stage.
+        """
+        if getattr(_active, "stage", None) is not None:
+            with solving_timing.SolveTimer.stage(self, name):
+                yield
+            return
+        key = (self.subtype, name)
+        with _lock:
+            _active.stage = name
+            try:
+                with (
+                    solving_timing.SolveTimer.stage(self, name),
+                    profile(key),
+                ):
+                    yield
+            finally:
+                _active.stage = None
+
+    def finish(self):
+        """Write the profiles of the subtype and pass on the durations."""
+        write(self.subtype)
+        solving_timing.SolveTimer.finish(self)
+
+
+@contextlib.contextmanager
+def profile(key: tuple[str, str]) -> Iterator[None]:
+    """Profile a block of code with the enabled tools.
+
+    Args:
+        key: subtype and stage to add the profile to.
+    """
+    profiler = None
+    if "cprofile" in tools:
+        profiler = profiles.setdefault(key, cProfile.Profile())
+    before = None
+    if "tracemalloc" in tools and tracemalloc.is_tracing():
+        tracemalloc.reset_peak()
+        before = take_snapshot()
+    if profiler is not None:
+        profiler.enable()
+    try:
+        yield
+    finally:
+        if profiler is not None:
+            profiler.disable()
+        if before is not None:
+            peak = tracemalloc.get_traced_memory()[1]
+            totals = allocations.setdefault(key, AllocationTotals())
+            totals.add(before, take_snapshot(), peak)
+
+
+def take_snapshot() -> tracemalloc.Snapshot:
+    """Take a tracemalloc snapshot, leaving out tracemalloc's own memory.
+
+    Returns:
+        the snapshot.
+    """
+    return tracemalloc.take_snapshot().filter_traces(
+        (tracemalloc.Filter(False, tracemalloc.__file__),)
+    )
+
+
+def write(subtype: str | None):
+    """Write out profiles.
+
+    Args:
+        subtype: subtype whose profiles are written. All if None.
+    """
+    if output_dir is None:
+        return
+    with _lock:
+        for key, profiler in profiles.items():
+            if subtype is None or key[0] == subtype:
+                profiler.dump_stats(output_path(key, ".prof"))
+        for key, totals in allocations.items():
+            if subtype is None or key[0] == subtype:
+                with open(output_path(key, ".alloc.txt"), "w") as file:
+                    file.write(totals.report(f"{key[0]}: {key[1]}"))
+
+
+def output_path(key: tuple[str, str], suffix: str) -> pathlib.Path:
+    """Work out where to write a profile.
+
+    Args:
+        key: subtype and stage profiled.
+        suffix: file extension.
+
+    Returns:
+        path of the file.
+    """
+    subtype = re.sub(r"[^a-z0-9]+", "-", key[0].lower()).strip("-")
+    return output_dir / f"{subtype}-{os.getpid()}-{key[1]}{suffix}"
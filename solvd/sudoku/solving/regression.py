@@ -0,0 +1,355 @@
+"""Performance regression gate for the solving pipeline.
+
+Run with `python -m solvd.sudoku.solving.regression`. The benchmark is run,
+its results are saved in the results directory as <revision>.json, tagged
+with the git revision they were measured at, and compared with a baseline
+from an earlier run. The command fails (exit status 1) if any puzzle got
+slower in a gated stage, by default clause generation and the SAT search, by
+more than the tolerance. It also fails if the two runs cannot be compared
+puzzle by puzzle: if they used different engines, or a puzzle is in only one
+of them, so the baseline must be recorded with the same subtypes and grades.
+
+A puzzle's time for a stage is the minimum over the repeated runs, the
+measure least affected by noise. A slowdown only counts as a regression if it
+is more than the relative tolerance and also more than --min-difference
+seconds, so tiny timings jittering do not fail the gate.
+
+Typical use is to record a baseline on the main branch:
+
+    python -m solvd.sudoku.solving.regression --update-baseline
+
+and then check a change against it:
+
+    python -m solvd.sudoku.solving.regression
+"""
+
+import argparse
+import datetime
+import json
+import pathlib
+import subprocess
+import sys
+
+import solvd.sudoku.solving.benchmark as solving_benchmark
+import solvd.sudoku.solving.fixtures as solving_fixtures
+import solvd.sudoku.solving.headless as solving_headless
+
+GATED_STAGES = ("clauses", "solve")
+
+
+def git_revision() -> str:
+    """Find the git revision of the working tree.
+
+    Returns:
+        the abbreviated commit hash, with "-dirty" added if there are
+        uncommitted changes, or "unknown" if it is not a git repository.
+    """
+    try:
+        revision = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+        changes = subprocess.run(
+            ["git", "status", "--porcelain", "--untracked-files=no"],
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+    return revision + "-dirty" if changes else revision
+
+
+def save(results: dict, results_dir: pathlib.Path) -> pathlib.Path:
+    """Save benchmark results, tagged with the current git revision.
+
+    Args:
+        results: results from benchmark.run. The revision and time are added.
+        results_dir: directory to save them in.
+
+    Returns:
+        path of the file saved.
+    """
+    results["revision"] = git_revision()
+    results["recorded"] = datetime.datetime.now(datetime.UTC).isoformat()
+    results_dir.mkdir(parents=True, exist_ok=True)
+    path = results_dir / f"{results['revision']}.json"
+    with open(path, "w") as file:
+        json.dump(results, file, indent=2)
+    return path
+
+
+def result_key(result: dict) -> tuple[str, str, str, str | None]:
+    """Identify the puzzle and settings a benchmark result is for.
+
+    Args:
+        result: one of the results from benchmark.run.
+
+    Returns:
+        the subtype, grade and name of the puzzle, and the pseudo-boolean
+        encoding it was solved with (None if not benchmarked with one).
+    """
+    return (
+        result["subtype"],
+        result["grade"],
+        result["name"],
+        result.get("pb_encoding"),
+    )
+
+
+def describe_key(key: tuple[str, str, str, str | None]) -> str:
+    """Describe the puzzle and settings a benchmark result is for.
+
+    Args:
+        key: the result's key, from result_key.
+
+    Returns:
+        the subtype, grade and name of the puzzle, followed by the
+        pseudo-boolean encoding in brackets if it was solved with one.
+    """
+    subtype, grade, name, pb_encoding = key
+    text = f"{subtype} {grade} {name}"
+    if pb_encoding is not None:
+        text += f" ({pb_encoding})"
+    return text
+
+
+def mismatches(baseline: dict, current: dict) -> list[str]:
+    """Find what stops two benchmark results being compared like for like.
+
+    Args:
+        baseline: earlier results from benchmark.run.
+        current: later results from benchmark.run.
+
+    Returns:
+        a description of each mismatch: a different engine, or a puzzle in
+        only one of the results.
+    """
+    problems = []
+    if baseline.get("engine") != current.get("engine"):
+        problems.append(
+            f"engine {current.get('engine')} differs from the baseline's "
+            f"{baseline.get('engine')}"
+        )
+    baseline_keys = [result_key(result) for result in baseline["results"]]
+    current_keys = [result_key(result) for result in current["results"]]
+    problems.extend(
+        f"{describe_key(key)} is missing from the current results"
+        for key in baseline_keys
+        if key not in current_keys
+    )
+    problems.extend(
+        f"{describe_key(key)} is missing from the baseline"
+        for key in current_keys
+        if key not in baseline_keys
+    )
+    return problems
+
+
+def compare(
+    baseline: dict,
+    current: dict,
+    tolerances: dict[str, float],
+    min_difference: float,
+) -> list[dict]:
+    """Find the puzzles and stages which got slower.
+
+    Puzzles in only one of the results are skipped here, and reported by
+    mismatches instead.
+
+    Args:
+        baseline: earlier results from benchmark.run.
+        current: later results from benchmark.run.
+        tolerances: for each stage compared, how much slower it may get, as
+            a fraction of the baseline time (e.g. 0.2 for 20%).
+        min_difference: how much slower a stage must get to count, in
+            seconds.
+
+    Returns:
+        the subtype, grade, name, pseudo-boolean encoding (None if not
+        benchmarked with one), stage, baseline and current time (seconds) and
+        relative change of each regression.
+    """
+    baseline_results = {
+        result_key(result): result for result in baseline["results"]
+    }
+    regressions = []
+    for result in current["results"]:
+        key = result_key(result)
+        if key not in baseline_results:
+            continue
+        for stage, tolerance in tolerances.items():
+            before = baseline_results[key]["stages"][stage]["min"]
+            after = result["stages"][stage]["min"]
+            difference = after - before
+            if difference > min_difference and difference > tolerance * before:
+                regressions.append(
+                    {
+                        "subtype": key[0],
+                        "grade": key[1],
+                        "name": key[2],
+                        "pb_encoding": key[3],
+                        "stage": stage,
+                        "baseline": before,
+                        "current": after,
+                        "change": difference / before if before else None,
+                    }
+                )
+    return regressions
+
+
+def parse_tolerances(
+    default: float, overrides: list[str], stages: list[str]
+) -> dict[str, float]:
+    """Work out the tolerance of each gated stage.
+
+    Args:
+        default: tolerance of stages without an override.
+        overrides: tolerances of particular stages, as "stage=tolerance".
+        stages: the gated stages.
+
+    Returns:
+        the tolerance of each gated stage.
+
+    Raises:
+        ValueError: if an override is not valid.
+    """
+    tolerances = dict.fromkeys(stages, default)
+    for override in overrides:
+        stage, _, tolerance = override.partition("=")
+        if stage not in tolerances:
+            raise ValueError(f"Not a gated stage: {stage}")
+        tolerances[stage] = float(tolerance)
+    return tolerances
+
+
+def main(argv: list[str] | None = None):
+    """Run the benchmark, save the results and compare them with a baseline.
+
+    Args:
+        argv: command line arguments. sys.argv if not given.
+    """
+    parser = argparse.ArgumentParser(
+        description="Check sudoku solving for performance regressions"
+    )
+    parser.add_argument(
+        "--results-dir",
+        type=pathlib.Path,
+        default=pathlib.Path("benchmarks"),
+        help="directory to save results in (default: benchmarks)",
+    )
+    parser.add_argument(
+        "--baseline",
+        type=pathlib.Path,
+        help="results to compare with (default: baseline.json in the "
+        "results directory)",
+    )
+    parser.add_argument(
+        "--current",
+        type=pathlib.Path,
+        help="compare these saved results instead of running the benchmark",
+    )
+    parser.add_argument(
+        "--update-baseline",
+        action="store_true",
+        help="save the results as the baseline instead of comparing",
+    )
+    parser.add_argument(
+        "--stages",
+        nargs="*",
+        default=list(GATED_STAGES),
+        choices=solving_benchmark.STAGES,
+        help="stages to gate on (default: clauses solve)",
+    )
+    parser.add_argument(
+        "--tolerance",
+        type=float,
+        default=0.25,
+        help="allowed slowdown as a fraction of the baseline (default: 0.25)",
+    )
+    parser.add_argument(
+        "--stage-tolerance",
+        nargs="*",
+        default=[],
+        metavar="STAGE=TOLERANCE",
+        help="allowed slowdown of particular stages, e.g. solve=0.5",
+    )
+    parser.add_argument(
+        "--min-difference",
+        type=float,
+        default=0.005,
+        help="smallest slowdown counted, in seconds (default: 0.005)",
+    )
+    parser.add_argument(
+        "--subtypes",
+        nargs="*",
+        default=list(solving_fixtures.SUBTYPES),
+        choices=solving_fixtures.SUBTYPES,
+        metavar="SUBTYPE",
+    )
+    parser.add_argument(
+        "--grades",
+        nargs="*",
+        default=list(solving_fixtures.GRADES),
+        choices=solving_fixtures.GRADES,
+    )
+    parser.add_argument(
+        "--engine", default="glucose", choices=solving_headless.ENGINES
+    )
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--warmup", type=int, default=1)
+    args = parser.parse_args(argv)
+    try:
+        tolerances = parse_tolerances(
+            args.tolerance, args.stage_tolerance, args.stages
+        )
+    except ValueError as error:
+        parser.error(str(error))
+    baseline_path = args.baseline or args.results_dir / "baseline.json"
+
+    if args.current is None:
+        current = solving_benchmark.run(
+            args.subtypes, args.grades, args.repeat, args.warmup, args.engine
+        )
+        print(f"Saved results to {save(current, args.results_dir)}")
+    else:
+        with open(args.current) as file:
+            current = json.load(file)
+    if args.update_baseline:
+        with open(baseline_path, "w") as file:
+            json.dump(current, file, indent=2)
+        print(f"Saved baseline to {baseline_path}")
+        return
+
+    with open(baseline_path) as file:
+        baseline = json.load(file)
+    problems = mismatches(baseline, current)
+    regressions = compare(baseline, current, tolerances, args.min_difference)
+    print(
+        f"Compared {current.get('revision', 'unknown')} with baseline "
+        f"{baseline.get('revision', 'unknown')}"
+    )
+    for problem in problems:
+        print(f"MISMATCH {problem}")
+    for regression in regressions:
+        change = regression["change"]
+        key = (
+            regression["subtype"],
+            regression["grade"],
+            regression["name"],
+            regression["pb_encoding"],
+        )
+        print(
+            f"REGRESSION {describe_key(key)} {regression['stage']}: "
+            f"{regression['baseline']:.6f}s -> {regression['current']:.6f}s"
+            + ("" if change is None else f" ({change:+.0%})")
+        )
+    if problems or regressions:
+        sys.exit(1)
+    print("No regressions")
+
+
+if __name__ == "__main__":
+    main()
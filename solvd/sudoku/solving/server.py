@@ -0,0 +1,401 @@
+"""Local HTTP/JSON sudoku solving service.
+
+Run with `python -m solvd.sudoku.solving.server`. Puzzles are POSTed to
+/solve as JSON:
+
+    {"subtype": "9 x 9", "grid": [[5, 3, 0, ...], ...], "time_limit": 10}
+
+with an optional integer "conflict_limit" too. Standard sudoku and multidoku
+are accepted; variants are not yet, as a request cannot give their
+constraints. Puzzles are solved by a pool of worker processes. Each worker
+keeps a SolverSession per subtype, so the rules are only turned into clauses
+and loaded once per worker rather than once per puzzle. The response is:
+
+    {"status": "solved", "solution": [[5, 3, 4, ...], ...],
+     "timing": {"solve": 0.002, "total": 0.004},
+     "stats": {"clauses": 8865, "conflicts": 3, ...}}
+
+where status is "solved", "unsolvable" or "timed out", solution is only
+present if solved, and stats are the formula's size and the search's effort
+(see stats). Results are cached (see --cache-size and --cache-path),
+and the response's "cached" says whether it came from the cache. Puzzles are
+solved and cached in canonical form (see symmetry), so equivalent puzzles
+share a cache entry. GET /stats reports the cache's hit and miss counts and
+the solves' statistics totalled by subtype.
+"""
+
+import argparse
+import http.server
+import json
+import multiprocessing
+import time
+
+import solvd.sudoku.common.puzzle_spec as common_ps
+import solvd.sudoku.solving.cache as solving_cache
+import solvd.sudoku.solving.headless as solving_headless
+import solvd.sudoku.solving.profiling as solving_profiling
+import solvd.sudoku.solving.solution as solving_sltn
+import solvd.sudoku.solving.stats as solving_stats
+import solvd.sudoku.solving.symmetry as solving_symmetry
+
+STATUSES = {
+    solving_sltn.UNSOLVABLE: "unsolvable",
+    solving_sltn.TIMED_OUT: "timed out",
+}
+
+# sessions of the current worker process, by subtype
+sessions: dict[str, solving_headless.SolverSession] = {}
+
+
+def get_session(subtype: str) -> solving_headless.SolverSession:
+    """Get the worker's session for a subtype, creating it if needed.
+
+    Args:
+        subtype: subtype of sudoku.
+
+    Returns:
+        the session.
+    """
+    if subtype not in sessions:
+        sessions[subtype] = solving_headless.SolverSession(
+            common_ps.PuzzleSpec(subtype)
+        )
+    return sessions[subtype]
+
+
+def init_worker(
+    subtypes: list[str],
+    profile_dir: str | None = None,
+    profile_tools: tuple[str, ...] = solving_profiling.TOOLS,
+):
+    """Warm up a worker process by creating sessions in advance.
+
+    Args:
+        subtypes: subtypes to create sessions for.
+        profile_dir: directory to write profiles of the stages of each solve
+            to. No profiling if not given.
+        profile_tools: tools to profile with.
+    """
+    if profile_dir is not None:
+        solving_profiling.enable(profile_dir, profile_tools)
+    for subtype in subtypes:
+        get_session(subtype)
+
+
+def solve_in_worker(
+    subtype: str,
+    grid: list[list[int]],
+    time_limit: float | None,
+    conflict_limit: int | None,
+) -> tuple[list[list[int]] | int, float, dict[str, int]]:
+    """Solve a puzzle in a worker process.
+
+    Args:
+        subtype: subtype of sudoku.
+        grid: rows of the puzzle, with 0 for empty cells.
+        time_limit: wall-clock limit of the SAT search (seconds).
+        conflict_limit: maximum number of conflicts in the SAT search.
+
+    Returns:
+        rows of the solved puzzle, or UNSOLVABLE or TIMED_OUT, the time taken
+        to solve (seconds), and the solve's statistics.
+    """
+    start = time.perf_counter()
+    session = get_session(subtype)
+    control = solving_sltn.SolveControl(time_limit, conflict_limit)
+    solution = session.solve(grid, control)
+    end = time.perf_counter()
+    return solution, end - start, control.stats
+
+
+def make_response(solution: list[list[int]] | int, solve_time: float) -> dict:
+    """Make the response to a solve request.
+
+    Args:
+        solution: rows of the solved puzzle, or UNSOLVABLE or TIMED_OUT.
+        solve_time: time taken to solve (seconds).
+
+    Returns:
+        the response, without the total time.
+    """
+    response = {"timing": {"solve": solve_time}}
+    if isinstance(solution, int):
+        response["status"] = STATUSES[solution]
+    else:
+        response["status"] = "solved"
+        response["solution"] = solution
+    return response
+
+
+def parse_limit(
+    request: dict, name: str, whole: bool = False
+) -> int | float | None:
+    """Get and check a limit of a solve request.
+
+    Args:
+        request: the parsed request.
+        name: name of the limit.
+        whole: whether the limit must be an integer, e.g. a number of
+            conflicts, rather than any number.
+
+    Returns:
+        the limit, or None if not given.
+
+    Raises:
+        ValueError: if the limit is not a non-negative number, or not an
+            integer when it must be.
+    """
+    limit = request.get(name)
+    if limit is None:
+        return None
+    kind = "integer" if whole else "number"
+    if (
+        isinstance(limit, bool)
+        or not isinstance(limit, int if whole else int | float)
+        or not limit >= 0
+    ):
+        raise ValueError(f"{name} must be a non-negative {kind}")
+    return limit
+
+
+def parse_request(
+    body: bytes,
+) -> tuple[str, list[list[int]], float | None, int | None]:
+    """Parse and check the body of a solve request.
+
+    Args:
+        body: the request body.
+
+    Returns:
+        the subtype, grid, time limit and conflict limit of the request.
+
+    Raises:
+        ValueError: if the request is not valid JSON, or its values are not
+            valid.
+        TypeError: if the request or its subtype has the wrong JSON type.
+    """
+    request = json.loads(body)
+    if not isinstance(request, dict):
+        raise TypeError("Request must be a JSON object")
+    subtype = request.get("subtype")
+    if not isinstance(subtype, str):
+        raise TypeError("subtype must be a string")
+    spec = common_ps.PuzzleSpec(subtype)
+    if spec.type == "variant":
+        # the rules of a variant depend on its constraints
+        raise ValueError(
+            f"{subtype} needs constraints, which requests cannot carry yet"
+        )
+    try:
+        spec.cells()
+    except NotImplementedError as error:
+        raise ValueError(f"{subtype} is not supported yet") from error
+    if not solving_sltn.has_clause_generator(spec):
+        raise ValueError(f"{subtype} is not supported yet")
+    grid = request.get("grid")
+    if (
+        not isinstance(grid, list)
+        or len(grid) != spec.dimension
+        or any(
+            not isinstance(row, list)
+            or len(row) != spec.dimension
+            or any(
+                isinstance(value, bool)
+                or not isinstance(value, int)
+                or not 0 <= value <= spec.max_num
+                for value in row
+            )
+            for row in grid
+        )
+    ):
+        raise ValueError(
+            f"grid must be {spec.dimension} lists of {spec.dimension} "
+            f"integers from 0 to {spec.max_num}"
+        )
+    return (
+        subtype,
+        grid,
+        parse_limit(request, "time_limit"),
+        parse_limit(request, "conflict_limit", whole=True),
+    )
+
+
+class SolveRequestHandler(http.server.BaseHTTPRequestHandler):
+    """Handles requests to the solving service."""
+
+    server: "SolvingServer"
+
+    def do_POST(self):
+        """Solve the puzzle in the request."""
+        if self.path != "/solve":
+            self.send_json(404, {"error": "Not found"})
+            return
+        start = time.perf_counter()
+        length = int(self.headers.get("Content-Length", 0))
+        try:
+            request = parse_request(self.rfile.read(length))
+        except (ValueError, TypeError, json.JSONDecodeError) as error:
+            self.send_json(400, {"error": str(error)})
+            return
+        subtype, grid, time_limit, conflict_limit = request
+        try:
+            spec = common_ps.PuzzleSpec(subtype)
+            canonical, transform = solving_symmetry.canonicalise(spec, grid)
+            key = solving_cache.puzzle_key(subtype, canonical, spec.constraints)
+            solution = self.server.cache.get(key)
+            solve_time = 0
+            stats = {}
+            cached = solution is not None
+            if not cached:
+                solution, solve_time, stats = self.server.pool.apply(
+                    solve_in_worker,
+                    (subtype, canonical, time_limit, conflict_limit),
+                )
+                self.server.cache.put(key, solution)
+                self.server.stats.add(subtype, stats)
+        except solving_sltn.SOLVE_ERRORS as error:
+            # the request was valid, so this is the service's fault
+            self.send_json(500, {"error": f"Solving failed: {error}"})
+            return
+        response = make_response(transform.undo(solution), solve_time)
+        response["cached"] = cached
+        response["stats"] = stats
+        response["timing"]["total"] = time.perf_counter() - start
+        self.send_json(200, response)
+
+    def do_GET(self):
+        """Report the cache's counters and the solves' statistics."""
+        if self.path != "/stats":
+            self.send_json(404, {"error": "Not found"})
+            return
+        self.send_json(
+            200,
+            {
+                "cache": self.server.cache.stats(),
+                "solves": self.server.stats.summary(),
+            },
+        )
+
+    def send_json(self, status: int, content: dict):
+        """Send a JSON response.
+
+        Args:
+            status: HTTP status code.
+            content: the response body.
+        """
+        body = json.dumps(content).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+class SolvingServer(http.server.ThreadingHTTPServer):
+    """HTTP server which hands puzzles to a pool of warm worker processes.
+
+    multiprocessing.Pool is used rather than a ProcessPoolExecutor because it
+    starts every worker, and so runs every initializer, straight away instead
+    of on demand.
+
+    Attributes:
+        pool: the worker processes.
+        cache: solutions of puzzles already solved.
+        stats: totals of the statistics of the solves, by subtype.
+    """
+
+    def __init__(
+        self,
+        address: tuple[str, int],
+        workers: int,
+        preload: list[str],
+        cache: solving_cache.SolutionCache,
+        profile_dir: str | None = None,
+        profile_tools: tuple[str, ...] = solving_profiling.TOOLS,
+    ):
+        """Start the worker processes and the server.
+
+        Args:
+            address: host and port to listen on.
+            workers: number of worker processes.
+            preload: subtypes each worker creates a session for on start.
+            cache: solutions of puzzles already solved.
+            profile_dir: directory the workers write profiles of the stages
+                of each solve to. No profiling if not given.
+            profile_tools: tools to profile with.
+        """
+        self.cache = cache
+        self.stats = solving_stats.SubtypeStats()
+        self.pool = multiprocessing.Pool(
+            workers,
+            initializer=init_worker,
+            initargs=(preload, profile_dir, profile_tools),
+        )
+        http.server.ThreadingHTTPServer.__init__(
+            self, address, SolveRequestHandler
+        )
+
+    def server_close(self):
+        """Stop the server and the worker processes."""
+        http.server.ThreadingHTTPServer.server_close(self)
+        self.pool.terminate()
+        self.pool.join()
+        self.cache.close()
+
+
+def main(argv: list[str] | None = None):
+    """Run the solving service until interrupted.
+
+    Args:
+        argv: command line arguments. sys.argv if not given.
+    """
+    parser = argparse.ArgumentParser(description="Local sudoku solving service")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument(
+        "--workers", type=int, default=None, help="default: number of CPUs"
+    )
+    parser.add_argument(
+        "--preload",
+        nargs="*",
+        default=["9 x 9"],
+        help="subtypes to load into every worker on start",
+    )
+    parser.add_argument(
+        "--cache-size",
+        type=int,
+        default=1024,
+        help="number of solutions cached in memory",
+    )
+    parser.add_argument(
+        "--cache-path", help="SQLite file to also cache solutions in"
+    )
+    parser.add_argument(
+        "--profile",
+        metavar="DIR",
+        help="profile each stage of every solve, writing the profiles to DIR",
+    )
+    parser.add_argument(
+        "--profile-tools",
+        nargs="*",
+        default=list(solving_profiling.TOOLS),
+        choices=solving_profiling.TOOLS,
+    )
+    args = parser.parse_args(argv)
+    cache = solving_cache.SolutionCache(args.cache_size, args.cache_path)
+    with SolvingServer(
+        (args.host, args.port),
+        args.workers,
+        args.preload,
+        cache,
+        args.profile,
+        tuple(args.profile_tools),
+    ) as server:
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+
+
+if __name__ == "__main__":
+    main()
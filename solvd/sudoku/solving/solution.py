@@ -1,16 +1,47 @@
 """Backend of solving standard sudoku."""
 
+import functools
+import itertools
+import math
+import threading
+import time
+
+import numpy as np
+import pysat.card
+import pysat.formula
 import pysat.solvers
 
 import solvd.sudoku.common.box_indices as common_bi
 import solvd.sudoku.common.sudoku_var as common_sv
+import solvd.sudoku.solving.preprocess as solving_preprocess
+import solvd.sudoku.solving.stats as solving_stats
+import solvd.sudoku.solving.timing as solving_timing
 import solvd.sudoku.ui.puzzle_page as ui_pp
 
+# results of get_solution other than a solution
+UNSOLVABLE = 0
+TIMED_OUT = -1
+
+# errors a solve is expected to raise for a puzzle it cannot handle:
+# ValueError from clues or constraints which are not valid, and the pysat.card
+# errors from bounds the encodings cannot handle
+SOLVE_ERRORS = (
+    ValueError,
+    pysat.card.NoSuchEncodingError,
+    pysat.card.UnsupportedBound,
+)
+
+# groups larger than this get a product encoding for each value rather than a
+# clause for every pair of cells (see make_group_clauses)
+PAIRWISE_MAX_GROUP = 16
+
 
 def get_solution(
     known_vars: list[common_sv.SudokuVar],
     all_vars: list[common_sv.SudokuVar],
     puzzle: "ui_pp.PuzzlePage",
+    control: "SolveControl | None" = None,
+    timer: "solving_timing.SolveTimer" = solving_timing.NULL_TIMER,
 ):
     """Works out solution to sudoku.
 
@@ -18,57 +49,208 @@ def get_solution(
         known_vars: list of known true variables.
         all_vars: list of all possible variables.
         puzzle: the sudoku puzzle.
+        control: limits on the solve and a way to cancel it, which also
+            receives the solve's statistics. No limits if not given.
+        timer: records how long each stage takes.
 
     Returns:
-        the solution, or 0 if no solution is found.
+        the solution, UNSOLVABLE if no solution is found, or TIMED_OUT if a
+        limit was reached or the solve was cancelled first.
+    """
+    if control is None:
+        control = SolveControl()
+    with timer.stage("clauses"):
+        puzzle_clauses = make_puzzle_clauses(all_vars, puzzle)
+        known_value_clauses = make_known_value_clauses(
+            known_vars, puzzle.dimension
+        )
+        all_clauses = known_value_clauses + puzzle_clauses
+    with timer.stage("preprocess"):
+        formula = solving_preprocess.simplify(all_clauses)
+    control.stats.update(solving_stats.formula_stats(formula.clauses))
+    if formula.unsatisfiable:
+        return UNSOLVABLE
+    with pysat.solvers.Glucose3() as sat_solver:
+        with timer.stage("load"):
+            sat_solver.append_formula(formula.clauses)
+        return solve_loaded(
+            sat_solver, puzzle, control, timer=timer, simplified=formula
+        )
+
+
+def make_puzzle_clauses(
+    all_vars: list[common_sv.SudokuVar], puzzle: "ui_pp.PuzzlePage"
+) -> list[int]:
+    """Creates the CNF clauses for the rules of a puzzle, without any clues.
+
+    Args:
+        all_vars: list of all possible variables.
+        puzzle: the sudoku puzzle.
+
+    Returns:
+        list of CNF clauses.
     """
     match puzzle.type:
         case "standard":
             puzzle_clauses = make_standard_clauses(all_vars, puzzle)
+        case "variant":
+            # variants read their constraints from the puzzle
+            puzzle_clauses = VARIANT_CLAUSE_GENERATORS[puzzle.subtype](
+                all_vars, puzzle
+            )
         case _:
-            clause_generators = {
-                "Butterfly Sudoku": make_butterfly_clauses,
-                "Cross Sudoku": make_cross_clauses,
-                "Flower Sudoku": make_flower_clauses,
-                "Gattai-3": make_gattai_clauses,
-                "Kazaguruma": make_kazaguruma_clauses,
-                "Samurai Sudoku": make_samurai_clauses,
-                "Sohei Sudoku": make_sohei_clauses,
-                "Tripledoku": make_tripledoku_clauses,
-                "Twodoku": make_twodoku_clauses,
-                "Argyle Sudoku": make_argyle_clauses,
-                "Asterisk Sudoku": make_asterisk_clauses,
-                "Center Dot Sudoku": make_center_dot_clauses,
-                "Chain Sudoku": make_chain_clauses,
-                "Chain Sudoku 6 x 6": make_chain_6x6_clauses,
-                "Consecutive Sudoku": make_consecutive_clauses,
-                "Even-Odd Sudoku": make_even_odd_clauses,
-                "Girandola Sudoku": make_girandola_clauses,
-                "Greater Than Sudoku": make_greater_than_clauses,
-                "Jigsaw Sudoku": make_jigsaw_clauses,
-                "Killer Sudoku": make_killer_clauses,
-                "Little Killer Sudoku": make_little_killer_clauses,
-                "Rossini Sudoku": make_rossini_clauses,
-                "Skyscraper Sudoku": make_skyscraper_clauses,
-                "Sudoku DG": make_dg_clauses,
-                "Sudoku Mine": make_mine_clauses,
-                "Sudoku X": make_x_clauses,
-                "Sudoku XV": make_xv_clauses,
-                "Sujiken": make_sujiken_clauses,
-                "Vudoku": make_vudoku_clauses,
-                "Windoku": make_windoku_clauses,
-            }
-            puzzle_clauses = clause_generators[puzzle.subtype](all_vars)
-    known_value_clauses = make_known_value_clauses(known_vars, puzzle.dimension)
-    all_clauses = known_value_clauses + puzzle_clauses
-    sat_solver = pysat.solvers.Glucose3()
-    for clause in all_clauses:
-        sat_solver.add_clause(clause)
-    if sat_solver.solve():
-        solution = sat_solver.get_model()
-        return model_to_sudokuvar(solution, puzzle)
-    else:
-        return 0
+            puzzle_clauses = MULTIDOKU_CLAUSE_GENERATORS[puzzle.subtype](
+                all_vars
+            )
+    return puzzle_clauses
+
+
+def solve_loaded(
+    sat_solver: pysat.solvers.Solver,
+    puzzle: "ui_pp.PuzzlePage",
+    control: "SolveControl | None" = None,
+    assumptions: list[int] | None = None,
+    timer: "solving_timing.SolveTimer" = solving_timing.NULL_TIMER,
+    simplified: "solving_preprocess.Simplified | None" = None,
+):
+    """Solve a puzzle whose clauses are already loaded into a solver.
+
+    Args:
+        sat_solver: the solver.
+        puzzle: the sudoku puzzle.
+        control: limits on the solve and a way to cancel it. No limits if
+            not given.
+        assumptions: literals assumed true for this solve only, e.g. clues
+            when the solver is reused for many puzzles. None if not given.
+        timer: records how long each stage takes.
+        simplified: the preprocessed formula, if that is what was loaded,
+            to map the model back to the puzzle's variables.
+
+    Returns:
+        the solution, UNSOLVABLE if no solution is found, or TIMED_OUT if a
+        limit was reached or the solve was cancelled first.
+    """
+    if control is None:
+        control = SolveControl()
+    with timer.stage("solve"):
+        is_solvable = control.run(sat_solver, assumptions)
+    if is_solvable is None:
+        return TIMED_OUT
+    if not is_solvable:
+        return UNSOLVABLE
+    with timer.stage("decode"):
+        model = sat_solver.get_model()
+        if simplified is not None:
+            model = simplified.true_variables(model)
+        return model_to_sudokuvar(model, puzzle)
+
+
+class SolveControl:
+    """Limits on a single solve, and a way of cancelling it.
+
+    While the solver runs, a watchdog thread checks the time limit and for
+    cancellation, and keeps interrupting the solver until it stops. Repeating
+    the interrupt matters: one that arrives just before the search starts is
+    otherwise lost. Glucose only checks its limits between restarts, so a
+    solve can overrun them by a few seconds on hard formulas.
+
+    Attributes:
+        time_limit: wall-clock limit of the SAT search (seconds).
+        conflict_limit: maximum number of conflicts in the SAT search.
+        propagation_limit: maximum number of propagations in the SAT search.
+        cancelled: whether cancel() has been called.
+        timed_out: whether the time limit was reached.
+        stats: statistics of the formula and the search (see stats), filled
+            in as the solve goes.
+    """
+
+    poll_interval = 0.01
+
+    def __init__(
+        self,
+        time_limit: float | None = None,
+        conflict_limit: int | None = None,
+        propagation_limit: int | None = None,
+    ):
+        """Create the SolveControl.
+
+        Args:
+            time_limit: wall-clock limit of the SAT search (seconds).
+            conflict_limit: maximum number of conflicts in the SAT search.
+            propagation_limit: maximum number of propagations in the SAT
+                search.
+        """
+        self.time_limit = time_limit
+        self.conflict_limit = conflict_limit
+        self.propagation_limit = propagation_limit
+        self.cancelled = False
+        self.timed_out = False
+        self.stats = {}
+
+    def cancel(self):
+        """Stop the solve as soon as possible. Safe to call from any thread."""
+        self.cancelled = True
+
+    def run(
+        self,
+        sat_solver: pysat.solvers.Solver,
+        assumptions: list[int] | None = None,
+    ) -> bool | None:
+        """Solve with the limits applied.
+
+        The solver is left ready for reuse: budgets from a previous run are
+        replaced (-1 turns them off) and any interrupt is cleared afterwards.
+
+        Args:
+            sat_solver: solver with the formula already loaded.
+            assumptions: literals assumed true for this solve only. None if
+                not given.
+
+        Returns:
+            True if satisfiable, False if unsatisfiable, None if stopped early.
+        """
+        if self.cancelled:
+            return None
+        if assumptions is None:
+            assumptions = []
+        # turning off pysat's propagation budget turns off the conflict one
+        # too, so it is set first
+        sat_solver.prop_budget(
+            -1 if self.propagation_limit is None else self.propagation_limit
+        )
+        sat_solver.conf_budget(
+            -1 if self.conflict_limit is None else self.conflict_limit
+        )
+        finished = threading.Event()
+        watchdog = threading.Thread(
+            target=self.watch, args=(sat_solver, finished), daemon=True
+        )
+        before = sat_solver.accum_stats()
+        watchdog.start()
+        try:
+            return sat_solver.solve_limited(assumptions, expect_interrupt=True)
+        finally:
+            finished.set()
+            watchdog.join()
+            sat_solver.clear_interrupt()
+            self.stats.update(solving_stats.search_stats(sat_solver, before))
+
+    def watch(
+        self, sat_solver: pysat.solvers.Solver, finished: threading.Event
+    ):
+        """Interrupt the solver once it is out of time or cancelled.
+
+        Args:
+            sat_solver: the running solver.
+            finished: set once the solver has stopped.
+        """
+        if self.time_limit is not None:
+            deadline = time.monotonic() + self.time_limit
+        while not finished.wait(self.poll_interval):
+            if self.time_limit is not None and time.monotonic() >= deadline:
+                self.timed_out = True
+            if self.cancelled or self.timed_out:
+                sat_solver.interrupt()
 
 
 class SubPuzzle:
@@ -81,6 +263,8 @@ class SubPuzzle:
         max_row: highest index of a row.
         total_boxes: number of boxes in the puzzle.
         vars: list of variables.
+        vpool: pool of auxiliary variables for the group clauses, or None to
+            always use pairwise clauses.
     """
 
     def __init__(
@@ -90,6 +274,7 @@ class SubPuzzle:
         max_col: int,
         max_row: int,
         total_boxes: int,
+        vpool: pysat.formula.IDPool | None = None,
     ):
         self.dim = dim
         self.max_num = max_num
@@ -97,65 +282,74 @@ class SubPuzzle:
         self.max_row = max_row
         self.total_boxes = total_boxes
         self.vars = []
+        self.vpool = vpool
 
-    def make_row_clauses(self) -> list[int]:
+    def make_row_clauses(self) -> np.ndarray:
         """Make clauses for where every number occurs at most once per row.
 
         Returns:
-            list of CNF clauses.
+            array of binary CNF clauses.
         """
-        clauses = []
-        for var in self.vars:
-            row = attr_to_str(var.row, self.dim)
-            col_1 = attr_to_str(var.col, self.dim)
-            for i in range(var.col + 1, self.max_col + 1):
-                col_2 = attr_to_str(i, self.dim)
-                for value in range(1, self.max_num + 1):
-                    lit_1 = str(value) + row + col_1
-                    lit_2 = str(value) + row + col_2
-                    clause = [-int(lit_1), -int(lit_2)]
-                    clauses.append(clause)
-        return clauses
+        return make_group_clauses(
+            self.cell_ids(),
+            self.var_attrs("row"),
+            self.max_num,
+            self.dim,
+            self.vpool,
+        )
 
-    def make_column_clauses(self) -> list[int]:
+    def make_column_clauses(self) -> np.ndarray:
         """Make clauses for where every number occurs at most once per column.
 
         Returns:
-            list of CNF clauses.
+            array of binary CNF clauses.
         """
-        clauses = []
-        for var in self.vars:
-            col = attr_to_str(var.col, self.dim)
-            row_1 = attr_to_str(var.row, self.dim)
-            for i in range(var.row + 1, self.max_row + 1):
-                row_2 = attr_to_str(i, self.dim)
-                for value in range(1, self.max_num + 1):
-                    lit_1 = str(value) + row_1 + col
-                    lit_2 = str(value) + row_2 + col
-                    clause = [-int(lit_1), -int(lit_2)]
-                    clauses.append(clause)
-        return clauses
+        return make_group_clauses(
+            self.cell_ids(),
+            self.var_attrs("col"),
+            self.max_num,
+            self.dim,
+            self.vpool,
+        )
 
-    def make_box_clauses(self) -> list[int]:
+    def make_box_clauses(self) -> np.ndarray:
         """Make clauses for where every number occurs at most once per box.
 
         Returns:
-            list of CNF clauses.
+            array of binary CNF clauses.
         """
-        clauses = []
-        boxes = [[] for _ in range(self.total_boxes)]
-        for var in self.vars:
-            if len(boxes[var.box]) != 0:
-                for box_var in boxes[var.box]:
-                    for value in range(1, self.max_num + 1):
-                        lit_1 = str(value) + var_coords_to_str(
-                            box_var, self.dim
-                        )
-                        lit_2 = str(value) + var_coords_to_str(var, self.dim)
-                        clause = [-int(lit_1), -int(lit_2)]
-                        clauses.append(clause)
-            boxes[var.box].append(var)
-        return clauses
+        return make_group_clauses(
+            self.cell_ids(),
+            self.var_attrs("box"),
+            self.max_num,
+            self.dim,
+            self.vpool,
+        )
+
+    def var_attrs(self, attr: str) -> np.ndarray:
+        """Collect one attribute of every variable into an array.
+
+        Args:
+            attr: name of the SudokuVar attribute ("row", "col" or "box").
+
+        Returns:
+            the attribute values, in the same order as vars.
+        """
+        return np.fromiter(
+            (getattr(var, attr) for var in self.vars),
+            dtype=np.int32,
+            count=len(self.vars),
+        )
+
+    def cell_ids(self) -> np.ndarray:
+        """Get the value-less literal of every variable.
+
+        Returns:
+            literal of each cell with a value of 0, in the same order as vars.
+        """
+        return cell_literals(
+            self.var_attrs("row"), self.var_attrs("col"), self.dim
+        )
 
     def get_clauses(self) -> list[int]:
         """Make row, column and box clauses.
@@ -163,27 +357,35 @@ class SubPuzzle:
         Returns:
             list of CNF clauses.
         """
-        return (
-            self.make_row_clauses()
-            + self.make_column_clauses()
-            + self.make_box_clauses()
-        )
+        return np.concatenate(
+            (
+                self.make_row_clauses(),
+                self.make_column_clauses(),
+                self.make_box_clauses(),
+            )
+        ).tolist()
 
 
 def make_standard_clauses(
-    all_vars: list[common_sv.SudokuVar], puzzle: "ui_pp.PuzzlePage"
+    all_vars: list[common_sv.SudokuVar],
+    puzzle: "ui_pp.PuzzlePage",
+    vpool: pysat.formula.IDPool | None = None,
 ) -> list[int]:
     """Creates CNF clauses for a standard sudoku puzzle.
 
     Args:
         all_vars: list of all possible variables.
         puzzle: the sudoku puzzle.
+        vpool: pool of auxiliary variables, shared with the rest of the
+            puzzle's clauses. A new one if not given.
 
     Returns:
         list of CNF clauses.
     """
     dim = puzzle.dimension
-    whole_puzzle = SubPuzzle(dim, dim, dim, dim, dim)
+    if vpool is None:
+        vpool = pysat.formula.IDPool(start_from=first_auxiliary(dim))
+    whole_puzzle = SubPuzzle(dim, dim, dim, dim, dim, vpool)
     whole_puzzle.vars = all_vars
     return make_cell_clauses(all_vars, dim, dim) + whole_puzzle.get_clauses()
 
@@ -445,7 +647,106 @@ def make_chain_clauses(): ...
 def make_chain_6x6_clauses(): ...
 
 
-def make_consecutive_clauses(): ...
+def make_consecutive_clauses(
+    all_vars: list[common_sv.SudokuVar], puzzle: "ui_pp.PuzzlePage"
+) -> list[int]:
+    """Create CNF clauses for a consecutive sudoku puzzle.
+
+    Every pair of neighbouring cells is either marked with a bar, and then
+    its values differ by 1, or not, and then they do not. The pairs are
+    taken from the index of neighbour_pairs, and the clauses of the pairs
+    without bars made for all of them at once.
+
+    Args:
+        all_vars: list of all possible variables.
+        puzzle: the sudoku puzzle, with its bars as constraints.
+
+    Returns:
+        list of CNF clauses.
+    """
+    dim = puzzle.dimension
+    clauses = make_standard_clauses(all_vars, puzzle)
+    pairs = neighbour_pairs(dim)
+    base = literal_base(dim)
+    bars = np.array(
+        [
+            sorted(row * base + col for row, col in bar.cells)
+            for bar in puzzle.constraints
+        ],
+        dtype=np.int32,
+    ).reshape(-1, 2)
+    is_bar = np.isin(pair_keys(pairs, dim), pair_keys(bars, dim))
+    offsets = value_offsets(dim, dim)
+    clauses += make_apart_clauses(pairs[~is_bar], offsets).tolist()
+    # each value of one cell of a bar needs a value next to it in the other
+    for first, second in pairs[is_bar].tolist():
+        for cell, other in ((first, second), (second, first)):
+            clauses += [
+                [-encode_literal(v, *divmod(cell, base), dim)]
+                + [
+                    encode_literal(w, *divmod(other, base), dim)
+                    for w in (v - 1, v + 1)
+                    if 1 <= w <= dim
+                ]
+                for v in range(1, dim + 1)
+            ]
+    return clauses
+
+
+@functools.cache
+def neighbour_pairs(dimension: int) -> np.ndarray:
+    """Make the index of the pairs of cells which share a side.
+
+    Args:
+        dimension: size of sudoku.
+
+    Returns:
+        (pairs, 2) array of the value-less literals of each pair's cells,
+        the top or left cell first. Not to be changed, as it is shared.
+    """
+    rows, cols = np.divmod(np.arange(dimension * dimension), dimension)
+    cells = cell_literals(rows, cols, dimension).reshape(dimension, dimension)
+    across = np.stack((cells[:, :-1], cells[:, 1:]), axis=-1)
+    down = np.stack((cells[:-1, :], cells[1:, :]), axis=-1)
+    return np.concatenate((across.reshape(-1, 2), down.reshape(-1, 2)))
+
+
+def pair_keys(pairs: np.ndarray, dimension: int) -> np.ndarray:
+    """Combine each pair of value-less literals into one number.
+
+    Args:
+        pairs: (pairs, 2) array of value-less literals, the lower first.
+        dimension: size of sudoku.
+
+    Returns:
+        a number for each pair, the same for the same two cells.
+    """
+    return (
+        pairs[:, 0].astype(np.int64) * first_auxiliary(dimension) + pairs[:, 1]
+    )
+
+
+def make_apart_clauses(pairs: np.ndarray, offsets: np.ndarray) -> np.ndarray:
+    """Make clauses for where the values of paired cells do not differ by 1.
+
+    Args:
+        pairs: (pairs, 2) array of the value-less literals of each pair's
+            cells.
+        offsets: the amount each value adds to a cell's literal, from
+            value_offsets.
+
+    Returns:
+        array of binary CNF clauses, one clause per array row.
+    """
+    first = pairs[:, :1] + offsets
+    second = pairs[:, 1:] + offsets
+    # v in the first with v + 1 in the second, and the other way round
+    return -np.concatenate(
+        (
+            np.stack((first[:, :-1], second[:, 1:]), axis=-1).reshape(-1, 2),
+            np.stack((first[:, 1:], second[:, :-1]), axis=-1).reshape(-1, 2),
+        )
+    )
 
 
 def make_even_odd_clauses(): ...
@@ -454,22 +755,434 @@ def make_even_odd_clauses(): ...
 def make_girandola_clauses(): ...
 
 
-def make_greater_than_clauses(): ...
+def make_greater_than_clauses(
+    all_vars: list[common_sv.SudokuVar], puzzle: "ui_pp.PuzzlePage"
+) -> list[int]:
+    """Create CNF clauses for a greater than sudoku puzzle.
+
+    Args:
+        all_vars: list of all possible variables.
+        puzzle: the sudoku puzzle, with its inequalities as constraints.
+
+    Returns:
+        list of CNF clauses.
+    """
+    vpool = pysat.formula.IDPool(start_from=first_auxiliary(puzzle.dimension))
+    clauses = make_standard_clauses(all_vars, puzzle, vpool)
+    order = OrderLiterals(puzzle.dimension, vpool)
+    for inequality in puzzle.constraints:
+        clauses += order.greater_than_clauses(
+            inequality.greater, inequality.lesser
+        )
+    return clauses + order.clauses
+
+
+class OrderLiterals:
+    """Order encoding of the values of cells, for comparing cells.
+
+    Alongside its value literals, a cell gets an auxiliary literal for each
+    "value >= k", k from 2 to the highest number, made the first time the
+    cell is compared. A comparison between two cells is then a clause for
+    each k rather than one for every pair of values it rules out. The
+    channelling clauses which tie the order literals of a cell to its value
+    literals are collected in clauses, to be added once whatever the number
+    of comparisons.
+
+    Attributes:
+        dimension: size of sudoku, which is also the highest number.
+        vpool: pool to take the order literals from.
+        clauses: the channelling clauses of the cells with order literals.
+        firsts: the literal of "value >= 2" of each cell with order
+            literals, by row and column. "value >= k" follows k - 2 after.
+    """
+
+    def __init__(self, dimension: int, vpool: pysat.formula.IDPool):
+        """Create the OrderLiterals.
+
+        Args:
+            dimension: size of sudoku, which is also the highest number.
+            vpool: pool to take the order literals from.
+        """
+        self.dimension = dimension
+        self.vpool = vpool
+        self.clauses = []
+        self.firsts = {}
+
+    def at_least(self, cell: tuple[int, int], k: int) -> int:
+        """Get the literal of a cell's value being at least k.
+
+        Args:
+            cell: the row and column of the cell.
+            k: the bound, from 2 to the highest number.
+
+        Returns:
+            the literal.
+        """
+        if cell not in self.firsts:
+            self.firsts[cell] = self.vpool.top + 1
+            self.vpool.top += self.dimension - 1
+            self.clauses += self.channelling_clauses(cell)
+        return self.firsts[cell] + k - 2
+
+    def channelling_clauses(self, cell: tuple[int, int]) -> list[int]:
+        """Make clauses for where a cell's order literals match its value.
+
+        Args:
+            cell: the row and column of the cell, with its order literals
+                made.
+
+        Returns:
+            list of CNF clauses.
+        """
+        n = self.dimension
+        first = self.firsts[cell]
+
+        def at_least(k: int) -> int:
+            return first + k - 2
+
+        def value(v: int) -> int:
+            return encode_literal(v, *cell, n)
+
+        # value >= k + 1 implies value >= k
+        clauses = [[-at_least(k + 1), at_least(k)] for k in range(2, n)]
+        # a value sets the bounds just below and just above it
+        clauses += [[-value(v), at_least(v)] for v in range(2, n + 1)]
+        clauses += [[-value(v), -at_least(v + 1)] for v in range(1, n)]
+        # and the bounds give the value back
+        clauses.append([at_least(2), value(1)])
+        clauses += [
+            [-at_least(v), at_least(v + 1), value(v)] for v in range(2, n)
+        ]
+        clauses.append([-at_least(n), value(n)])
+        return clauses
+
+    def greater_than_clauses(
+        self, greater: tuple[int, int], lesser: tuple[int, int]
+    ) -> list[int]:
+        """Make clauses for where one cell's value is above another's.
+
+        The greater cell is at least 2 and the lesser at most the highest
+        number less 1, and the lesser being at least k pushes the greater to
+        at least k + 1.
+
+        Args:
+            greater: the row and column of the cell with the higher value.
+            lesser: the row and column of the cell with the lower value.
+
+        Returns:
+            list of CNF clauses.
+        """
+        n = self.dimension
+        clauses = [
+            [self.at_least(greater, 2)],
+            [-self.at_least(lesser, n)],
+        ]
+        clauses += [
+            [-self.at_least(lesser, k), self.at_least(greater, k + 1)]
+            for k in range(2, n)
+        ]
+        return clauses
 
 
 def make_jigsaw_clauses(): ...
 
 
-def make_killer_clauses(): ...
+def make_killer_clauses(
+    all_vars: list[common_sv.SudokuVar], puzzle: "ui_pp.PuzzlePage"
+) -> list[int]:
+    """Create CNF clauses for a killer sudoku puzzle.
+
+    Args:
+        all_vars: list of all possible variables.
+        puzzle: the sudoku puzzle, with its cages as constraints.
+
+    Returns:
+        list of CNF clauses.
+    """
+    vpool = pysat.formula.IDPool(start_from=first_auxiliary(puzzle.dimension))
+    clauses = make_standard_clauses(all_vars, puzzle, vpool)
+    for cage in puzzle.constraints:
+        clauses += make_cage_clauses(cage, puzzle.dimension, vpool)
+    return clauses
+
+
+def make_cage_clauses(
+    cage: common_sv.Cage, dimension: int, vpool: pysat.formula.IDPool
+) -> list[int]:
+    """Make clauses for where a cage's values add up to its total.
 
+    The sets of values which fit the cage are looked up in the table of
+    cage combinations, rather than encoding the sum itself:
 
-def make_little_killer_clauses(): ...
+    - values in none of the sets are ruled out of the cage's cells
+    - a value may be in at most one of the cage's cells
+    - with one set, each of its values is in one of the cells
+    - with several, an auxiliary variable picks exactly one set, whose values
+      are then each in one of the cells, and the values of the other sets
+      are ruled out
+
+    Args:
+        cage: the cage.
+        dimension: size of sudoku, which is also the highest number.
+        vpool: pool to take the auxiliary variables from.
+
+    Returns:
+        list of CNF clauses.
+    """
+    combinations = cage_combinations(dimension).get(
+        (len(cage.cells), cage.total), []
+    )
+    allowed = set().union(*combinations)
+
+    def literal(value: int, cell: tuple[int, int]) -> int:
+        return encode_literal(value, *cell, dimension)
+
+    clauses = [
+        [-literal(value, cell)]
+        for value in range(1, dimension + 1)
+        if value not in allowed
+        for cell in cage.cells
+    ]
+    for cell_1, cell_2 in itertools.combinations(cage.cells, 2):
+        # pairs in the same row, column or box already have these clauses
+        if (
+            cell_1[0] == cell_2[0]
+            or cell_1[1] == cell_2[1]
+            or common_bi.calculate_9x9(*cell_1)
+            == common_bi.calculate_9x9(*cell_2)
+        ):
+            continue
+        clauses += [
+            [-literal(value, cell_1), -literal(value, cell_2)]
+            for value in allowed
+        ]
+    if len(combinations) == 1:
+        clauses += [
+            [literal(value, cell) for cell in cage.cells]
+            for value in combinations[0]
+        ]
+    elif combinations:
+        selectors = [vpool.id() for _ in combinations]
+        clauses.append(selectors)
+        clauses += [[-a, -b] for a, b in itertools.combinations(selectors, 2)]
+        for selector, combination in zip(selectors, combinations):
+            clauses += [
+                [-selector] + [literal(value, cell) for cell in cage.cells]
+                for value in combination
+            ]
+            clauses += [
+                [-selector, -literal(value, cell)]
+                for value in allowed - combination
+                for cell in cage.cells
+            ]
+    return clauses
+
+
+@functools.cache
+def cage_combinations(
+    max_num: int,
+) -> dict[tuple[int, int], list[frozenset[int]]]:
+    """Make the table of which values can fill a cage of each size and total.
+
+    Args:
+        max_num: highest number a cell can take.
+
+    Returns:
+        the sets of distinct values from 1 to max_num, by their size and sum.
+    """
+    table = {}
+    for size in range(1, max_num + 1):
+        for values in itertools.combinations(range(1, max_num + 1), size):
+            table.setdefault((size, sum(values)), []).append(frozenset(values))
+    return table
+
+
+def make_little_killer_clauses(
+    all_vars: list[common_sv.SudokuVar], puzzle: "ui_pp.PuzzlePage"
+) -> list[int]:
+    """Create CNF clauses for a little killer sudoku puzzle.
+
+    Args:
+        all_vars: list of all possible variables.
+        puzzle: the sudoku puzzle, with its diagonals as constraints and the
+            encoding of their sums as pb_encoding.
+
+    Returns:
+        list of CNF clauses.
+    """
+    vpool = pysat.formula.IDPool(start_from=first_auxiliary(puzzle.dimension))
+    clauses = make_standard_clauses(all_vars, puzzle, vpool)
+    for diagonal in puzzle.constraints:
+        clauses += make_diagonal_clauses(
+            diagonal, puzzle.dimension, vpool, puzzle.pb_encoding
+        )
+    return clauses
+
+
+def make_diagonal_clauses(
+    diagonal: common_sv.Diagonal,
+    dimension: int,
+    vpool: pysat.formula.IDPool,
+    encoding: str,
+) -> list[int]:
+    """Make clauses for where a diagonal's values add up to its total.
+
+    The sum is a pseudo-boolean constraint over the literals of every value
+    of every cell, weighted by the value. As each cell has exactly one
+    value, every value can be counted as one less and the total lowered by
+    the number of cells, which drops the literals of 1 and shrinks the
+    weights. Values too big or too small to reach the total with the rest
+    of the diagonal are ruled out first.
+
+    Args:
+        diagonal: the diagonal.
+        dimension: size of sudoku, which is also the highest number.
+        vpool: pool to take the auxiliary variables from.
+        encoding: encoding of the sum, one of puzzle_spec.PB_ENCODINGS.
+
+    Returns:
+        list of CNF clauses.
+    """
+    # only little killer needs pysat.pb, and its encodings need pypblib
+    import pysat.pb
+
+    cells = diagonal.cells(dimension)
+    others = len(cells) - 1
+    lowest = max(1, diagonal.total - others * dimension)
+    highest = min(dimension, diagonal.total - others)
+    clauses = [
+        [-encode_literal(value, *cell, dimension)]
+        for value in range(1, dimension + 1)
+        if not lowest <= value <= highest
+        for cell in cells
+    ]
+    if lowest > highest:
+        return clauses
+    literals = []
+    weights = []
+    for cell in cells:
+        for value in range(max(lowest, 2), highest + 1):
+            literals.append(encode_literal(value, *cell, dimension))
+            weights.append(value - 1)
+    if not literals:
+        return clauses
+    total = pysat.pb.PBEnc.equals(
+        literals,
+        weights,
+        diagonal.total - len(cells),
+        vpool=vpool,
+        encoding=getattr(pysat.pb.EncType, encoding),
+    )
+    return clauses + total.clauses
 
 
 def make_rossini_clauses(): ...
 
 
-def make_skyscraper_clauses(): ...
+def make_skyscraper_clauses(
+    all_vars: list[common_sv.SudokuVar], puzzle: "ui_pp.PuzzlePage"
+) -> list[int]:
+    """Create CNF clauses for a skyscraper sudoku puzzle.
+
+    Args:
+        all_vars: list of all possible variables.
+        puzzle: the sudoku puzzle, with its clues as constraints.
+
+    Returns:
+        list of CNF clauses.
+    """
+    vpool = pysat.formula.IDPool(start_from=first_auxiliary(puzzle.dimension))
+    clauses = make_standard_clauses(all_vars, puzzle, vpool)
+    order = OrderLiterals(puzzle.dimension, vpool)
+    for clue in puzzle.constraints:
+        clauses += make_visibility_clauses(clue, order)
+    return clauses + order.clauses
+
+
+def make_visibility_clauses(
+    clue: common_sv.SkyscraperClue, order: OrderLiterals
+) -> list[int]:
+    """Make clauses for where a clue sees its number of skyscrapers.
+
+    Rather than listing the orders of values which give the number, the
+    line is followed from the clue with two kinds of auxiliary variables,
+    both tied to the cells' order literals:
+
+    - prefix maximums: "the tallest of the first i cells is at least h",
+      true if it is for the first i - 1 cells or the i-th cell is at least
+      h (for the first cell, its own order literals)
+    - visibility: "the i-th cell is visible", true exactly when the cell is
+      taller than the tallest of the cells before it, i.e. at least h + 1
+      whenever that is at least h
+
+    and the visible cells are counted with a sequential counter. Each is a
+    few clauses per cell and height, so the clauses grow with the square of
+    the line's length, whereas a line of 9 has 362880 orders.
+
+    Values which would hide too many skyscrapers are also ruled out
+    beforehand: with k visible, the i-th cell (from 0) is at most the
+    highest number less k - 1 - i, as the k - 1 - i visible behind it must
+    be taller.
+
+    Args:
+        clue: the clue.
+        order: the order literals of the puzzle's cells, which also gives
+            the pool to take the other auxiliary variables from.
+
+    Returns:
+        list of CNF clauses.
+    """
+    n = order.dimension
+    cells = clue.cells(n)
+    if not 1 <= clue.visible <= len(cells):
+        # no values can satisfy the clue, so leave the first cell none
+        return [
+            [-encode_literal(value, *cells[0], n)] for value in range(1, n + 1)
+        ]
+    clauses = [
+        [-encode_literal(value, *cell, n)]
+        for i, cell in enumerate(cells)
+        for value in range(n - clue.visible + i + 2, n + 1)
+    ]
+    vpool = order.vpool
+    # the first cell is always visible
+    visible = [vpool.id()]
+    clauses.append([visible[0]])
+    # tallest[h - 2]: the tallest of the cells so far is at least h
+    tallest = [order.at_least(cells[0], h) for h in range(2, n + 1)]
+    for i, cell in enumerate(cells[1:], 1):
+        is_visible = vpool.id()
+        visible.append(is_visible)
+        # visible: taller than every bound the cells before reach
+        clauses.append([-is_visible, order.at_least(cell, 2)])
+        clauses += [
+            [-is_visible, -tallest[h - 2], order.at_least(cell, h + 1)]
+            for h in range(2, n)
+        ]
+        clauses.append([-is_visible, -tallest[n - 2]])
+        # hidden: no taller than the tallest before
+        clauses += [
+            [is_visible, -order.at_least(cell, h), tallest[h - 2]]
+            for h in range(2, n + 1)
+        ]
+        if i == len(cells) - 1:
+            break
+        new_tallest = []
+        for h in range(2, n + 1):
+            at_least = order.at_least(cell, h)
+            taller = vpool.id()
+            new_tallest.append(taller)
+            clauses.append([-tallest[h - 2], taller])
+            clauses.append([-at_least, taller])
+            clauses.append([-taller, tallest[h - 2], at_least])
+        tallest = new_tallest
+    counter = pysat.card.CardEnc.equals(
+        visible,
+        clue.visible,
+        vpool=vpool,
+        encoding=pysat.card.EncType.seqcounter,
+    )
+    return clauses + counter.clauses
 
 
 def make_dg_clauses(): ...
@@ -481,7 +1194,78 @@ def make_mine_clauses(): ...
 def make_x_clauses(): ...
 
 
-def make_xv_clauses(): ...
+def make_xv_clauses(
+    all_vars: list[common_sv.SudokuVar], puzzle: "ui_pp.PuzzlePage"
+) -> list[int]:
+    """Create CNF clauses for a sudoku XV puzzle.
+
+    The values of neighbouring cells marked with an X or a V add up to its
+    total, and those of unmarked neighbouring cells add up to no mark's
+    total. Both are made straight from the table of sum_pairs: a value
+    pairs only with its partner across a mark, and no pair adding up to a
+    mark's total is allowed across an unmarked edge.
+
+    Args:
+        all_vars: list of all possible variables.
+        puzzle: the sudoku puzzle, with its marks as constraints.
+
+    Returns:
+        list of CNF clauses.
+    """
+    dim = puzzle.dimension
+    clauses = make_standard_clauses(all_vars, puzzle)
+    pairs = neighbour_pairs(dim)
+    base = literal_base(dim)
+    marks = np.array(
+        [
+            sorted(row * base + col for row, col in mark.cells)
+            for mark in puzzle.constraints
+        ],
+        dtype=np.int32,
+    ).reshape(-1, 2)
+    unmarked = pairs[~np.isin(pair_keys(pairs, dim), pair_keys(marks, dim))]
+    table = sum_pairs(dim)
+    forbidden = np.array(
+        [pair for total in common_sv.XVMark.LETTERS for pair in table[total]],
+        dtype=np.int32,
+    )
+    offsets = value_offsets(dim, dim)
+    clauses += (
+        -np.stack(
+            (
+                unmarked[:, :1] + offsets[forbidden[:, 0] - 1],
+                unmarked[:, 1:] + offsets[forbidden[:, 1] - 1],
+            ),
+            axis=-1,
+        ).reshape(-1, 2)
+    ).tolist()
+    for mark in puzzle.constraints:
+        partners = dict(table.get(mark.total, []))
+        first, second = mark.cells
+        for cell, other in ((first, second), (second, first)):
+            # a value without a partner is ruled out
+            for value in range(1, dim + 1):
+                clause = [-encode_literal(value, *cell, dim)]
+                if value in partners:
+                    clause.append(encode_literal(partners[value], *other, dim))
+                clauses.append(clause)
+    return clauses
+
+
+@functools.cache
+def sum_pairs(max_num: int) -> dict[int, list[tuple[int, int]]]:
+    """Make the table of which pairs of distinct values add up to each total.
+
+    Args:
+        max_num: highest number a cell can take.
+
+    Returns:
+        the ordered pairs of distinct values from 1 to max_num, by their sum.
+    """
+    table = {}
+    for pair in itertools.permutations(range(1, max_num + 1), 2):
+        table.setdefault(sum(pair), []).append(pair)
+    return table
 
 
 def make_sujiken_clauses(): ...
@@ -493,6 +1277,86 @@ def make_vudoku_clauses(): ...
 def make_windoku_clauses(): ...
 
 
+# clause generators of the variants and multidoku, by subtype
+VARIANT_CLAUSE_GENERATORS = {
+    "Argyle Sudoku": make_argyle_clauses,
+    "Asterisk Sudoku": make_asterisk_clauses,
+    "Center Dot Sudoku": make_center_dot_clauses,
+    "Chain Sudoku": make_chain_clauses,
+    "Chain Sudoku 6 x 6": make_chain_6x6_clauses,
+    "Consecutive Sudoku": make_consecutive_clauses,
+    "Even-Odd Sudoku": make_even_odd_clauses,
+    "Girandola Sudoku": make_girandola_clauses,
+    "Greater Than Sudoku": make_greater_than_clauses,
+    "Jigsaw Sudoku": make_jigsaw_clauses,
+    "Killer Sudoku": make_killer_clauses,
+    "Little Killer Sudoku": make_little_killer_clauses,
+    "Rossini Sudoku": make_rossini_clauses,
+    "Skyscraper Sudoku": make_skyscraper_clauses,
+    "Sudoku DG": make_dg_clauses,
+    "Sudoku Mine": make_mine_clauses,
+    "Sudoku X": make_x_clauses,
+    "Sudoku XV": make_xv_clauses,
+    "Sujiken": make_sujiken_clauses,
+    "Vudoku": make_vudoku_clauses,
+    "Windoku": make_windoku_clauses,
+}
+
+MULTIDOKU_CLAUSE_GENERATORS = {
+    "Butterfly Sudoku": make_butterfly_clauses,
+    "Cross Sudoku": make_cross_clauses,
+    "Flower Sudoku": make_flower_clauses,
+    "Gattai-3": make_gattai_clauses,
+    "Kazaguruma": make_kazaguruma_clauses,
+    "Samurai Sudoku": make_samurai_clauses,
+    "Sohei Sudoku": make_sohei_clauses,
+    "Tripledoku": make_tripledoku_clauses,
+    "Twodoku": make_twodoku_clauses,
+}
+
+
+# the subtypes whose generators are written; the others are still stubs
+SUPPORTED_VARIANTS = frozenset(
+    {
+        "Consecutive Sudoku",
+        "Greater Than Sudoku",
+        "Killer Sudoku",
+        "Little Killer Sudoku",
+        "Skyscraper Sudoku",
+        "Sudoku XV",
+    }
+)
+SUPPORTED_MULTIDOKU = frozenset(
+    {
+        "Butterfly Sudoku",
+        "Cross Sudoku",
+        "Flower Sudoku",
+        "Gattai-3",
+        "Kazaguruma",
+        "Samurai Sudoku",
+        "Sohei Sudoku",
+    }
+)
+
+
+def has_clause_generator(puzzle: "ui_pp.PuzzlePage") -> bool:
+    """Check whether the rules of a subtype can be turned into clauses yet.
+
+    Args:
+        puzzle: the sudoku puzzle.
+
+    Returns:
+        whether make_puzzle_clauses supports the subtype.
+    """
+    match puzzle.type:
+        case "standard":
+            return True
+        case "variant":
+            return puzzle.subtype in SUPPORTED_VARIANTS
+        case _:
+            return puzzle.subtype in SUPPORTED_MULTIDOKU
+
+
 def make_known_value_clauses(
     vars: list[common_sv.SudokuVar], dimension: int
 ) -> list[int]:
@@ -526,15 +1390,216 @@ def make_cell_clauses(
     Returns:
         list of CNF clauses.
     """
-    clauses = []
-    for var in vars:
-        temp_clause = []
-        var_coords = var_coords_to_str(var, dimension)
-        for value in range(1, max_num + 1):
-            new_var = str(value) + var_coords
-            temp_clause.append(int(new_var))
-        clauses.append(temp_clause)
-    return clauses
+    rows = np.fromiter((var.row for var in vars), np.int32, len(vars))
+    cols = np.fromiter((var.col for var in vars), np.int32, len(vars))
+    cells = cell_literals(rows, cols, dimension)
+    values = value_offsets(max_num, dimension)
+    return (cells[:, None] + values[None, :]).tolist()
+
+
+def make_group_clauses(
+    cells: np.ndarray,
+    groups: np.ndarray,
+    max_num: int,
+    dimension: int,
+    vpool: pysat.formula.IDPool | None = None,
+) -> np.ndarray:
+    """Make clauses for where every number occurs at most once per group.
+
+    Every pair of cells sharing a group (row, column or box) is found with
+    index arithmetic rather than nested loops: the cells are sorted by group,
+    groups of the same size are stacked into a 2D array, and the upper
+    triangle of each group's pair matrix is taken in one go.
+
+    The pairs grow with the square of the group's size, so groups larger
+    than PAIRWISE_MAX_GROUP get a product encoding instead when vpool is
+    given (see make_product_clauses).
+
+    Args:
+        cells: value-less literal of each cell.
+        groups: group index of each cell.
+        max_num: highest number a cell can take.
+        dimension: size of sudoku.
+        vpool: pool to take the product encodings' auxiliary variables
+            from.
+
+    Returns:
+        contiguous int32 array of binary CNF clauses, one clause per array row.
+    """
+    order = np.lexsort((cells, groups))
+    cells = cells[order]
+    _, starts, sizes = np.unique(
+        groups[order], return_index=True, return_counts=True
+    )
+    values = value_offsets(max_num, dimension)
+    blocks = [np.empty((0, 2), dtype=np.int32)]
+    for size in np.unique(sizes):
+        if size < 2:
+            continue
+        members = cells[starts[sizes == size][:, None] + np.arange(size)]
+        if vpool is not None and size > PAIRWISE_MAX_GROUP:
+            literals = members[:, :, None] + values
+            blocks.append(
+                make_product_clauses(
+                    literals.transpose(0, 2, 1).reshape(-1, size), vpool
+                )
+            )
+            continue
+        first, second = np.triu_indices(size, 1)
+        lit_1 = members[:, first].reshape(-1, 1) + values
+        lit_2 = members[:, second].reshape(-1, 1) + values
+        block = np.empty((lit_1.size, 2), dtype=np.int32)
+        block[:, 0] = -lit_1.ravel()
+        block[:, 1] = -lit_2.ravel()
+        blocks.append(block)
+    return np.concatenate(blocks)
+
+
+def make_product_clauses(
+    literals: np.ndarray, vpool: pysat.formula.IDPool
+) -> np.ndarray:
+    """Make product encoding clauses for where at most one literal is true.
+
+    The n literals are laid out in a grid of about sqrt(n) by sqrt(n), with
+    an auxiliary variable for each grid row and column. A true literal makes
+    its row and column variables true, and at most one row and one column
+    variable may be true (pairwise), so two true literals would need two
+    rows or two columns. About 2n clauses and 2 sqrt(n) auxiliary variables
+    replace the n(n - 1) / 2 pairwise clauses, and unit propagation draws the
+    same conclusions from both, in a fixed number of steps.
+
+    Args:
+        literals: one set of literals per array row, all of the same length.
+        vpool: pool to take the auxiliary variables from.
+
+    Returns:
+        contiguous int32 array of binary CNF clauses, one clause per array row.
+    """
+    sets, size = literals.shape
+    cols = math.isqrt(size - 1) + 1
+    rows = -(-size // cols)
+    start = vpool.top + 1
+    vpool.top += sets * (rows + cols)
+    auxiliary = np.arange(start, vpool.top + 1, dtype=np.int32).reshape(
+        sets, rows + cols
+    )
+    row_vars = auxiliary[:, :rows]
+    col_vars = auxiliary[:, rows:]
+    literals = literals.astype(np.int32)
+    positions = np.arange(size)
+    pairs = [
+        (-literals, row_vars[:, positions // cols]),
+        (-literals, col_vars[:, positions % cols]),
+    ]
+    for line_vars in (row_vars, col_vars):
+        first, second = np.triu_indices(line_vars.shape[1], 1)
+        pairs.append((-line_vars[:, first], -line_vars[:, second]))
+    return np.concatenate(
+        [
+            np.stack((lit_1.ravel(), lit_2.ravel()), axis=1)
+            for lit_1, lit_2 in pairs
+        ]
+    )
+
+
+def literal_base(dimension: int) -> int:
+    """Calculate the base the row and column are written in within a literal.
+
+    A literal is the value, row and column written one after the other in
+    decimal, e.g. 5 0 3 for a 5 in row 0, column 3 of a 9 x 9, or 12 04 11
+    for a 12 in row 4, column 11 of a 16 x 16. The row and column each take
+    as many digits as the dimension, so the base is the power of 10 above
+    every value and index.
+
+    Args:
+        dimension: size of sudoku.
+
+    Returns:
+        10 for sudoku up to 9 x 9, 100 for sudoku up to 99 x 99, and so on.
+    """
+    return 10 ** len(str(dimension))
+
+
+def first_auxiliary(dimension: int) -> int:
+    """Find the first variable free for auxiliary variables of an encoding.
+
+    Values are smaller than the literal base, so every cell literal is below
+    the base cubed.
+
+    Args:
+        dimension: size of sudoku.
+
+    Returns:
+        the first variable above every cell literal.
+    """
+    return literal_base(dimension) ** 3
+
+
+def cell_literals(
+    rows: np.ndarray, cols: np.ndarray, dimension: int
+) -> np.ndarray:
+    """Calculate the literal of each cell with its value digits left at 0.
+
+    This is the arithmetic equivalent of var_coords_to_str, so adding
+    value_offsets to the result gives the same literals as string
+    concatenation.
+
+    Args:
+        rows: row index of each cell.
+        cols: column index of each cell.
+        dimension: size of sudoku.
+
+    Returns:
+        literal of each cell.
+    """
+    base = literal_base(dimension)
+    return (rows * base + cols).astype(np.int32)
+
+
+def value_offsets(max_num: int, dimension: int) -> np.ndarray:
+    """Calculate the amount each value adds to a cell's literal.
+
+    Args:
+        max_num: highest number a cell can take.
+        dimension: size of sudoku.
+
+    Returns:
+        offset for the values 1 to max_num.
+    """
+    base = literal_base(dimension)
+    return np.arange(1, max_num + 1, dtype=np.int32) * base * base
+
+
+def encode_literal(value: int, row: int, col: int, dimension: int) -> int:
+    """Calculate the literal of a cell having a value.
+
+    Args:
+        value: the value.
+        row: the cell's row.
+        col: the cell's column.
+        dimension: size of sudoku.
+
+    Returns:
+        the (positive) literal.
+    """
+    base = literal_base(dimension)
+    return (value * base + row) * base + col
+
+
+def decode_literal(literal: int, dimension: int) -> tuple[int, int, int]:
+    """Split a literal back into the value, row and column it represents.
+
+    Args:
+        literal: the literal, positive or negative.
+        dimension: size of sudoku.
+
+    Returns:
+        the value, row and column.
+    """
+    base = literal_base(dimension)
+    value, coords = divmod(abs(literal), base * base)
+    row, col = divmod(coords, base)
+    return value, row, col
 
 
 def var_coords_to_str(var: common_sv.SudokuVar, dimension: int) -> str:
@@ -563,11 +1628,7 @@ def attr_to_str(attr: int, dimension: int) -> str:
     Returns:
         attribute as a string.
     """
-    new_attr = str(attr)
-    if dimension >= 10:
-        if attr <= 9:
-            new_attr = "0" + new_attr
-    return new_attr
+    return str(attr).zfill(len(str(dimension)))
 
 
 def model_to_sudokuvar(
@@ -575,6 +1636,9 @@ def model_to_sudokuvar(
 ) -> list[common_sv.SudokuVar]:
     """Converts solution model to a list of SudokuVars.
 
+    Negative literals and the auxiliary variables of the encoding are
+    skipped.
+
     Args:
         solution (list[int]): solution returned by the SAT solver.
         puzzle: the sudoku puzzle.
@@ -582,28 +1646,12 @@ def model_to_sudokuvar(
     Returns:
         solution as a list of SudokuVars.
     """
-    # remove negated clauses
-    i = 0
-    while i < len(solution):
-        if solution[i] < 0:
-            solution.pop(i)
-        else:
-            i += 1
-    # convert to SudokuVar
+    last_cell_literal = first_auxiliary(puzzle.dimension) - 1
     converted_solution = []
     for item in solution:
-        item = str(item)
-        if puzzle.dimension < 10:
-            value = int(item[0])
-            row = int(item[1])
-            col = int(item[2])
-        else:
-            if len(item) == 6:
-                value = int(item[0:2])
-            if len(item) == 5:
-                value = int(item[0])
-            col = int(item[-2:])
-            row = int(item[-4:-2])
+        if not 0 < item <= last_cell_literal:
+            continue
+        value, row, col = decode_literal(item, puzzle.dimension)
         match puzzle.type:
             case "standard":
                 box = common_bi.calculate_standard(puzzle, col, row)
@@ -618,25 +1666,25 @@ def model_to_sudokuvar(
                     "Sohei Sudoku": common_bi.calculate_sohei,
                     "Tripledoku": common_bi.calculate_tripledoku,
                     "Twodoku": common_bi.calculate_twodoku,
+                    "Killer Sudoku": common_bi.calculate_9x9,
+                    "Consecutive Sudoku": common_bi.calculate_9x9,
+                    "Greater Than Sudoku": common_bi.calculate_9x9,
+                    "Little Killer Sudoku": common_bi.calculate_9x9,
+                    "Skyscraper Sudoku": common_bi.calculate_9x9,
+                    "Sudoku XV": common_bi.calculate_9x9,
                     # TODO: box indices calculators for the below
                     "Argyle Sudoku": make_argyle_clauses,
                     "Asterisk Sudoku": make_asterisk_clauses,
                     "Center Dot Sudoku": make_center_dot_clauses,
                     "Chain Sudoku": make_chain_clauses,
                     "Chain Sudoku 6 x 6": make_chain_6x6_clauses,
-                    "Consecutive Sudoku": make_consecutive_clauses,
                     "Even-Odd Sudoku": make_even_odd_clauses,
                     "Girandola Sudoku": make_girandola_clauses,
-                    "Greater Than Sudoku": make_greater_than_clauses,
                     "Jigsaw Sudoku": make_jigsaw_clauses,
-                    "Killer Sudoku": make_killer_clauses,
-                    "Little Killer Sudoku": make_little_killer_clauses,
                     "Rossini Sudoku": make_rossini_clauses,
-                    "Skyscraper Sudoku": make_skyscraper_clauses,
                     "Sudoku DG": make_dg_clauses,
                     "Sudoku Mine": make_mine_clauses,
                     "Sudoku X": make_x_clauses,
-                    "Sudoku XV": make_xv_clauses,
                     "Sujiken": make_sujiken_clauses,
                     "Vudoku": make_vudoku_clauses,
                     "Windoku": make_windoku_clauses,
@@ -0,0 +1,118 @@
+"""Statistics about the formula and the SAT search of each solve.
+
+Every solve records:
+
+- variables: number of distinct variables in the formula solved
+- clauses: number of clauses in the formula
+- literals: total length of those clauses
+- conflicts, decisions, propagations, restarts: the search effort, from
+  pysat's accum_stats()
+
+The formula is the one handed to the solver: after unit propagation (see
+preprocess) for a single solve, or the rules plus one unit clause per clue for
+a SolverSession, which passes the clues as assumptions instead.
+
+The statistics of a solve are found in its SolveControl's stats once it has
+finished. SubtypeStats adds them up by subtype over many solves.
+"""
+
+import itertools
+import threading
+from collections.abc import Sequence
+
+import numpy as np
+import pysat.solvers
+
+SEARCH_STATS = ("conflicts", "decisions", "propagations", "restarts")
+
+
+def formula_stats(clauses: Sequence[list[int]]) -> dict[str, int]:
+    """Measure the size of a formula.
+
+    Args:
+        clauses: the formula's clauses.
+
+    Returns:
+        numbers of distinct variables, clauses and literals.
+    """
+    num_literals = sum(map(len, clauses))
+    literals = np.fromiter(
+        itertools.chain.from_iterable(clauses),
+        dtype=np.int64,
+        count=num_literals,
+    )
+    return {
+        "variables": len(np.unique(np.abs(literals))),
+        "clauses": len(clauses),
+        "literals": num_literals,
+    }
+
+
+def search_stats(
+    sat_solver: pysat.solvers.Solver, before: dict[str, int]
+) -> dict[str, int]:
+    """Measure the effort of the last search of a solver.
+
+    The solver's counters accumulate over its lifetime, so the counters from
+    before the search are subtracted.
+
+    Args:
+        sat_solver: the solver, after the search.
+        before: sat_solver.accum_stats() from before the search.
+
+    Returns:
+        the conflicts, decisions, propagations and restarts of the search.
+    """
+    after = sat_solver.accum_stats()
+    return {
+        name: after.get(name, 0) - before.get(name, 0) for name in SEARCH_STATS
+    }
+
+
+class SubtypeStats:
+    """Totals of the statistics of many solves, by subtype.
+
+    Safe to add to from many threads.
+    """
+
+    def __init__(self):
+        """Create the SubtypeStats."""
+        self._totals = {}
+        self._solves = {}
+        self._lock = threading.Lock()
+
+    def add(self, subtype: str, stats: dict[str, int]):
+        """Add a solve's statistics.
+
+        Args:
+            subtype: subtype of the puzzle solved.
+            stats: statistics of the solve. Ignored if empty, e.g. when the
+                solution came from a cache.
+        """
+        if not stats:
+            return
+        with self._lock:
+            totals = self._totals.setdefault(subtype, {})
+            for name, value in stats.items():
+                totals[name] = totals.get(name, 0) + value
+            self._solves[subtype] = self._solves.get(subtype, 0) + 1
+
+    def summary(self) -> dict[str, dict]:
+        """Summarise the statistics added so far.
+
+        Returns:
+            for each subtype, the number of solves and the total and mean of
+            each statistic.
+        """
+        with self._lock:
+            return {
+                subtype: {
+                    "solves": self._solves[subtype],
+                    "total": dict(totals),
+                    "mean": {
+                        name: value / self._solves[subtype]
+                        for name, value in totals.items()
+                    },
+                }
+                for subtype, totals in self._totals.items()
+            }
@@ -0,0 +1,449 @@
+"""Symmetries of sudoku puzzles, used to put puzzles in a canonical form.
+
+Puzzles which differ only by a symmetry (relabelling the numbers, or
+rearranging the grid so rows, columns and boxes stay rows, columns and boxes)
+have solutions which differ by the same symmetry. Mapping every puzzle to a
+canonical representative of its class lets one solution serve the whole
+class.
+
+For standard sudoku the symmetries are transposition (square boxes only),
+reordering bands and stacks, reordering rows within a band and columns within
+a stack, and relabelling numbers; rotations and reflections are combinations
+of these. For multidoku they are the rotations and reflections which map the
+shape onto itself, found by checking the puzzle's clauses, and relabelling.
+
+The canonical form is the arrangement whose clue pattern is smallest, with
+ties broken by the smallest grid after relabelling numbers in order of first
+appearance. Column rearrangements are enumerated while the row ones are found
+by sorting, which keeps the search cheap up to 12 x 12. Larger grids have too
+many column rearrangements (see MAX_COLUMN_PERMUTATIONS), so their columns
+are sorted first, by keys which rearranging rows does not change, and only
+the ties are enumerated. That is canonical too, for a smaller set of
+arrangements. For very symmetric clue patterns only part of the search is
+done (see MAX_TIES). The result is then still a valid transform, just not
+canonical across the whole class.
+"""
+
+import functools
+import itertools
+import math
+
+import numpy as np
+
+import solvd.sudoku.common.box_indices as common_bi
+import solvd.sudoku.common.puzzle_spec as common_ps
+import solvd.sudoku.solving.headless as solving_headless
+import solvd.sudoku.solving.solution as solving_sltn
+
+# above this many column rearrangements, columns are sorted rather than all
+# rearrangements tried
+MAX_COLUMN_PERMUTATIONS = 100_000
+# maximum number of arrangements with the smallest clue pattern compared
+MAX_TIES = 2_000
+
+
+class Transform:
+    """A symmetry: a rearrangement of a grid's cells and relabelling of numbers.
+
+    Attributes:
+        dimension: width of the grid (number of cells).
+        cells: for each cell of the transformed grid (row-major), the index of
+            the cell of the original grid it is taken from.
+        digits: for each number of the original grid, the number it becomes.
+            digits[0] is 0, so empty cells stay empty.
+    """
+
+    def __init__(self, dimension: int, cells: np.ndarray, digits: np.ndarray):
+        """Create the Transform.
+
+        Args:
+            dimension: width of the grid (number of cells).
+            cells: index of the original cell for each transformed cell.
+            digits: new number for each original number.
+        """
+        self.dimension = dimension
+        self.cells = cells
+        self.digits = digits
+
+    def apply(self, grid: list[list[int]] | int) -> list[list[int]] | int:
+        """Transform a grid, e.g. a puzzle's solution into canonical form.
+
+        Args:
+            grid: rows of the grid. UNSOLVABLE and TIMED_OUT are passed
+                through unchanged.
+
+        Returns:
+            rows of the transformed grid.
+        """
+        if isinstance(grid, int):
+            return grid
+        flat = np.asarray(grid).ravel()
+        transformed = self.digits[flat[self.cells]]
+        return transformed.reshape(self.dimension, self.dimension).tolist()
+
+    def undo(self, grid: list[list[int]] | int) -> list[list[int]] | int:
+        """Reverse the transform, e.g. on the solution of a canonical puzzle.
+
+        Args:
+            grid: rows of the transformed grid. UNSOLVABLE and TIMED_OUT are
+                passed through unchanged.
+
+        Returns:
+            rows of the original grid.
+        """
+        if isinstance(grid, int):
+            return grid
+        inverse_digits = np.empty_like(self.digits)
+        inverse_digits[self.digits] = np.arange(len(self.digits))
+        flat = np.empty(self.dimension * self.dimension, dtype=np.int64)
+        flat[self.cells] = inverse_digits[np.asarray(grid).ravel()]
+        return flat.reshape(self.dimension, self.dimension).tolist()
+
+
+def canonicalise(
+    spec: common_ps.PuzzleSpec, grid: list[list[int]]
+) -> tuple[list[list[int]], Transform]:
+    """Put a puzzle in canonical form.
+
+    Args:
+        spec: the puzzle's layout.
+        grid: rows of the puzzle, with 0 for empty cells.
+
+    Returns:
+        rows of the canonical puzzle, and the transform from the puzzle to it.
+    """
+    values = np.asarray(grid, dtype=np.int64)
+    match spec.type:
+        case "standard":
+            transform = canonicalise_standard(spec, values)
+        case "multidoku":
+            transform = min_relabelled(
+                spec, values, shape_symmetries(spec.subtype)
+            )
+        case _:
+            # variant rules are generally not symmetric under relabelling
+            cells = np.arange(spec.dimension * spec.dimension)
+            digits = np.arange(spec.max_num + 1)
+            transform = Transform(spec.dimension, cells, digits)
+    return transform.apply(grid), transform
+
+
+def canonicalise_standard(
+    spec: common_ps.PuzzleSpec, values: np.ndarray
+) -> Transform:
+    """Find the canonical transform of a standard sudoku.
+
+    Args:
+        spec: the puzzle's layout.
+        values: the puzzle's clues, 0 for empty cells.
+
+    Returns:
+        the transform to canonical form.
+    """
+    n = spec.dimension
+    box_rows, box_cols = box_shape(spec)
+    orientations = [False, True] if box_rows == box_cols else [False]
+    # the orientation and column arrangement of each row of row_values
+    col_arrangements = []
+    row_values = []
+    for transposed in orientations:
+        pattern = (values.T if transposed else values) > 0
+        col_perms, col_weights = column_arrangements(
+            pattern, box_rows, box_cols
+        )
+        # row_values[k, r] is row r's clue pattern as a binary number when
+        # the columns are arranged by col_perms[k]
+        row_values.append((pattern.astype(np.int64) @ col_weights.T).T)
+        col_arrangements.extend((transposed, cols) for cols in col_perms)
+    row_values = np.concatenate(row_values)
+    # the best row arrangement for each column arrangement sorts the rows in
+    # each band, then sorts the bands
+    bands = np.sort(row_values.reshape(len(row_values), -1, box_rows), axis=2)
+    if box_rows * n < 63:
+        # pack each band's row values into one number with the same ordering
+        shifts = n * np.arange(box_rows - 1, -1, -1, dtype=np.int64)
+        band_ranks = np.bitwise_or.reduce(bands << shifts, axis=2)
+    else:
+        _, band_ranks = np.unique(
+            bands.reshape(-1, box_rows), axis=0, return_inverse=True
+        )
+    band_ranks = np.sort(band_ranks.reshape(len(row_values), -1), axis=1)
+    best = band_ranks[np.lexsort(band_ranks.T[::-1])[0]]
+    tied = np.flatnonzero(np.all(band_ranks == best, axis=1))
+
+    def arrangements():
+        """Yield every arrangement with the smallest clue pattern."""
+        for candidate in tied:
+            transposed, cols = col_arrangements[candidate]
+            for rows in tied_row_orders(row_values[candidate], box_rows):
+                if transposed:
+                    yield (cols[None, :] * n + rows[:, None]).ravel()
+                else:
+                    yield (rows[:, None] * n + cols[None, :]).ravel()
+
+    return min_relabelled(
+        spec, values, itertools.islice(arrangements(), MAX_TIES)
+    )
+
+
+def min_relabelled(
+    spec: common_ps.PuzzleSpec, values: np.ndarray, arrangements
+) -> Transform:
+    """Pick the arrangement which gives the smallest grid after relabelling.
+
+    Args:
+        spec: the puzzle's layout.
+        values: the puzzle's clues, 0 for empty cells.
+        arrangements (Iterable[np.ndarray]): cell index arrays to try.
+
+    Returns:
+        the transform giving the smallest grid.
+    """
+    flat_values = values.ravel()
+    best = None
+    for cells in arrangements:
+        flat = flat_values[cells]
+        digits = relabelling(flat, spec.max_num)
+        key = tuple(digits[flat])
+        if best is None or key < best[0]:
+            best = (key, cells, digits)
+    _, cells, digits = best
+    return Transform(spec.dimension, cells, digits)
+
+
+def relabelling(flat: np.ndarray, max_num: int) -> np.ndarray:
+    """Number the values in order of first appearance.
+
+    Numbers which do not appear come after, in their original order.
+
+    Args:
+        flat: the grid's values, row-major.
+        max_num: highest number a cell can take.
+
+    Returns:
+        the new number for each original number, with 0 kept as 0.
+    """
+    clues = flat[flat > 0]
+    _, first_seen = np.unique(clues, return_index=True)
+    seen = clues[np.sort(first_seen)]
+    unseen = np.setdiff1d(np.arange(1, max_num + 1), seen)
+    digits = np.zeros(max_num + 1, dtype=np.int64)
+    digits[np.concatenate((seen, unseen))] = np.arange(1, max_num + 1)
+    return digits
+
+
+def tied_row_orders(row_values: np.ndarray, box_rows: int):
+    """Yield every row order which sorts the rows in bands and the bands.
+
+    Rows or bands with equal values can be swapped without changing the
+    sorted result, so there is one order per combination of such swaps.
+
+    Args:
+        row_values: value of each row, compared to sort them.
+        box_rows: number of rows in a band.
+
+    Yields:
+        row indices, in order.
+    """
+    bands = row_values.reshape(-1, box_rows)
+    band_rows = []
+    band_keys = []
+    for b, band in enumerate(bands):
+        order = np.argsort(band, kind="stable")
+        band_rows.append(b * box_rows + order)
+        band_keys.append(tuple(band[order]))
+    band_order = sorted(range(len(bands)), key=lambda b: band_keys[b])
+    row_options = [
+        list(tied_permutations(band_rows[b], band_keys[b]))
+        for b in range(len(bands))
+    ]
+    sorted_keys = [band_keys[b] for b in band_order]
+    for bands_in_order in tied_permutations(band_order, sorted_keys):
+        for rows in itertools.product(
+            *(row_options[b] for b in bands_in_order)
+        ):
+            yield np.concatenate(rows)
+
+
+def tied_permutations(items, keys):
+    """Yield every reordering of sorted items which keeps the keys sorted.
+
+    Args:
+        items (Sequence): the items, sorted by key.
+        keys (Sequence): key of each item.
+
+    Yields:
+        list of the reordered items.
+    """
+    runs = [
+        [item for _, item in run]
+        for _, run in itertools.groupby(zip(keys, items), lambda x: x[0])
+    ]
+    for runs_in_order in itertools.product(
+        *(itertools.permutations(run) for run in runs)
+    ):
+        yield [item for run in runs_in_order for item in run]
+
+
+def box_shape(spec: common_ps.PuzzleSpec) -> tuple[int, int]:
+    """Get the number of rows and columns in a box of a standard sudoku.
+
+    Args:
+        spec: the puzzle's layout.
+
+    Returns:
+        rows per box and columns per box.
+    """
+    if spec.ratio == "square":
+        box_size = common_bi.calculate_square_box_size(spec.dimension)
+        return box_size, box_size
+    box_size_short, box_size_long = common_bi.calculate_box_sizes(
+        spec.dimension
+    )
+    if spec.ratio == "wide":
+        return box_size_short, box_size_long
+    return box_size_long, box_size_short
+
+
+def column_arrangements(
+    pattern: np.ndarray, box_rows: int, box_cols: int
+) -> tuple[np.ndarray, np.ndarray]:
+    """List the column rearrangements to try for a standard sudoku.
+
+    Args:
+        pattern: whether each cell has a clue.
+        box_rows: number of rows in a box.
+        box_cols: number of columns in a box.
+
+    Returns:
+        one row of original column indices per rearrangement, and their
+        column_weights. All rearrangements if there are at most
+        MAX_COLUMN_PERMUTATIONS, otherwise those sorting the columns by
+        sorted_column_keys.
+    """
+    n = len(pattern)
+    stacks = n // box_cols
+    total = math.factorial(stacks) * math.factorial(box_cols) ** stacks
+    if total <= MAX_COLUMN_PERMUTATIONS:
+        return column_permutations(n, box_cols)
+    orders = tied_row_orders(sorted_column_keys(pattern, box_rows), box_cols)
+    perms = np.array(list(itertools.islice(orders, MAX_TIES)))
+    return perms, column_weights(perms)
+
+
+def sorted_column_keys(pattern: np.ndarray, box_rows: int) -> np.ndarray:
+    """Rank the columns of a clue pattern by keys which rows cannot change.
+
+    A column's key is the number of its clues in each band, sorted, then the
+    number of clues in each row it has a clue in, sorted. Rearranging rows
+    and relabelling numbers leave every key the same, so sorting columns by
+    key arranges them the same way for every puzzle of a class, up to ties.
+
+    Args:
+        pattern: whether each cell has a clue.
+        box_rows: number of rows in a box.
+
+    Returns:
+        rank of each column's key, equal for equal keys.
+    """
+    n = len(pattern)
+    band_counts = np.sort(
+        pattern.reshape(n // box_rows, box_rows, n).sum(axis=1), axis=0
+    )
+    row_counts = np.sort(
+        np.where(pattern, pattern.sum(axis=1)[:, None], 0), axis=0
+    )
+    keys = np.concatenate((band_counts, row_counts)).T
+    _, ranks = np.unique(keys, axis=0, return_inverse=True)
+    return ranks.reshape(n)
+
+
+@functools.cache
+def column_permutations(
+    dimension: int, box_cols: int
+) -> tuple[np.ndarray, np.ndarray]:
+    """List every column rearrangement of a standard sudoku.
+
+    Args:
+        dimension: width of the puzzle (number of cells).
+        box_cols: number of columns in a box.
+
+    Returns:
+        one row of original column indices per rearrangement, and their
+        column_weights.
+    """
+    stacks = dimension // box_cols
+    within = np.array(list(itertools.permutations(range(box_cols))))
+    choices = np.array(
+        list(itertools.product(range(len(within)), repeat=stacks))
+    )
+    # within_stacks[m, s] is the column order of stack s in combination m
+    within_stacks = (
+        within[choices] + (np.arange(stacks) * box_cols)[None, :, None]
+    )
+    perms = np.concatenate(
+        [
+            within_stacks[:, list(stack_order), :].reshape(-1, dimension)
+            for stack_order in itertools.permutations(range(stacks))
+        ]
+    )
+    return perms, column_weights(perms)
+
+
+def column_weights(perms: np.ndarray) -> np.ndarray:
+    """Weigh the columns of each column rearrangement.
+
+    Args:
+        perms: one row of original column indices per rearrangement.
+
+    Returns:
+        for each rearrangement the weight of each original column (a power
+        of 2, the largest for the column placed first).
+    """
+    positions = np.argsort(perms, axis=1)
+    return np.left_shift(1, perms.shape[1] - 1 - positions, dtype=np.int64)
+
+
+@functools.cache
+def shape_symmetries(subtype: str) -> list[np.ndarray]:
+    """Find the rotations and reflections which map a multidoku onto itself.
+
+    A rotation or reflection is a symmetry if it maps the puzzle's cells onto
+    its cells, and every pair of cells which must differ onto a pair which
+    must differ.
+
+    Args:
+        subtype: subtype of multidoku.
+
+    Returns:
+        cell index arrays of the symmetries, starting with the identity.
+    """
+    spec = common_ps.PuzzleSpec(subtype)
+    n = spec.dimension
+    _, all_vars = solving_headless.grid_to_vars(
+        spec, solving_headless.blank_grid(spec)
+    )
+    cells = {row * n + col for row, col, _ in spec.cells()}
+    pairs = set()
+    for clause in solving_sltn.make_puzzle_clauses(all_vars, spec):
+        if len(clause) != 2:
+            continue
+        decoded = [solving_sltn.decode_literal(lit, n) for lit in clause]
+        if decoded[0][0] == 1:
+            pairs.add(frozenset(row * n + col for _, row, col in decoded))
+    index = np.arange(n * n).reshape(n, n)
+    symmetries = []
+    for reflect in (False, True):
+        for turns in range(4):
+            arranged = np.rot90(index.T if reflect else index, turns).ravel()
+            # position of each original cell in the arrangement
+            moved_to = np.argsort(arranged)
+            if {int(moved_to[cell]) for cell in cells} != cells:
+                continue
+            moved_pairs = {
+                frozenset(int(moved_to[cell]) for cell in pair)
+                for pair in pairs
+            }
+            if moved_pairs == pairs:
+                symmetries.append(arranged)
+    return symmetries
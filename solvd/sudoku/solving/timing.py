@@ -0,0 +1,213 @@
+"""Timing of the stages of each solve.
+
+The stages are:
+
+- clauses: making the CNF clauses for the rules and the clues
+- preprocess: simplifying the clauses by unit propagation (see preprocess)
+- load: loading the clauses into the solver
+- solve: the SAT search
+- decode: turning the model back into a solution
+- write_back: setting the cells' values in the UI
+
+Listeners registered with add_listener are called with the durations of the
+stages once a solve has finished. Setting the SOLVD_TIMING_LOG environment
+variable to a file path, or "-" for stderr, logs every solve's durations there
+as a line of JSON. When there are no listeners, start returns NULL_TIMER,
+which records nothing. Setting SOLVD_PROFILE profiles each stage too (see
+profiling).
+"""
+
+import contextlib
+import json
+import os
+import sys
+import threading
+import time
+from collections.abc import Callable, Iterator
+
+Listener = Callable[[str, dict[str, float]], None]
+
+# replaced rather than changed in place, so a solve finishing can loop over it
+# while a listener is added or removed
+listeners: list[Listener] = []
+
+
+def add_listener(listener: Listener):
+    """Call a function with the durations of the stages of every solve.
+
+    Args:
+        listener: called with the subtype of the puzzle solved and the
+            duration of each stage it went through (seconds).
+    """
+    global listeners
+    listeners = [*listeners, listener]
+
+
+def remove_listener(listener: Listener):
+    """Stop calling a function added with add_listener.
+
+    Args:
+        listener: the function.
+
+    Raises:
+        ValueError: if the function is not a listener.
+    """
+    global listeners
+    remaining = list(listeners)
+    remaining.remove(listener)
+    listeners = remaining
+
+
+def start(subtype: str) -> "SolveTimer":
+    """Start timing a solve.
+
+    Args:
+        subtype: subtype of the puzzle being solved.
+
+    Returns:
+        a timer for the solve, or NULL_TIMER if nothing is listening.
+    """
+    if not listeners and timer_class is SolveTimer:
+        return NULL_TIMER
+    return record(subtype)
+
+
+def record(subtype: str) -> "SolveTimer":
+    """Start timing a solve, whether or not anything is listening.
+
+    Args:
+        subtype: subtype of the puzzle being solved.
+
+    Returns:
+        a timer for the solve.
+    """
+    return timer_class(subtype)
+
+
+class SolveTimer:
+    """Records how long each stage of a solve takes.
+
+    Attributes:
+        subtype: subtype of the puzzle being solved.
+        durations: duration of each stage so far (seconds).
+    """
+
+    def __init__(self, subtype: str):
+        """Create the SolveTimer.
+
+        Args:
+            subtype: subtype of the puzzle being solved.
+        """
+        self.subtype = subtype
+        self.durations = {}
+
+    @contextlib.contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        """Time a stage, adding to its duration if it has been timed before.
+
+        Args:
+            name: name of the stage.
+        """
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            duration = time.perf_counter() - start
+            self.durations[name] = self.durations.get(name, 0.0) + duration
+
+    def finish(self):
+        """Pass the durations to the listeners."""
+        for listener in listeners:
+            listener(self.subtype, dict(self.durations))
+
+
+class NullTimer(SolveTimer):
+    """A SolveTimer which records nothing, used when nothing is listening."""
+
+    def __init__(self):
+        """Create the NullTimer."""
+        SolveTimer.__init__(self, "")
+        self._stage = contextlib.nullcontext()
+
+    def stage(self, name: str) -> contextlib.nullcontext:
+        """Do nothing.
+
+        Args:
+            name: name of the stage.
+        """
+        return self._stage
+
+    def finish(self):
+        """Do nothing."""
+
+
+NULL_TIMER = NullTimer()
+
+# class of the timers made by record, replaced by profiling.enable
+timer_class = SolveTimer
+
+
+class JsonLogger:
+    """Listener which writes each solve's durations as a line of JSON.
+
+    The file is opened for each line and closed again, so nothing is left
+    open once the listener is removed.
+
+    Attributes:
+        path: file the lines are appended to, or "-" for stderr.
+    """
+
+    def __init__(self, path: str):
+        """Create the JsonLogger.
+
+        Args:
+            path: file to append the lines to, or "-" for stderr.
+        """
+        self.path = path
+        self._lock = threading.Lock()
+
+    def __call__(self, subtype: str, durations: dict[str, float]):
+        """Write a solve's durations.
+
+        Args:
+            subtype: subtype of the puzzle solved.
+            durations: duration of each stage (seconds).
+        """
+        line = json.dumps(
+            {
+                "event": "solve_timing",
+                "subtype": subtype,
+                "stages": durations,
+                "total": sum(durations.values()),
+            }
+        )
+        with self._lock:
+            if self.path == "-":
+                sys.stderr.write(line + "\n")
+                sys.stderr.flush()
+            else:
+                with open(self.path, "a") as file:
+                    file.write(line + "\n")
+
+
+def enable_json_log(path: str = "-") -> JsonLogger:
+    """Log every solve's durations as lines of JSON.
+
+    Args:
+        path: file to append the lines to, or "-" for stderr.
+
+    Returns:
+        the listener added, which can be passed to remove_listener.
+    """
+    logger = JsonLogger(path)
+    add_listener(logger)
+    return logger
+
+
+if os.environ.get("SOLVD_TIMING_LOG"):
+    enable_json_log(os.environ["SOLVD_TIMING_LOG"])
+
+if os.environ.get("SOLVD_PROFILE"):
+    import solvd.sudoku.solving.profiling as solving_profiling
+
+    solving_profiling.enable_from_environment()
@@ -1,10 +1,13 @@
 """UI for the cells in sudoku puzzles."""
 
+import abc
 import tkinter as tk
 from tkinter import ttk
+from typing import ClassVar
 
 import solvd.common.theming as solvd_theming
 import solvd.common.ui_ctrl as solvd_ui_ctrl
+import solvd.sudoku.common.sudoku_var as common_sv
 import solvd.sudoku.ui.grids as ui_grids
 import solvd.sudoku.ui.puzzle_page as ui_pp
 
@@ -140,6 +143,413 @@ class SpecificCellsWindow(tk.Toplevel):
             self.destroy()
 
 
+class CageWindow(tk.Toplevel):
+    """Window where the cells and total of a new killer cage are chosen."""
+
+    def __init__(self, puzzle_page: "ui_pp.PuzzlePage"):
+        """Initiates window.
+
+        Args:
+            puzzle_page: parent frame.
+        """
+        colours = solvd_theming.load_colours()
+
+        tk.Toplevel.__init__(
+            self, puzzle_page.app_window, background=colours["bg0"]
+        )
+        solvd_ui_ctrl.change_title(self, "Add Cage")
+
+        caged = {
+            cell for cage in puzzle_page.constraints for cell in cage.cells
+        }
+        cell_buttons = []
+        for r in range(puzzle_page.dimension):
+            for c in range(puzzle_page.dimension):
+                cell_button = CellButton(self, c, r)
+                cell_buttons.append(cell_button)
+                cell_button.grid(column=c, row=r, padx=10, pady=10)
+                if (r, c) in caged:
+                    solvd_ui_ctrl.disable_button(cell_button)
+
+        total_label = ttk.Label(
+            self, text="Total:", style="Instructions.TLabel"
+        )
+        total_label.grid(
+            row=puzzle_page.dimension, column=0, columnspan=3, pady=10
+        )
+        total_entry = ttk.Entry(self, width=3, style="Cell.TEntry")
+        total_entry.grid(
+            row=puzzle_page.dimension, column=3, columnspan=2, pady=10
+        )
+
+        ok_button = ttk.Button(
+            self,
+            text="OK",
+            style="Std.TButton",
+            command=lambda: ok_button_click(),
+        )
+        ok_button.grid(
+            row=puzzle_page.dimension + 1,
+            column=0,
+            columnspan=puzzle_page.dimension,
+            pady=10,
+        )
+
+        def ok_button_click():
+            """Add the cage, if it is complete, and close the window."""
+            cells = [
+                (cell.row, cell.col) for cell in cell_buttons if cell.selected
+            ]
+            total = total_entry.get()
+            if not cells or not total.isdigit():
+                return
+            puzzle_page.puzzle_grid.add_constraint(
+                common_sv.Cage(cells, int(total))
+            )
+            self.destroy()
+
+
+class LineWindow(tk.Toplevel, abc.ABC):
+    """Window where a constraint on a line of cells from an edge is chosen.
+
+    The line starts at the chosen cell on the edge of the grid and runs in
+    the chosen direction until it leaves the grid. Subclasses set the title,
+    directions and number label, and make the constraint in
+    add_constraint.
+
+    Attributes:
+        puzzle_page: parent frame.
+        title: the window's title.
+        directions: the directions a line can run in, as row and column
+            steps, by name.
+        number_label: label of the clue's number, e.g. the total.
+    """
+
+    title = "Add Line"
+    directions: ClassVar[dict[str, tuple[int, int]]] = {}
+    number_label = "Number:"
+
+    def __init__(self, puzzle_page: "ui_pp.PuzzlePage"):
+        """Initiates window.
+
+        Args:
+            puzzle_page: parent frame.
+        """
+        colours = solvd_theming.load_colours()
+
+        tk.Toplevel.__init__(
+            self, puzzle_page.app_window, background=colours["bg0"]
+        )
+        solvd_ui_ctrl.change_title(self, self.title)
+        self.puzzle_page = puzzle_page
+
+        edge = (0, puzzle_page.dimension - 1)
+        cell_buttons = []
+        for r in range(puzzle_page.dimension):
+            for c in range(puzzle_page.dimension):
+                cell_button = CellButton(self, c, r)
+                cell_buttons.append(cell_button)
+                cell_button.grid(column=c, row=r, padx=10, pady=10)
+                if r not in edge and c not in edge:
+                    solvd_ui_ctrl.disable_button(cell_button)
+
+        direction_choice = tk.StringVar(value=next(iter(self.directions)))
+        direction_combobox = ttk.Combobox(
+            self,
+            textvariable=direction_choice,
+            state="readonly",
+            style="Std.TCombobox",
+        )
+        direction_combobox["values"] = tuple(self.directions)
+        direction_combobox.grid(
+            row=puzzle_page.dimension, column=0, columnspan=4, pady=10
+        )
+        number_label = ttk.Label(
+            self, text=self.number_label, style="Instructions.TLabel"
+        )
+        number_label.grid(
+            row=puzzle_page.dimension, column=4, columnspan=3, pady=10
+        )
+        number_entry = ttk.Entry(self, width=3, style="Cell.TEntry")
+        number_entry.grid(
+            row=puzzle_page.dimension, column=7, columnspan=2, pady=10
+        )
+
+        ok_button = ttk.Button(
+            self,
+            text="OK",
+            style="Std.TButton",
+            command=lambda: ok_button_click(),
+        )
+        ok_button.grid(
+            row=puzzle_page.dimension + 1,
+            column=0,
+            columnspan=puzzle_page.dimension,
+            pady=10,
+        )
+
+        def ok_button_click():
+            """Add the constraint, if it is complete, and close the window.
+
+            The start cell must be the first cell of the line, i.e. the cell
+            before it in the chosen direction is outside the grid.
+            """
+            starts = [
+                (cell.row, cell.col) for cell in cell_buttons if cell.selected
+            ]
+            number = number_entry.get()
+            if len(starts) != 1 or not number.isdigit():
+                return
+            (row, col), (row_step, col_step) = (
+                starts[0],
+                self.directions[direction_choice.get()],
+            )
+            if (
+                0 <= row - row_step < puzzle_page.dimension
+                and 0 <= col - col_step < puzzle_page.dimension
+            ):
+                return
+            self.add_constraint(starts[0], (row_step, col_step), int(number))
+            self.destroy()
+
+    @abc.abstractmethod
+    def add_constraint(
+        self, start: tuple[int, int], direction: tuple[int, int], number: int
+    ):
+        """Add the chosen constraint to the puzzle.
+
+        Args:
+            start: the row and column of the line's first cell.
+            direction: the step in rows and in columns from one cell of the
+                line to the next.
+            number: the clue's number.
+        """
+
+
+class DiagonalWindow(LineWindow):
+    """Window where a new little killer diagonal is chosen."""
+
+    title = "Add Diagonal"
+    directions: ClassVar[dict[str, tuple[int, int]]] = {
+        "Down right": (1, 1),
+        "Down left": (1, -1),
+        "Up right": (-1, 1),
+        "Up left": (-1, -1),
+    }
+    number_label = "Total:"
+
+    def add_constraint(
+        self, start: tuple[int, int], direction: tuple[int, int], number: int
+    ):
+        """Add the diagonal.
+
+        Args:
+            start: the row and column of the diagonal's first cell.
+            direction: the step in rows and in columns from one cell of the
+                diagonal to the next.
+            number: the diagonal's total.
+        """
+        self.puzzle_page.puzzle_grid.add_constraint(
+            common_sv.Diagonal(start, direction, number)
+        )
+
+
+class SkyscraperWindow(LineWindow):
+    """Window where a new skyscraper clue is chosen."""
+
+    title = "Add Clue"
+    directions: ClassVar[dict[str, tuple[int, int]]] = {
+        "Looking down": (1, 0),
+        "Looking up": (-1, 0),
+        "Looking right": (0, 1),
+        "Looking left": (0, -1),
+    }
+    number_label = "Visible:"
+
+    def add_constraint(
+        self, start: tuple[int, int], direction: tuple[int, int], number: int
+    ):
+        """Add the clue.
+
+        Args:
+            start: the row and column of the first cell seen from the clue.
+            direction: the step in rows and in columns from one cell of the
+                line to the next, looking from the clue.
+            number: the number of skyscrapers visible from the clue.
+        """
+        self.puzzle_page.puzzle_grid.add_constraint(
+            common_sv.SkyscraperClue(start, direction, number)
+        )
+
+
+class NeighboursWindow(tk.Toplevel, abc.ABC):
+    """Window where a constraint between two neighbouring cells is chosen.
+
+    Subclasses set the title and the choices offered, if any, and make the
+    constraint in add_constraint.
+
+    Attributes:
+        puzzle_page: parent frame.
+        title: the window's title.
+        choices: the options of the constraint, e.g. which cell is greater.
+            No choice is offered if empty.
+    """
+
+    title = "Add Constraint"
+    choices = ()
+
+    def __init__(self, puzzle_page: "ui_pp.PuzzlePage"):
+        """Initiates window.
+
+        Args:
+            puzzle_page: parent frame.
+        """
+        colours = solvd_theming.load_colours()
+
+        tk.Toplevel.__init__(
+            self, puzzle_page.app_window, background=colours["bg0"]
+        )
+        solvd_ui_ctrl.change_title(self, self.title)
+        self.puzzle_page = puzzle_page
+
+        cell_buttons = []
+        for r in range(puzzle_page.dimension):
+            for c in range(puzzle_page.dimension):
+                cell_button = CellButton(self, c, r)
+                cell_buttons.append(cell_button)
+                cell_button.grid(column=c, row=r, padx=10, pady=10)
+
+        choice = tk.StringVar(value=self.choices[0] if self.choices else "")
+        if self.choices:
+            choice_combobox = ttk.Combobox(
+                self,
+                textvariable=choice,
+                state="readonly",
+                style="Std.TCombobox",
+            )
+            choice_combobox["values"] = self.choices
+            choice_combobox.grid(
+                row=puzzle_page.dimension,
+                column=0,
+                columnspan=puzzle_page.dimension,
+                pady=10,
+            )
+
+        ok_button = ttk.Button(
+            self,
+            text="OK",
+            style="Std.TButton",
+            command=lambda: ok_button_click(),
+        )
+        ok_button.grid(
+            row=puzzle_page.dimension + 1,
+            column=0,
+            columnspan=puzzle_page.dimension,
+            pady=10,
+        )
+
+        def ok_button_click():
+            """Add the constraint, if it is between neighbours, and close."""
+            cells = [
+                (cell.row, cell.col) for cell in cell_buttons if cell.selected
+            ]
+            if len(cells) != 2 or not are_neighbours(*cells):
+                return
+            # cell buttons are in reading order, so the first is top or left
+            self.add_constraint(*cells, choice.get())
+            self.destroy()
+
+    @abc.abstractmethod
+    def add_constraint(
+        self, cell_1: tuple[int, int], cell_2: tuple[int, int], choice: str
+    ):
+        """Add the chosen constraint to the puzzle.
+
+        Args:
+            cell_1: the row and column of the top or left cell.
+            cell_2: the row and column of the bottom or right cell.
+            choice: the chosen option, one of choices.
+        """
+
+
+class InequalityWindow(NeighboursWindow):
+    """Window where a new greater than sign between two cells is chosen."""
+
+    title = "Add Sign"
+    choices = ("Top/left cell is greater", "Bottom/right cell is greater")
+
+    def add_constraint(
+        self, cell_1: tuple[int, int], cell_2: tuple[int, int], choice: str
+    ):
+        """Add the sign, pointing at the cell which is not chosen as greater.
+
+        Args:
+            cell_1: the row and column of the top or left cell.
+            cell_2: the row and column of the bottom or right cell.
+            choice: which cell is greater, one of choices.
+        """
+        if choice == self.choices[1]:
+            cell_1, cell_2 = cell_2, cell_1
+        self.puzzle_page.puzzle_grid.add_constraint(
+            common_sv.Inequality(cell_1, cell_2)
+        )
+
+
+class ConsecutiveWindow(NeighboursWindow):
+    """Window where a new consecutive bar between two cells is chosen."""
+
+    title = "Add Bar"
+
+    def add_constraint(
+        self, cell_1: tuple[int, int], cell_2: tuple[int, int], choice: str
+    ):
+        """Add the bar.
+
+        Args:
+            cell_1: the row and column of the top or left cell.
+            cell_2: the row and column of the bottom or right cell.
+            choice: unused, as a bar has no options.
+        """
+        self.puzzle_page.puzzle_grid.add_constraint(
+            common_sv.ConsecutivePair((cell_1, cell_2))
+        )
+
+
+class XVWindow(NeighboursWindow):
+    """Window where a new X or V between two cells is chosen."""
+
+    title = "Add X or V"
+    choices = ("X (sum 10)", "V (sum 5)")
+
+    def add_constraint(
+        self, cell_1: tuple[int, int], cell_2: tuple[int, int], choice: str
+    ):
+        """Add the mark.
+
+        Args:
+            cell_1: the row and column of the top or left cell.
+            cell_2: the row and column of the bottom or right cell.
+            choice: which mark, one of choices.
+        """
+        total = 10 if choice == self.choices[0] else 5
+        self.puzzle_page.puzzle_grid.add_constraint(
+            common_sv.XVMark((cell_1, cell_2), total)
+        )
+
+
+def are_neighbours(cell_1: tuple[int, int], cell_2: tuple[int, int]) -> bool:
+    """Check whether two cells share a side.
+
+    Args:
+        cell_1: the row and column of one cell.
+        cell_2: the row and column of the other.
+
+    Returns:
+        whether the cells are next to each other in a row or column.
+    """
+    return abs(cell_1[0] - cell_2[0]) + abs(cell_1[1] - cell_2[1]) == 1
+
+
 class CellButton(ttk.Button):
     """Button that represents a cell. For use with SpecificCellsWindow.
 
@@ -68,6 +68,8 @@ class ConfigureSudokuFrame(ttk.Frame):
             "12 x 12 (wide boxes)",
             "12 x 12 (tall boxes)",
             "16 x 16",
+            "25 x 25",
+            "36 x 36",
         )
         standard_sudoku_combobox.bind(
             "<<ComboboxSelected>>",
@@ -1,10 +1,12 @@
 """UI for sudoku grids."""
 
+import abc
 import tkinter as tk
-import time
+from typing import ClassVar
 
 import solvd.common.theming as solvd_theming
 import solvd.sudoku.common.box_indices as common_bi
+import solvd.sudoku.common.sudoku_var as common_sv
 import solvd.sudoku.ui.cell as ui_cell
 import solvd.sudoku.ui.puzzle_page as ui_pp
 
@@ -18,15 +20,21 @@ class Base(tk.Canvas):
         cells: the grid's cells.
         dimension: width of the puzzle (number of cells).
         grid_width: width of the grid (px).
+        constraint_button_text: text of the button for adding a variant's
+            constraints (see ConstrainedGrid). None if the grid has no
+            constraints to add.
     """
 
+    constraint_button_text = None
+
     def __init__(self, puzzle_page: "ui_pp.PuzzlePage"):
         """Initialise the base class.
 
         Args:
             puzzle_page: parent frame.
         """
-        self.cell_width = 45
+        # grids wider than the multidoku are drawn smaller to fit on screen
+        self.cell_width = 45 if puzzle_page.dimension <= 21 else 30
         self.colours = solvd_theming.load_colours()
         self.cells = []
         self.dimension = puzzle_page.dimension
@@ -171,6 +179,54 @@ class Base(tk.Canvas):
         self.cells.append(cell)
 
 
+class ConstrainedGrid(Base, abc.ABC):
+    """The base class of a 9 x 9 variant grid with constraints drawn over it.
+
+    Subclasses set constraint_button_text, open the window for adding a
+    constraint in open_constraint_window and draw their constraints in
+    draw_constraint.
+
+    Attributes:
+        puzzle_page: parent frame, which holds the constraints.
+    """
+
+    def __init__(self, puzzle_page: "ui_pp.PuzzlePage"):
+        """Draws the puzzle.
+
+        Args:
+            puzzle_page: parent frame.
+        """
+        Base.__init__(self, puzzle_page)
+        self.puzzle_page = puzzle_page
+        for y in range(3):
+            for x in range(3):
+                self.draw_3x3_box(x, y)
+        for r in range(9):
+            for c in range(9):
+                self.add_cell(common_bi.calculate_9x9, r, c)
+
+    def add_constraint(self, constraint):
+        """Add a constraint to the puzzle and draw it.
+
+        Args:
+            constraint: the new constraint, e.g. a Cage.
+        """
+        self.puzzle_page.constraints.append(constraint)
+        self.draw_constraint(constraint)
+
+    @abc.abstractmethod
+    def open_constraint_window(self):
+        """Open the window for adding a constraint to the puzzle."""
+
+    @abc.abstractmethod
+    def draw_constraint(self, constraint):
+        """Draw a constraint on the grid.
+
+        Args:
+            constraint: the constraint.
+        """
+
+
 class Standard(Base):
     """The standard puzzle grid."""
 
@@ -258,7 +314,6 @@ class CrossGrid(Base):
         Args:
             puzzle_page: parent frame.
         """
-        start = time.time()
         Base.__init__(self, puzzle_page)
         for y in range(2):
             for x in range(2, 5):
@@ -274,8 +329,6 @@ class CrossGrid(Base):
         for r in range(6, 15):
             for c in range(21):
                 self.add_cell(common_bi.calculate_cross, r, c)
-        end = time.time()
-        print(f"{end - start}")
 
 
 class FlowerGrid(Base):
@@ -459,7 +512,38 @@ class ChainGrid(Base): ...
 class Chain6x6Grid(Base): ...
 
 
-class ConsecutiveGrid(Base): ...
+class ConsecutiveGrid(ConstrainedGrid):
+    """Grid for consecutive sudoku, with its bars drawn between cells."""
+
+    constraint_button_text = "Add Bar"
+
+    def open_constraint_window(self):
+        """Open the window for adding a bar."""
+        ui_cell.ConsecutiveWindow(self.puzzle_page)
+
+    def draw_constraint(self, bar: "common_sv.ConsecutivePair"):
+        """Draw a bar along the middle of the edge between its cells.
+
+        Args:
+            bar: the bar.
+        """
+        (row_1, col_1), (row_2, col_2) = bar.cells
+        x = (col_1 + col_2 + 1) * self.cell_width / 2
+        y = (row_1 + row_2 + 1) * self.cell_width / 2
+        half_length = self.cell_width / 4
+        half_width = 3
+        if row_1 == row_2:
+            half_x, half_y = half_width, half_length
+        else:
+            half_x, half_y = half_length, half_width
+        self.create_rectangle(
+            x - half_x,
+            y - half_y,
+            x + half_x,
+            y + half_y,
+            fill=self.colours["bg0"],
+            outline=self.colours["fg1"],
+        )
 
 
 class EvenOddGrid(Base): ...
@@ -468,22 +552,167 @@ class EvenOddGrid(Base): ...
 class GirandolaGrid(Base): ...
 
 
-class GreaterThanGrid(Base): ...
+class GreaterThanGrid(ConstrainedGrid):
+    """Grid for greater than sudoku, with its signs drawn between cells."""
+
+    constraint_button_text = "Add Sign"
+
+    def open_constraint_window(self):
+        """Open the window for adding a sign."""
+        ui_cell.InequalityWindow(self.puzzle_page)
+
+    def draw_constraint(self, inequality: "common_sv.Inequality"):
+        """Draw a sign on the edge between its cells, open to the greater.
+
+        Args:
+            inequality: the sign.
+        """
+        (g_row, g_col), (l_row, l_col) = inequality.greater, inequality.lesser
+        if g_row == l_row:
+            sign = ">" if g_col < l_col else "<"
+        else:
+            sign = "\u2228" if g_row < l_row else "\u2227"
+        self.create_text(
+            (g_col + l_col + 1) * self.cell_width / 2,
+            (g_row + l_row + 1) * self.cell_width / 2,
+            text=sign,
+            fill=self.colours["fg1"],
+        )
 
 
 class JigsawGrid(Base): ...
 
 
-class KillerGrid(Base): ...
+class KillerGrid(ConstrainedGrid):
+    """Grid for killer sudoku, with its cages drawn over it."""
+
+    constraint_button_text = "Add Cage"
+
+    def open_constraint_window(self):
+        """Open the window for adding a cage."""
+        ui_cell.CageWindow(self.puzzle_page)
 
+    def draw_constraint(self, cage: "common_sv.Cage"):
+        """Draw a dashed outline just inside a cage, with its total.
+
+        Args:
+            cage: the cage.
+        """
+        cells = set(cage.cells)
+        inset = 4
+        for row, col in cells:
+            left = col * self.cell_width + inset
+            right = (col + 1) * self.cell_width - inset
+            top = row * self.cell_width + inset
+            bottom = (row + 1) * self.cell_width - inset
+            edges = (
+                ((row - 1, col), (left, top, right, top)),
+                ((row + 1, col), (left, bottom, right, bottom)),
+                ((row, col - 1), (left, top, left, bottom)),
+                ((row, col + 1), (right, top, right, bottom)),
+            )
+            for neighbour, line in edges:
+                if neighbour not in cells:
+                    self.create_line(
+                        *line, fill=self.colours["fg1"], dash=(3, 3)
+                    )
+        row, col = min(cells)
+        self.create_text(
+            col * self.cell_width + inset + 1,
+            row * self.cell_width + inset,
+            text=str(cage.total),
+            anchor="nw",
+            fill=self.colours["fg1"],
+        )
 
-class LittleKillerGrid(Base): ...
+
+class LittleKillerGrid(ConstrainedGrid):
+    """Grid for little killer sudoku, with the totals of its diagonals.
+
+    Each total is drawn in the corner of the diagonal's first cell that the
+    diagonal enters through, with an arrow along the diagonal.
+    """
+
+    constraint_button_text = "Add Diagonal"
+
+    def open_constraint_window(self):
+        """Open the window for adding a diagonal."""
+        ui_cell.DiagonalWindow(self.puzzle_page)
+
+    def draw_constraint(self, diagonal: "common_sv.Diagonal"):
+        """Draw a diagonal's total and arrow in its first cell.
+
+        Args:
+            diagonal: the diagonal.
+        """
+        (row, col), (row_step, col_step) = diagonal.start, diagonal.direction
+        inset = 4
+        arrow_length = 8
+        # the corner the diagonal enters the cell through
+        x = (col + (col_step < 0)) * self.cell_width - col_step * inset
+        y = (row + (row_step < 0)) * self.cell_width - row_step * inset
+        self.create_text(
+            x,
+            y,
+            text=str(diagonal.total),
+            anchor=("n" if row_step > 0 else "s")
+            + ("w" if col_step > 0 else "e"),
+            fill=self.colours["fg1"],
+        )
+        # the arrow starts past the total, on the side away from the text
+        start_x = x + col_step * 2 * inset
+        start_y = y + row_step * 3 * inset
+        self.create_line(
+            start_x,
+            start_y,
+            start_x + col_step * arrow_length,
+            start_y + row_step * arrow_length,
+            fill=self.colours["fg1"],
+            arrow="last",
+            arrowshape=(4, 5, 2),
+        )
 
 
 class RossiniGrid(Base): ...
 
 
-class SkyscraperGrid(Base): ...
+class SkyscraperGrid(ConstrainedGrid):
+    """Grid for skyscraper sudoku, with its clues at the edges.
+
+    Each clue is drawn in the first cell it looks at, against the edge of
+    the grid it sits beyond.
+    """
+
+    constraint_button_text = "Add Clue"
+
+    # anchor of a clue's text for each direction it looks in
+    anchors: ClassVar[dict[tuple[int, int], str]] = {
+        (1, 0): "n",
+        (-1, 0): "s",
+        (0, 1): "w",
+        (0, -1): "e",
+    }
+
+    def open_constraint_window(self):
+        """Open the window for adding a clue."""
+        ui_cell.SkyscraperWindow(self.puzzle_page)
+
+    def draw_constraint(self, clue: "common_sv.SkyscraperClue"):
+        """Draw a clue's number by the outer edge of its first cell.
+
+        Args:
+            clue: the clue.
+        """
+        (row, col), (row_step, col_step) = clue.start, clue.direction
+        inset = 2
+        offset = self.cell_width / 2 - inset
+        self.create_text(
+            (col + 0.5) * self.cell_width - col_step * offset,
+            (row + 0.5) * self.cell_width - row_step * offset,
+            text=str(clue.visible),
+            anchor=self.anchors[clue.direction],
+            fill=self.colours["fg1"],
+        )
 
 
 class DGGrid(Base): ...
@@ -495,7 +724,31 @@ class MineGrid(Base): ...
 class XGrid(Base): ...
 
 
-class XVGrid(Base): ...
+class XVGrid(ConstrainedGrid):
+    """Grid for sudoku XV, with its marks drawn between cells."""
+
+    constraint_button_text = "Add X or V"
+
+    def open_constraint_window(self):
+        """Open the window for adding a mark."""
+        ui_cell.XVWindow(self.puzzle_page)
+
+    def draw_constraint(self, mark: "common_sv.XVMark"):
+        """Draw a mark's letter on the edge between its cells.
+
+        Args:
+            mark: the mark.
+        """
+        (row_1, col_1), (row_2, col_2) = mark.cells
+        x = (col_1 + col_2 + 1) * self.cell_width / 2
+        y = (row_1 + row_2 + 1) * self.cell_width / 2
+        # a background behind the letter hides the grid line under it
+        self.create_rectangle(
+            x - 6, y - 7, x + 6, y + 7, fill=self.colours["bg1"], width=0
+        )
+        self.create_text(
+            x, y, text=mark.LETTERS[mark.total], fill=self.colours["fg1"]
+        )
 
 
 class SujikenGrid(Base): ...
@@ -6,7 +6,9 @@ from tkinter import ttk
 
 import solvd.common.ui_ctrl as solvd_ui_ctrl
 import solvd.common.ui_elements as solvd_ui_elements
+import solvd.sudoku.common.puzzle_spec as common_ps
 import solvd.sudoku.solving.controller as solving_ctrl
+import solvd.sudoku.solving.solution as solving_sltn
 import solvd.sudoku.ui.cell as ui_cell
 import solvd.sudoku.ui.configure_sudoku as ui_cfg
 import solvd.sudoku.ui.grids as ui_grids
@@ -22,6 +24,17 @@ class PuzzlePage(ttk.Frame):
         specific_cells_solve_again_button: button to solve again with specific cells option.
         grid_frame: frame containing the puzzle grid.
         navigation_buttons: forward (solve) and back buttons.
+        busy_indicator: progress bar shown while a solve is running.
+        cancel_button: button to cancel a running solve.
+        constraints: the clues of a variant other than the cells' values,
+            e.g. the cages of a Killer Sudoku, added through the grid.
+        pb_encoding: encoding of pseudo-boolean constraints, e.g. the sums of
+            Little Killer diagonals (see puzzle_spec.PB_ENCODINGS).
+        constraint_button: button to add a variant's constraints, if it has
+            any.
+        cell_states: states of the cells' entries before a solve locked
+            them.
+        solve_control: control of the running solve, if there is one.
     """
 
     def __init__(self, choices: "ui_cfg.ConfigureSudokuFrame"):
@@ -36,6 +49,8 @@ class PuzzlePage(ttk.Frame):
 
         self.app_window = choices.app_window
         self.chosen_cells = []
+        self.constraints = []
+        self.pb_encoding = common_ps.PB_ENCODINGS[0]
         self.subtype = choices.subtype_choice
         self.type = choices.type_choice
 
@@ -130,6 +145,21 @@ class PuzzlePage(ttk.Frame):
             command=lambda: progress_button_click(),
         )
 
+        self.busy_indicator = ttk.Progressbar(
+            other_buttons_frame,
+            mode="indeterminate",
+            style="Std.Horizontal.TProgressbar",
+        )
+
+        self.cancel_button = ttk.Button(
+            other_buttons_frame,
+            style="Std.TButton",
+            text="Cancel",
+            command=lambda: cancel_button_click(),
+        )
+        self.solve_control = None
+        self.cell_states = []
+
         self.grid_frame = ttk.Frame(self)
         self.grid_frame.grid(column=1, row=1, rowspan=2)
 
@@ -179,6 +209,15 @@ class PuzzlePage(ttk.Frame):
                 self.dimension, grid_class = puzzle_types[self.subtype]
                 self.puzzle_grid = grid_class(self)
         self.puzzle_grid.grid(column=0, row=0)
+        self.constraint_button = None
+        if self.puzzle_grid.constraint_button_text is not None:
+            self.constraint_button = ttk.Button(
+                self.grid_frame,
+                style="Std.TButton",
+                text=self.puzzle_grid.constraint_button_text,
+                command=lambda: self.puzzle_grid.open_constraint_window(),
+            )
+            self.constraint_button.grid(column=0, row=1, pady=10)
 
         self.navigation_buttons = solvd_ui_elements.NavigationButtons(self)
         self.navigation_buttons.grid(row=3, column=0, columnspan=2)
@@ -269,8 +308,54 @@ class PuzzlePage(ttk.Frame):
             )
 
         def solve_button_click():
-            """Solve the puzzle and update UI."""
-            solving_ctrl.solve_sudoku(self)
+            """Start solving the puzzle in the background and show it is busy."""
+            solvd_ui_ctrl.disable_button(self.navigation_buttons.forward_button)
+            self.busy_indicator.grid(row=1, column=0, columnspan=2, pady=10)
+            self.busy_indicator.start()
+            self.cancel_button.grid(row=2, column=0, columnspan=2)
+            instructions.configure(text="Solving...")
+            self.lock_editing()
+            try:
+                self.solve_control = solving_ctrl.solve_sudoku(
+                    self, lambda solution: solve_finished(solution)
+                )
+            except ValueError as error:
+                solve_finished(error)
+
+        def cancel_button_click():
+            """Cancel the running solve."""
+            solvd_ui_ctrl.disable_button(self.cancel_button)
+            self.solve_control.cancel()
+
+        def solve_finished(solution: list | int | Exception):
+            """Update UI once the background solve has finished.
+
+            Args:
+                solution: result of the solve, or the error it raised.
+            """
+            self.busy_indicator.stop()
+            solvd_ui_ctrl.hide_widget(self.busy_indicator)
+            solvd_ui_ctrl.hide_widget(self.cancel_button)
+            solvd_ui_ctrl.enable_button(self.cancel_button)
+            self.unlock_editing()
+            self.enable_solve_button()
+            if isinstance(solution, Exception):
+                instructions.configure(
+                    text=f"This puzzle could not be solved: {solution}"
+                )
+                return
+            if solution == solving_sltn.UNSOLVABLE:
+                instructions.configure(text="This puzzle has no solution.")
+                return
+            if solution == solving_sltn.TIMED_OUT:
+                if self.solve_control.cancelled:
+                    instructions.configure(text="Solving was cancelled.")
+                else:
+                    instructions.configure(
+                        text="Solving took too long and was stopped."
+                    )
+                return
+            instructions.configure(text="Solved.")
             match solve_option.get():
                 case "all":
                     for cell in self.puzzle_grid.cells:
@@ -313,3 +398,20 @@ class PuzzlePage(ttk.Frame):
     def enable_solve_button(self):
         """Enable the solve button."""
         solvd_ui_ctrl.enable_button(self.navigation_buttons.forward_button)
+
+    def lock_editing(self):
+        """Stop the cells and constraints being changed while solving."""
+        self.cell_states = [
+            str(cell.cell_text["state"]) for cell in self.puzzle_grid.cells
+        ]
+        for cell in self.puzzle_grid.cells:
+            cell.cell_text.configure(state="disabled")
+        if self.constraint_button is not None:
+            solvd_ui_ctrl.disable_button(self.constraint_button)
+
+    def unlock_editing(self):
+        """Let the cells and constraints be changed again after solving."""
+        for cell, state in zip(self.puzzle_grid.cells, self.cell_states):
+            cell.cell_text.configure(state=state)
+        if self.constraint_button is not None:
+            solvd_ui_ctrl.enable_button(self.constraint_button)
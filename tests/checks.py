@@ -0,0 +1,108 @@
+"""Helpers shared by the tests: checking solutions and making solved grids."""
+
+import random
+
+import solvd.sudoku.common.puzzle_spec as common_ps
+import solvd.sudoku.solving.fixtures as solving_fixtures
+import solvd.sudoku.solving.headless as solving_headless
+import solvd.sudoku.solving.solution as solving_sltn
+
+
+def assert_valid(
+    spec: common_ps.PuzzleSpec,
+    grid: list[list[int]],
+    solution: list[list[int]] | int,
+):
+    """Check that a solution keeps a puzzle's clues and follows its rules.
+
+    The rules are checked by evaluating the puzzle's clauses which only
+    mention cells, without a solver. Groups too large for pairwise clauses
+    use auxiliary variables, so the rows, columns and boxes of standard
+    sudoku are also checked directly.
+
+    Args:
+        spec: the puzzle's layout.
+        grid: rows of the puzzle, with 0 for empty cells.
+        solution: rows of the solved puzzle.
+    """
+    assert not isinstance(solution, int), f"not solved: {solution}"
+    cells = spec.cells()
+    for row, col, _ in cells:
+        assert 1 <= solution[row][col] <= spec.max_num
+        if grid[row][col] != 0:
+            assert solution[row][col] == grid[row][col]
+    true_literals = {
+        solving_sltn.encode_literal(
+            solution[row][col], row, col, spec.dimension
+        )
+        for row, col, _ in cells
+    }
+    _, all_vars = solving_headless.grid_to_vars(
+        spec, solving_headless.blank_grid(spec)
+    )
+    first_auxiliary = solving_sltn.first_auxiliary(spec.dimension)
+    for clause in solving_sltn.make_puzzle_clauses(all_vars, spec):
+        if any(abs(literal) >= first_auxiliary for literal in clause):
+            continue
+        assert any(
+            (literal in true_literals) == (literal > 0) for literal in clause
+        ), f"clause {clause} not satisfied"
+    if spec.type == "standard":
+        groups = {}
+        for row, col, box in cells:
+            for group in (("row", row), ("col", col), ("box", box)):
+                groups.setdefault(group, []).append(solution[row][col])
+        for group, values in groups.items():
+            assert len(set(values)) == spec.dimension, f"{group} repeats"
+
+
+def random_solution(rng: random.Random) -> list[list[int]]:
+    """Make a random solved 9 x 9 grid.
+
+    The solution of a corpus puzzle is rearranged by a random symmetry:
+    relabelling the numbers, reordering bands and stacks and the rows and
+    columns within them, and transposing.
+
+    Args:
+        rng: the source of randomness.
+
+    Returns:
+        rows of the solved grid.
+    """
+    spec = common_ps.PuzzleSpec("9 x 9")
+    _, _, grid, _ = rng.choice(solving_fixtures.load("9 x 9", ["hard"]))
+    solution = solving_headless.solve_grid(spec, grid)
+    labels = [0, *rng.sample(range(1, 10), 9)]
+    rows = [
+        band * 3 + row
+        for band in rng.sample(range(3), 3)
+        for row in rng.sample(range(3), 3)
+    ]
+    cols = [
+        stack * 3 + col
+        for stack in rng.sample(range(3), 3)
+        for col in rng.sample(range(3), 3)
+    ]
+    solution = [[labels[solution[row][col]] for col in cols] for row in rows]
+    if rng.random() < 0.5:
+        solution = [list(col) for col in zip(*solution)]
+    return solution
+
+
+def some_clues(
+    rng: random.Random, solution: list[list[int]], fraction: float
+) -> list[list[int]]:
+    """Keep a random part of a solved grid as clues.
+
+    Args:
+        rng: the source of randomness.
+        solution: rows of the solved grid.
+        fraction: chance of each cell being kept.
+
+    Returns:
+        rows of the puzzle, with 0 for empty cells.
+    """
+    return [
+        [value if rng.random() < fraction else 0 for value in row]
+        for row in solution
+    ]
@@ -0,0 +1,58 @@
+import asyncio
+import concurrent.futures
+import time
+
+import pytest
+
+import solvd.sudoku.common.puzzle_spec as common_ps
+import solvd.sudoku.solving.async_api as solving_async
+import solvd.sudoku.solving.fixtures as solving_fixtures
+import solvd.sudoku.solving.headless as solving_headless
+import solvd.sudoku.solving.solution as solving_sltn
+import solvd.sudoku.solving.stats as solving_stats
+from tests import checks
+
+
+def test_solve_many_keeps_order():
+    fixtures = [
+        (subtype, grade, grid)
+        for subtype in ("9 x 9", "6 x 6 (wide boxes)", "Samurai Sudoku")
+        for grade, _, grid, _ in solving_fixtures.load(
+            subtype, ("hard", "unsolvable")
+        )
+    ]
+    puzzles = [(subtype, grid) for subtype, _, grid in fixtures]
+    stats = solving_stats.SubtypeStats()
+    solutions = asyncio.run(
+        solving_async.solve_many(puzzles, max_concurrent=2, stats=stats)
+    )
+    assert len(solutions) == len(puzzles)
+    for (subtype, grade, grid), solution in zip(fixtures, solutions):
+        if grade == "unsolvable":
+            assert solution == solving_sltn.UNSOLVABLE
+        else:
+            checks.assert_valid(common_ps.PuzzleSpec(subtype), grid, solution)
+    summary = stats.summary()
+    assert sorted(summary) == ["6 x 6 (wide boxes)", "9 x 9", "Samurai Sudoku"]
+    assert sum(entry["solves"] for entry in summary.values()) == len(puzzles)
+
+
+def test_cancelling_the_task_stops_the_solve():
+    # a blank 25 x 25 takes minutes to search
+    spec = common_ps.PuzzleSpec("25 x 25")
+    grid = solving_headless.blank_grid(spec)
+
+    async def cancel_solve(executor):
+        task = asyncio.create_task(
+            solving_async.solve("25 x 25", grid, executor=executor)
+        )
+        await asyncio.sleep(0.5)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+    with concurrent.futures.ThreadPoolExecutor(1) as executor:
+        asyncio.run(cancel_solve(executor))
+        start = time.perf_counter()
+    # leaving the with block waits for the worker thread
+    assert time.perf_counter() - start < 30
@@ -0,0 +1,12 @@
+import numpy as np
+
+import solvd.sudoku.solving.batch as solving_batch
+
+
+def test_count_bits_matches_int_bit_count():
+    rng = np.random.default_rng(0)
+    # up to 36 bits, the widest candidate masks
+    masks = rng.integers(0, 1 << 36, size=1000, dtype=np.int64)
+    masks[:3] = (0, 1, (1 << 36) - 1)
+    expected = [int(mask).bit_count() for mask in masks]
+    assert solving_batch.count_bits(masks).tolist() == expected
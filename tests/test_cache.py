@@ -0,0 +1,72 @@
+import solvd.sudoku.common.puzzle_spec as common_ps
+import solvd.sudoku.solving.cache as solving_cache
+import solvd.sudoku.solving.fixtures as solving_fixtures
+import solvd.sudoku.solving.solution as solving_sltn
+from tests import checks
+
+SOLUTION = [[1, 2], [2, 1]]
+
+
+def test_hit_and_miss():
+    cache = solving_cache.SolutionCache()
+    assert cache.get("a") is None
+    cache.put("a", SOLUTION)
+    cache.put("b", solving_sltn.UNSOLVABLE)
+    assert cache.get("a") == SOLUTION
+    assert cache.get("b") == solving_sltn.UNSOLVABLE
+    assert cache.stats() == {"hits": 2, "misses": 1, "entries": 2}
+
+
+def test_timed_out_is_not_cached():
+    cache = solving_cache.SolutionCache()
+    cache.put("a", solving_sltn.TIMED_OUT)
+    assert cache.get("a") is None
+
+
+def test_evicts_least_recently_used():
+    cache = solving_cache.SolutionCache(max_entries=2)
+    cache.put("a", SOLUTION)
+    cache.put("b", SOLUTION)
+    cache.get("a")
+    cache.put("c", SOLUTION)
+    assert cache.get("b") is None
+    assert cache.get("a") == SOLUTION
+    assert cache.get("c") == SOLUTION
+    assert cache.stats()["entries"] == 2
+
+
+def test_returns_copies():
+    cache = solving_cache.SolutionCache()
+    solution = [row[:] for row in SOLUTION]
+    cache.put("a", solution)
+    solution[0][0] = 0
+    found = cache.get("a")
+    assert found == SOLUTION
+    found[0][0] = 0
+    assert cache.get("a") == SOLUTION
+
+
+def test_file_outlives_the_cache(tmp_path):
+    path = str(tmp_path / "solutions.sqlite")
+    cache = solving_cache.SolutionCache(path=path, max_disk_entries=2)
+    for key in ("a", "b", "c"):
+        cache.put(key, SOLUTION)
+    cache.close()
+
+    reopened = solving_cache.SolutionCache(path=path)
+    assert reopened.get("a") is None
+    assert reopened.get("c") == SOLUTION
+    reopened.get("c")[0][0] = 0
+    assert reopened.get("c") == SOLUTION
+    reopened.close()
+
+
+def test_solve_hits_for_equivalent_puzzles():
+    spec = common_ps.PuzzleSpec("9 x 9")
+    cache = solving_cache.SolutionCache()
+    for _, _, grid, _ in solving_fixtures.load("9 x 9", ("hard",)):
+        checks.assert_valid(spec, grid, cache.solve(spec, grid))
+        transposed = [list(col) for col in zip(*grid)]
+        checks.assert_valid(spec, transposed, cache.solve(spec, transposed))
+    stats = cache.stats()
+    assert stats["hits"] == stats["misses"] == stats["entries"]
@@ -0,0 +1,66 @@
+import threading
+
+import solvd.sudoku.common.puzzle_spec as common_ps
+import solvd.sudoku.solving.headless as solving_headless
+import solvd.sudoku.solving.solution as solving_sltn
+from tests import checks
+
+
+def test_no_limits_solves():
+    spec = common_ps.PuzzleSpec("9 x 9")
+    grid = solving_headless.blank_grid(spec)
+    control = solving_sltn.SolveControl()
+    solution = solving_headless.solve_grid(spec, grid, control)
+    checks.assert_valid(spec, grid, solution)
+    assert not control.timed_out
+    assert control.stats["conflicts"] > 0
+
+
+def test_cancelled_before_solving():
+    spec = common_ps.PuzzleSpec("9 x 9")
+    control = solving_sltn.SolveControl()
+    control.cancel()
+    grid = solving_headless.blank_grid(spec)
+    assert (
+        solving_headless.solve_grid(spec, grid, control)
+        == solving_sltn.TIMED_OUT
+    )
+
+
+def test_cancelled_while_solving():
+    # a blank 25 x 25 takes seconds to search
+    spec = common_ps.PuzzleSpec("25 x 25")
+    control = solving_sltn.SolveControl()
+    cancel = threading.Timer(0.5, control.cancel)
+    cancel.start()
+    try:
+        grid = solving_headless.blank_grid(spec)
+        solution = solving_headless.solve_grid(spec, grid, control)
+    finally:
+        cancel.cancel()
+    assert solution == solving_sltn.TIMED_OUT
+    assert control.cancelled
+    assert not control.timed_out
+
+
+def test_time_limit():
+    spec = common_ps.PuzzleSpec("25 x 25")
+    control = solving_sltn.SolveControl(time_limit=0.1)
+    grid = solving_headless.blank_grid(spec)
+    assert (
+        solving_headless.solve_grid(spec, grid, control)
+        == solving_sltn.TIMED_OUT
+    )
+    assert control.timed_out
+
+
+def test_conflict_limit():
+    # a blank 9 x 9 needs thousands of conflicts
+    spec = common_ps.PuzzleSpec("9 x 9")
+    control = solving_sltn.SolveControl(conflict_limit=10)
+    grid = solving_headless.blank_grid(spec)
+    assert (
+        solving_headless.solve_grid(spec, grid, control)
+        == solving_sltn.TIMED_OUT
+    )
+    assert not control.timed_out
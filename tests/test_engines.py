@@ -0,0 +1,57 @@
+import pytest
+
+import solvd.sudoku.common.puzzle_spec as common_ps
+import solvd.sudoku.solving.batch as solving_batch
+import solvd.sudoku.solving.bitboard as solving_bitboard
+import solvd.sudoku.solving.fixtures as solving_fixtures
+import solvd.sudoku.solving.headless as solving_headless
+import solvd.sudoku.solving.solution as solving_sltn
+from tests import checks
+
+ENGINES = (*solving_headless.ENGINES, "batch")
+
+# a blank 16 x 16 grid takes about a minute for the engines using Glucose
+PUZZLES = [
+    (subtype, grade, name, grid, constraints)
+    for subtype in solving_fixtures.SUBTYPES
+    for grade, name, grid, constraints in solving_fixtures.load(subtype)
+    if (subtype, grade) != ("16 x 16", "blank")
+]
+
+
+def handles(engine: str, spec: common_ps.PuzzleSpec) -> bool:
+    match engine:
+        case "bitboard":
+            return solving_bitboard.can_solve(spec)
+        case "batch":
+            return spec.type == "standard"
+        case _:
+            return True
+
+
+CASES = [
+    (engine, *puzzle)
+    for engine in ENGINES
+    for puzzle in PUZZLES
+    if handles(engine, common_ps.PuzzleSpec(puzzle[0]))
+]
+
+
+@pytest.mark.parametrize(
+    ("engine", "subtype", "grade", "name", "grid", "constraints"),
+    CASES,
+    ids=[
+        f"{engine}-{subtype}-{grade}-{name}"
+        for engine, subtype, grade, name, _, _ in CASES
+    ],
+)
+def test_engine_solves_corpus(engine, subtype, grade, name, grid, constraints):
+    spec = common_ps.PuzzleSpec(subtype, constraints)
+    if engine == "batch":
+        [solution] = solving_batch.solve_batch(spec, [grid])
+    else:
+        solution = solving_headless.solve_grid(spec, grid, engine=engine)
+    if grade == "unsolvable":
+        assert solution == solving_sltn.UNSOLVABLE
+    else:
+        checks.assert_valid(spec, grid, solution)
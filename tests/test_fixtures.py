@@ -0,0 +1,40 @@
+import pytest
+
+import solvd.sudoku.common.puzzle_spec as common_ps
+import solvd.sudoku.solving.fixtures as solving_fixtures
+
+
+@pytest.mark.parametrize("subtype", solving_fixtures.SUBTYPES)
+def test_corpus_round_trips(subtype):
+    spec = common_ps.PuzzleSpec(subtype)
+    puzzles = solving_fixtures.load(subtype)
+    assert puzzles
+    for _, _, grid, constraints in puzzles:
+        assert len(grid) == spec.dimension
+        cells = solving_fixtures.format_grid(grid)
+        assert solving_fixtures.parse_grid(cells, spec.dimension) == grid
+        for constraint in constraints:
+            text = solving_fixtures.format_constraint(constraint)
+            assert str(solving_fixtures.parse_constraint(text)) == str(
+                constraint
+            )
+        # only variants have constraints
+        assert bool(constraints) == (spec.type == "variant")
+
+
+@pytest.mark.parametrize(
+    "text",
+    [
+        "cage:10",
+        "cage:10,0,0,0",
+        "diagonal:0,1,1,1",
+        "inequality:0,0,0,x",
+        "xv:0,0,0,1",
+        "skyscraper:0,0,1,0,2,3",
+        "sum:1,2,3",
+        "cage",
+    ],
+)
+def test_parse_constraint_rejects(text):
+    with pytest.raises(ValueError):
+        solving_fixtures.parse_constraint(text)
@@ -0,0 +1,108 @@
+import pysat.solvers
+import pytest
+
+import solvd.sudoku.common.puzzle_spec as common_ps
+import solvd.sudoku.solving.fixtures as solving_fixtures
+import solvd.sudoku.solving.headless as solving_headless
+import solvd.sudoku.solving.preprocess as solving_preprocess
+import solvd.sudoku.solving.solution as solving_sltn
+
+PUZZLES = [
+    (subtype, grade, name, grid)
+    for subtype, grades in (
+        ("4 x 4", solving_fixtures.GRADES),
+        ("6 x 6 (wide boxes)", ("trivial", "easy", "hard")),
+        ("6 x 6 (tall boxes)", ("trivial", "easy", "hard")),
+        ("9 x 9", ("hard", "unsolvable")),
+    )
+    for grade, name, grid, _ in solving_fixtures.load(subtype, grades)
+]
+
+
+def puzzle_clauses(
+    spec: common_ps.PuzzleSpec, grid: list[list[int]]
+) -> list[list[int]]:
+    known_vars, all_vars = solving_headless.grid_to_vars(spec, grid)
+    return solving_sltn.make_known_value_clauses(
+        known_vars, spec.dimension
+    ) + solving_sltn.make_puzzle_clauses(all_vars, spec)
+
+
+def all_solutions(
+    clauses: list[list[int]], is_cell, to_cells
+) -> set[frozenset[int]]:
+    """Enumerate the cell assignments of every model of a formula.
+
+    Args:
+        clauses: the formula.
+        is_cell: whether a variable of the formula is a cell's variable.
+        to_cells: the true cell variables of a model.
+
+    Returns:
+        the true cell variables of each model.
+    """
+    solutions = set()
+    with pysat.solvers.Glucose3(bootstrap_with=clauses) as sat_solver:
+        while sat_solver.solve():
+            model = sat_solver.get_model()
+            solutions.add(frozenset(to_cells(model)))
+            # every cell has exactly one number, so blocking the true cell
+            # variables blocks this assignment whatever the other variables
+            sat_solver.add_clause(
+                [
+                    -literal
+                    for literal in model
+                    if literal > 0 and is_cell(literal)
+                ]
+            )
+    return solutions
+
+
+@pytest.mark.parametrize(
+    ("subtype", "grade", "name", "grid"),
+    PUZZLES,
+    ids=[f"{subtype}-{grade}-{name}" for subtype, grade, name, _ in PUZZLES],
+)
+def test_simplify_keeps_solutions(subtype, grade, name, grid):
+    spec = common_ps.PuzzleSpec(subtype)
+    clauses = puzzle_clauses(spec, grid)
+    first_auxiliary = solving_sltn.first_auxiliary(spec.dimension)
+    before = all_solutions(
+        clauses,
+        lambda var: var < first_auxiliary,
+        lambda model: [lit for lit in model if 0 < lit < first_auxiliary],
+    )
+
+    formula = solving_preprocess.simplify(clauses)
+    if formula.unsatisfiable:
+        after = set()
+    else:
+        after = all_solutions(
+            formula.clauses,
+            lambda var: formula.variables[var - 1] < first_auxiliary,
+            lambda model: [
+                var
+                for var in formula.true_variables(model)
+                if var < first_auxiliary
+            ],
+        )
+
+    assert after == before
+    if grade == "unsolvable":
+        assert not before
+    elif grade == "blank" and subtype == "4 x 4":
+        assert len(before) == 288
+    else:
+        assert len(before) == 1
+
+
+def test_simplify_without_clauses():
+    formula = solving_preprocess.simplify([])
+    assert formula.clauses == []
+    assert not formula.unsatisfiable
+
+
+def test_simplify_contradiction():
+    formula = solving_preprocess.simplify([[1], [-1, 2], [-2]])
+    assert formula.unsatisfiable
+    assert formula.clauses == [[]]
@@ -0,0 +1,80 @@
+import os
+import pstats
+
+import pytest
+
+import solvd.sudoku.common.puzzle_spec as common_ps
+import solvd.sudoku.solving.fixtures as solving_fixtures
+import solvd.sudoku.solving.headless as solving_headless
+import solvd.sudoku.solving.profiling as solving_profiling
+import solvd.sudoku.solving.timing as solving_timing
+
+STAGES = ("clauses", "preprocess", "load", "solve", "decode")
+
+
+@pytest.fixture
+def profile_dir(tmp_path):
+    """Profile with both tools into a temporary directory."""
+    solving_profiling.enable(tmp_path)
+    try:
+        yield tmp_path
+    finally:
+        solving_profiling.disable()
+
+
+def solve(subtype: str):
+    _, _, grid, _ = solving_fixtures.load(subtype, ("hard",))[0]
+    solving_headless.solve_grid(common_ps.PuzzleSpec(subtype), grid)
+
+
+def test_writes_a_profile_per_stage(profile_dir):
+    # tracemalloc's snapshots take a while, so only one small puzzle
+    solve("4 x 4")
+    pid = os.getpid()
+    for stage in STAGES:
+        prof = profile_dir / f"4-x-4-{pid}-{stage}.prof"
+        assert pstats.Stats(str(prof)).total_calls > 0
+        alloc = profile_dir / f"4-x-4-{pid}-{stage}.alloc.txt"
+        assert alloc.read_text().startswith(f"4 x 4: {stage}\n")
+    report = (profile_dir / f"4-x-4-{pid}-clauses.alloc.txt").read_text()
+    assert report.splitlines()[1] == "runs: 1"
+
+
+def test_adds_up_the_solves_of_a_subtype(tmp_path):
+    solving_profiling.enable(tmp_path, ("cprofile",))
+    try:
+        prof = tmp_path / f"9-x-9-{os.getpid()}-clauses.prof"
+        solve("9 x 9")
+        once = pstats.Stats(str(prof)).total_calls
+        solve("9 x 9")
+        twice = pstats.Stats(str(prof)).total_calls
+        solve("Samurai Sudoku")
+        assert pstats.Stats(str(prof)).total_calls == twice
+    finally:
+        solving_profiling.disable()
+    assert twice == 2 * once
+
+
+def test_chosen_tools_only(tmp_path):
+    solving_profiling.enable(tmp_path, ("cprofile",))
+    try:
+        solve("4 x 4")
+    finally:
+        solving_profiling.disable()
+    names = {path.name for path in tmp_path.iterdir()}
+    assert names
+    assert all(name.endswith(".prof") for name in names)
+
+
+def test_disable_restores_timing(tmp_path):
+    solving_profiling.enable(tmp_path)
+    assert solving_timing.timer_class is solving_profiling.ProfilingTimer
+    solving_profiling.disable()
+    assert solving_timing.timer_class is solving_timing.SolveTimer
+    assert not solving_profiling.profiles
+    assert not solving_profiling.allocations
+
+
+def test_unknown_tool(tmp_path):
+    with pytest.raises(ValueError):
+        solving_profiling.enable(tmp_path, ("perf",))
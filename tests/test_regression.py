@@ -0,0 +1,119 @@
+import copy
+import json
+
+import pytest
+
+import solvd.sudoku.solving.regression as solving_regression
+
+
+def make_result(subtype, name, clauses, solve, pb_encoding=None):
+    result = {
+        "subtype": subtype,
+        "grade": "hard",
+        "name": name,
+        "stages": {
+            "clauses": {"min": clauses},
+            "solve": {"min": solve},
+        },
+    }
+    if pb_encoding is not None:
+        result["pb_encoding"] = pb_encoding
+    return result
+
+
+BASELINE = {
+    "engine": "glucose",
+    "revision": "abc1234",
+    "results": [
+        make_result("9 x 9", "one", 0.010, 0.020),
+        make_result("9 x 9", "two", 0.010, 0.001),
+        make_result("Little Killer Sudoku", "three", 0.1, 0.5, "bdd"),
+    ],
+}
+TOLERANCES = {"clauses": 0.25, "solve": 0.25}
+
+
+def test_compare_finds_slower_stages():
+    current = copy.deepcopy(BASELINE)
+    # 50% slower and by more than the minimum difference
+    current["results"][0]["stages"]["solve"]["min"] = 0.030
+    # 100% slower, but by less than the minimum difference
+    current["results"][1]["stages"]["solve"]["min"] = 0.002
+    # within the tolerance
+    current["results"][2]["stages"]["clauses"]["min"] = 0.12
+    regressions = solving_regression.compare(
+        BASELINE, current, TOLERANCES, 0.005
+    )
+    assert regressions == [
+        {
+            "subtype": "9 x 9",
+            "grade": "hard",
+            "name": "one",
+            "pb_encoding": None,
+            "stage": "solve",
+            "baseline": 0.020,
+            "current": 0.030,
+            "change": pytest.approx(0.5),
+        }
+    ]
+
+
+def test_same_results_match():
+    assert solving_regression.mismatches(BASELINE, BASELINE) == []
+    assert solving_regression.compare(BASELINE, BASELINE, TOLERANCES, 0) == []
+
+
+def test_mismatches():
+    current = copy.deepcopy(BASELINE)
+    current["engine"] = "cubes"
+    del current["results"][0]
+    current["results"].append(make_result("9 x 9", "four", 0.01, 0.01))
+    current["results"][1]["pb_encoding"] = "adder"
+    assert solving_regression.mismatches(BASELINE, current) == [
+        "engine cubes differs from the baseline's glucose",
+        "9 x 9 hard one is missing from the current results",
+        "Little Killer Sudoku hard three (bdd) is missing from the current "
+        "results",
+        "Little Killer Sudoku hard three (adder) is missing from the baseline",
+        "9 x 9 hard four is missing from the baseline",
+    ]
+
+
+def test_parse_tolerances():
+    assert solving_regression.parse_tolerances(
+        0.25, ["solve=0.5"], ["clauses", "solve"]
+    ) == {"clauses": 0.25, "solve": 0.5}
+    with pytest.raises(ValueError):
+        solving_regression.parse_tolerances(0.25, ["load=0.5"], ["solve"])
+
+
+def run_gate(tmp_path, current: dict) -> int:
+    baseline_path = tmp_path / "baseline.json"
+    current_path = tmp_path / "current.json"
+    baseline_path.write_text(json.dumps(BASELINE))
+    current_path.write_text(json.dumps(current))
+    try:
+        solving_regression.main(
+            ["--baseline", str(baseline_path), "--current", str(current_path)]
+        )
+    except SystemExit as error:
+        return error.code
+    return 0
+
+
+def test_gate(tmp_path, capsys):
+    assert run_gate(tmp_path, BASELINE) == 0
+    assert "No regressions" in capsys.readouterr().out
+
+    current = copy.deepcopy(BASELINE)
+    current["engine"] = "bitboard"
+    assert run_gate(tmp_path, current) == 1
+    assert "MISMATCH engine bitboard" in capsys.readouterr().out
+
+    current = copy.deepcopy(BASELINE)
+    current["results"][2]["stages"]["solve"]["min"] = 1.0
+    assert run_gate(tmp_path, current) == 1
+    assert (
+        "REGRESSION Little Killer Sudoku hard three (bdd) solve"
+        in capsys.readouterr().out
+    )
@@ -0,0 +1,112 @@
+import json
+import threading
+import urllib.error
+import urllib.request
+
+import pytest
+
+import solvd.sudoku.common.puzzle_spec as common_ps
+import solvd.sudoku.solving.cache as solving_cache
+import solvd.sudoku.solving.fixtures as solving_fixtures
+import solvd.sudoku.solving.server as solving_server
+from tests import checks
+
+BLANK = [[0] * 9 for _ in range(9)]
+
+
+def body(**request) -> bytes:
+    return json.dumps(request).encode()
+
+
+def test_parse_request():
+    request = body(
+        subtype="9 x 9", grid=BLANK, time_limit=2.5, conflict_limit=1000
+    )
+    assert solving_server.parse_request(request) == (
+        "9 x 9",
+        BLANK,
+        2.5,
+        1000,
+    )
+    assert solving_server.parse_request(body(subtype="9 x 9", grid=BLANK))[
+        2:
+    ] == (None, None)
+
+
+@pytest.mark.parametrize(
+    ("request_body", "error"),
+    [
+        (b"not json", json.JSONDecodeError),
+        (body(), TypeError),
+        (b"[1, 2]", TypeError),
+        (body(subtype=9, grid=BLANK), TypeError),
+        (body(subtype="Nonsense", grid=BLANK), ValueError),
+        # variants need constraints, which requests cannot carry
+        (body(subtype="Killer Sudoku", grid=BLANK), ValueError),
+        # stubs and multidoku without a layout
+        (body(subtype="Argyle Sudoku", grid=BLANK), ValueError),
+        (body(subtype="Twodoku", grid=BLANK), ValueError),
+        (body(subtype="9 x 9", grid=BLANK[:8]), ValueError),
+        (body(subtype="9 x 9", grid=[[10] * 9] * 9), ValueError),
+        (body(subtype="9 x 9", grid=[[True] * 9] * 9), ValueError),
+        (body(subtype="9 x 9", grid=BLANK, time_limit=-1), ValueError),
+        (body(subtype="9 x 9", grid=BLANK, time_limit=True), ValueError),
+        (body(subtype="9 x 9", grid=BLANK, time_limit="5"), ValueError),
+        (body(subtype="9 x 9", grid=BLANK, conflict_limit=10.5), ValueError),
+    ],
+)
+def test_parse_request_rejects(request_body, error):
+    with pytest.raises(error):
+        solving_server.parse_request(request_body)
+
+
+@pytest.fixture(scope="module")
+def url():
+    cache = solving_cache.SolutionCache(16)
+    server = solving_server.SolvingServer(("127.0.0.1", 0), 1, [], cache)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}/solve"
+    server.shutdown()
+    server.server_close()
+
+
+def post(url: str, data: bytes) -> tuple[int, dict]:
+    request = urllib.request.Request(url, data=data)
+    try:
+        with urllib.request.urlopen(request) as response:
+            return response.status, json.load(response)
+    except urllib.error.HTTPError as error:
+        return error.code, json.load(error)
+
+
+def test_service_solves_and_caches(url):
+    spec = common_ps.PuzzleSpec("9 x 9")
+    _, _, grid, _ = solving_fixtures.load("9 x 9", ["hard"])[0]
+    status, response = post(url, body(subtype="9 x 9", grid=grid))
+    assert status == 200
+    assert response["status"] == "solved"
+    assert not response["cached"]
+    checks.assert_valid(spec, grid, response["solution"])
+
+    # the same puzzle with the numbers relabelled shares the cache entry
+    relabelled = [
+        [(value % 9) + 1 if value else 0 for value in row] for row in grid
+    ]
+    status, response = post(url, body(subtype="9 x 9", grid=relabelled))
+    assert status == 200
+    assert response["cached"]
+    checks.assert_valid(spec, relabelled, response["solution"])
+
+
+def test_service_reports_bad_requests(url):
+    status, response = post(url, body(subtype="Killer Sudoku", grid=BLANK))
+    assert status == 400
+    assert "constraints" in response["error"]
+
+
+def test_service_reports_unsolvable(url):
+    _, _, grid, _ = solving_fixtures.load("9 x 9", ["unsolvable"])[0]
+    status, response = post(url, body(subtype="9 x 9", grid=grid))
+    assert (status, response["status"]) == (200, "unsolvable")
+    assert "solution" not in response
@@ -0,0 +1,96 @@
+import threading
+
+import pysat.solvers
+import pytest
+
+import solvd.sudoku.common.puzzle_spec as common_ps
+import solvd.sudoku.solving.fixtures as solving_fixtures
+import solvd.sudoku.solving.headless as solving_headless
+import solvd.sudoku.solving.solution as solving_sltn
+import solvd.sudoku.solving.stats as solving_stats
+
+
+def test_formula_stats():
+    clauses = [[1, -2], [2, 3, -1], [-3], [5]]
+    assert solving_stats.formula_stats(clauses) == {
+        "variables": 4,
+        "clauses": 4,
+        "literals": 7,
+    }
+    assert solving_stats.formula_stats([]) == {
+        "variables": 0,
+        "clauses": 0,
+        "literals": 0,
+    }
+
+
+def test_search_stats_counts_only_the_last_search():
+    _, _, grid, _ = solving_fixtures.load("9 x 9", ("hard",))[1]
+    spec = common_ps.PuzzleSpec("9 x 9")
+    known_vars, all_vars = solving_headless.grid_to_vars(spec, grid)
+    clauses = solving_sltn.make_known_value_clauses(
+        known_vars, spec.dimension
+    ) + solving_sltn.make_puzzle_clauses(all_vars, spec)
+    with pysat.solvers.Glucose3(bootstrap_with=clauses) as sat_solver:
+        before = sat_solver.accum_stats()
+        sat_solver.solve()
+        first = solving_stats.search_stats(sat_solver, before)
+        assert set(first) == set(solving_stats.SEARCH_STATS)
+        assert first["conflicts"] > 0
+        assert first["propagations"] > 0
+        # solving again finds the model without searching from scratch
+        before = sat_solver.accum_stats()
+        sat_solver.solve()
+        second = solving_stats.search_stats(sat_solver, before)
+        assert second["conflicts"] < first["conflicts"]
+
+
+@pytest.mark.parametrize("engine", solving_headless.ENGINES)
+def test_solve_records_stats(engine):
+    _, _, grid, _ = solving_fixtures.load("9 x 9", ("hard",))[1]
+    spec = common_ps.PuzzleSpec("9 x 9")
+    control = solving_sltn.SolveControl()
+    solving_headless.solve_grid(spec, grid, control, engine)
+    if engine == "bitboard":
+        # a backtracking search has no restarts
+        assert {"conflicts", "decisions", "propagations"} <= set(control.stats)
+    else:
+        assert set(solving_stats.SEARCH_STATS) <= set(control.stats)
+        # after unit propagation, at most every cell's value is left open
+        assert 0 < control.stats["variables"] <= spec.dimension**3
+
+
+def test_subtype_stats():
+    stats = solving_stats.SubtypeStats()
+    stats.add("9 x 9", {"conflicts": 2, "decisions": 5})
+    stats.add("9 x 9", {"conflicts": 4, "decisions": 1})
+    stats.add("9 x 9", {})
+    stats.add("4 x 4", {"conflicts": 1})
+    assert stats.summary() == {
+        "9 x 9": {
+            "solves": 2,
+            "total": {"conflicts": 6, "decisions": 6},
+            "mean": {"conflicts": 3, "decisions": 3},
+        },
+        "4 x 4": {
+            "solves": 1,
+            "total": {"conflicts": 1},
+            "mean": {"conflicts": 1},
+        },
+    }
+
+
+def test_subtype_stats_from_many_threads():
+    stats = solving_stats.SubtypeStats()
+
+    def add():
+        for _ in range(1000):
+            stats.add("9 x 9", {"conflicts": 1})
+
+    threads = [threading.Thread(target=add) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    summary = stats.summary()["9 x 9"]
+    assert summary["solves"] == summary["total"]["conflicts"] == 4000
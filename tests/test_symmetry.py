@@ -0,0 +1,78 @@
+import random
+
+import pytest
+
+import solvd.sudoku.common.puzzle_spec as common_ps
+import solvd.sudoku.solving.fixtures as solving_fixtures
+import solvd.sudoku.solving.headless as solving_headless
+import solvd.sudoku.solving.solution as solving_sltn
+import solvd.sudoku.solving.symmetry as solving_symmetry
+from tests import checks
+
+SUBTYPES = [
+    subtype
+    for subtype in solving_fixtures.SUBTYPES
+    if common_ps.PuzzleSpec(subtype).type == "multidoku"
+    or common_ps.PuzzleSpec(subtype).type == "standard"
+    and common_ps.PuzzleSpec(subtype).dimension <= 16
+]
+PUZZLES = [
+    (subtype, grade, name, grid)
+    for subtype in SUBTYPES
+    for grade, name, grid, _ in solving_fixtures.load(
+        subtype, ("trivial", "hard", "unsolvable")
+    )
+]
+
+
+@pytest.mark.parametrize(
+    ("subtype", "grade", "name", "grid"),
+    PUZZLES,
+    ids=[f"{subtype}-{grade}-{name}" for subtype, grade, name, _ in PUZZLES],
+)
+def test_canonicalise_round_trip(subtype, grade, name, grid):
+    spec = common_ps.PuzzleSpec(subtype)
+    canonical, transform = solving_symmetry.canonicalise(spec, grid)
+    assert transform.apply(grid) == canonical
+    assert transform.undo(canonical) == grid
+
+    solution = transform.undo(solving_headless.solve_grid(spec, canonical))
+    if grade == "unsolvable":
+        assert solution == solving_sltn.UNSOLVABLE
+    else:
+        checks.assert_valid(spec, grid, solution)
+
+
+SQUARE_BOXES = {"9 x 9": 3, "16 x 16": 4, "25 x 25": 5, "36 x 36": 6}
+SHUFFLED = [
+    (subtype, seed)
+    for subtype in SQUARE_BOXES
+    for seed in range(3 if subtype == "9 x 9" else 2)
+]
+
+
+@pytest.mark.parametrize(("subtype", "seed"), SHUFFLED)
+def test_canonicalise_finds_equivalent_puzzles(subtype, seed):
+    rng = random.Random(seed)
+    spec = common_ps.PuzzleSpec(subtype)
+    box = SQUARE_BOXES[subtype]
+    n = spec.dimension
+    for _, _, grid, _ in solving_fixtures.load(subtype, ("trivial", "easy")):
+        labels = [0, *rng.sample(range(1, n + 1), n)]
+        rows = [
+            band * box + row
+            for band in rng.sample(range(box), box)
+            for row in rng.sample(range(box), box)
+        ]
+        cols = [
+            stack * box + col
+            for stack in rng.sample(range(box), box)
+            for col in rng.sample(range(box), box)
+        ]
+        shuffled = [[labels[grid[row][col]] for col in cols] for row in rows]
+        if seed % 2:
+            shuffled = [list(col) for col in zip(*shuffled)]
+
+        canonical, _ = solving_symmetry.canonicalise(spec, grid)
+        shuffled_canonical, _ = solving_symmetry.canonicalise(spec, shuffled)
+        assert shuffled_canonical == canonical
@@ -0,0 +1,92 @@
+import json
+
+import pytest
+
+import solvd.sudoku.common.puzzle_spec as common_ps
+import solvd.sudoku.solving.fixtures as solving_fixtures
+import solvd.sudoku.solving.headless as solving_headless
+import solvd.sudoku.solving.timing as solving_timing
+
+
+@pytest.fixture
+def solves():
+    """Collect the durations of the solves finished during a test."""
+    calls = []
+
+    def listener(subtype, durations):
+        calls.append((subtype, durations))
+
+    solving_timing.add_listener(listener)
+    yield calls
+    solving_timing.remove_listener(listener)
+
+
+def solve_one(subtype: str = "9 x 9"):
+    _, _, grid, _ = solving_fixtures.load(subtype, ("hard",))[0]
+    solving_headless.solve_grid(common_ps.PuzzleSpec(subtype), grid)
+
+
+def test_no_listeners_records_nothing(monkeypatch):
+    # e.g. SOLVD_TIMING_LOG may have added one
+    monkeypatch.setattr(solving_timing, "listeners", [])
+    monkeypatch.setattr(
+        solving_timing, "timer_class", solving_timing.SolveTimer
+    )
+    assert solving_timing.start("9 x 9") is solving_timing.NULL_TIMER
+
+
+@pytest.mark.parametrize("engine", ["glucose", "bitboard"])
+def test_listener_gets_every_stage(solves, engine):
+    _, _, grid, _ = solving_fixtures.load("9 x 9", ("hard",))[0]
+    spec = common_ps.PuzzleSpec("9 x 9")
+    solving_headless.solve_grid(spec, grid, engine=engine)
+    [(subtype, durations)] = solves
+    assert subtype == "9 x 9"
+    stages = {"solve", "decode"}
+    if engine == "glucose":
+        stages |= {"clauses", "preprocess", "load"}
+    assert stages <= set(durations)
+    assert all(duration >= 0 for duration in durations.values())
+
+
+def test_removed_listener_is_not_called(solves):
+    calls = []
+    solving_timing.add_listener(calls.append)
+    solving_timing.remove_listener(calls.append)
+    solve_one()
+    assert not calls
+    assert len(solves) == 1
+    with pytest.raises(ValueError):
+        solving_timing.remove_listener(calls.append)
+
+
+def test_listener_added_while_finishing(solves):
+    added = []
+
+    def add_another(subtype, durations):
+        solving_timing.add_listener(added.append)
+
+    solving_timing.add_listener(add_another)
+    try:
+        # the new listener only hears about later solves
+        solve_one()
+    finally:
+        solving_timing.remove_listener(add_another)
+        solving_timing.remove_listener(added.append)
+    assert not added
+
+
+def test_json_log(tmp_path):
+    path = tmp_path / "timing.jsonl"
+    logger = solving_timing.enable_json_log(str(path))
+    try:
+        solve_one("9 x 9")
+        solve_one("Samurai Sudoku")
+    finally:
+        solving_timing.remove_listener(logger)
+    solve_one()
+    lines = [json.loads(line) for line in path.read_text().splitlines()]
+    assert [line["subtype"] for line in lines] == ["9 x 9", "Samurai Sudoku"]
+    for line in lines:
+        assert line["event"] == "solve_timing"
+        assert line["total"] == pytest.approx(sum(line["stages"].values()))
@@ -0,0 +1,269 @@
+import random
+
+import pytest
+
+import solvd.sudoku.common.puzzle_spec as common_ps
+import solvd.sudoku.common.sudoku_var as common_sv
+import solvd.sudoku.solving.headless as solving_headless
+import solvd.sudoku.solving.solution as solving_sltn
+from tests import checks
+
+SIZE = 9
+CELLS = [(row, col) for row in range(SIZE) for col in range(SIZE)]
+
+
+def neighbours() -> list[tuple[tuple[int, int], tuple[int, int]]]:
+    """List every pair of cells sharing an edge."""
+    return [
+        ((row, col), (row + row_step, col + col_step))
+        for row, col in CELLS
+        for row_step, col_step in ((0, 1), (1, 0))
+        if row + row_step < SIZE and col + col_step < SIZE
+    ]
+
+
+def value(solution: list[list[int]], cell: tuple[int, int]) -> int:
+    return solution[cell[0]][cell[1]]
+
+
+def make_cages(rng, solution):
+    free = set(CELLS)
+    cages = []
+    while free:
+        cells = [rng.choice(sorted(free))]
+        free.discard(cells[0])
+        values = {value(solution, cells[0])}
+        for _ in range(rng.randint(0, 4)):
+            options = sorted(
+                (row + row_step, col + col_step)
+                for row, col in cells
+                for row_step, col_step in ((0, 1), (1, 0), (0, -1), (-1, 0))
+                if (row + row_step, col + col_step) in free
+                and solution[row + row_step][col + col_step] not in values
+            )
+            if not options:
+                break
+            cell = rng.choice(options)
+            cells.append(cell)
+            free.discard(cell)
+            values.add(value(solution, cell))
+        total = sum(value(solution, cell) for cell in cells)
+        cages.append(common_sv.Cage(cells, total))
+    return cages
+
+
+def follows_cages(solution, cages):
+    return all(
+        sum(value(solution, cell) for cell in cage.cells) == cage.total
+        and len({value(solution, cell) for cell in cage.cells})
+        == len(cage.cells)
+        for cage in cages
+    )
+
+
+def break_cages(rng, cages):
+    cage = rng.choice(cages)
+    cage.total += 1
+
+
+def make_diagonals(rng, solution):
+    lines = [
+        common_sv.Diagonal((row, col), (row_step, col_step), 0)
+        for row, col in CELLS
+        for row_step in (1, -1)
+        for col_step in (1, -1)
+        if not (0 <= row - row_step < SIZE and 0 <= col - col_step < SIZE)
+    ]
+    diagonals = rng.sample(lines, 10)
+    for diagonal in diagonals:
+        diagonal.total = sum(
+            value(solution, cell) for cell in diagonal.cells(SIZE)
+        )
+    return diagonals
+
+
+def follows_diagonals(solution, diagonals):
+    return all(
+        sum(value(solution, cell) for cell in diagonal.cells(SIZE))
+        == diagonal.total
+        for diagonal in diagonals
+    )
+
+
+def break_diagonals(rng, diagonals):
+    diagonal = rng.choice(diagonals)
+    diagonal.total += 1
+
+
+def make_inequalities(rng, solution):
+    return [
+        common_sv.Inequality(first, second)
+        if value(solution, first) > value(solution, second)
+        else common_sv.Inequality(second, first)
+        for first, second in neighbours()
+        if first[0] // 3 == second[0] // 3 and first[1] // 3 == second[1] // 3
+    ]
+
+
+def follows_inequalities(solution, inequalities):
+    return all(
+        value(solution, inequality.greater) > value(solution, inequality.lesser)
+        for inequality in inequalities
+    )
+
+
+def break_inequalities(rng, inequalities):
+    inequality = rng.choice(inequalities)
+    inequality.greater, inequality.lesser = (
+        inequality.lesser,
+        inequality.greater,
+    )
+
+
+def make_bars(rng, solution):
+    return [
+        common_sv.ConsecutivePair(cells)
+        for cells in neighbours()
+        if abs(value(solution, cells[0]) - value(solution, cells[1])) == 1
+    ]
+
+
+def follows_bars(solution, bars):
+    marked = {frozenset(bar.cells) for bar in bars}
+    return all(
+        (abs(value(solution, first) - value(solution, second)) == 1)
+        == (frozenset((first, second)) in marked)
+        for first, second in neighbours()
+    )
+
+
+def break_bars(rng, bars):
+    bars.remove(rng.choice(bars))
+
+
+def make_marks(rng, solution):
+    return [
+        common_sv.XVMark(cells, total)
+        for cells in neighbours()
+        if (total := value(solution, cells[0]) + value(solution, cells[1]))
+        in common_sv.XVMark.LETTERS
+    ]
+
+
+def follows_marks(solution, marks):
+    totals = {frozenset(mark.cells): mark.total for mark in marks}
+    for first, second in neighbours():
+        total = value(solution, first) + value(solution, second)
+        mark = totals.get(frozenset((first, second)))
+        if total != mark and (mark is not None or total in (5, 10)):
+            return False
+    return True
+
+
+def break_marks(rng, marks):
+    marks.remove(rng.choice(marks))
+
+
+def visible(heights: list[int]) -> int:
+    tallest = 0
+    count = 0
+    for height in heights:
+        if height > tallest:
+            count += 1
+            tallest = height
+    return count
+
+
+def make_skyscraper_clues(rng, solution):
+    clues = []
+    for i in range(SIZE):
+        for start, direction in (
+            ((0, i), (1, 0)),
+            ((SIZE - 1, i), (-1, 0)),
+            ((i, 0), (0, 1)),
+            ((i, SIZE - 1), (0, -1)),
+        ):
+            clue = common_sv.SkyscraperClue(start, direction, 0)
+            clue.visible = visible(
+                [value(solution, cell) for cell in clue.cells(SIZE)]
+            )
+            clues.append(clue)
+    return clues
+
+
+def follows_skyscraper_clues(solution, clues):
+    return all(
+        visible([value(solution, cell) for cell in clue.cells(SIZE)])
+        == clue.visible
+        for clue in clues
+    )
+
+
+def break_skyscraper_clues(rng, clues):
+    clue = rng.choice(clues)
+    clue.visible = clue.visible % SIZE + 1
+
+
+# for each variant: making constraints which a solution follows, checking
+# them independently of the clauses, and changing one so it is broken
+VARIANTS = {
+    "Killer Sudoku": (make_cages, follows_cages, break_cages),
+    "Little Killer Sudoku": (
+        make_diagonals,
+        follows_diagonals,
+        break_diagonals,
+    ),
+    "Greater Than Sudoku": (
+        make_inequalities,
+        follows_inequalities,
+        break_inequalities,
+    ),
+    "Consecutive Sudoku": (make_bars, follows_bars, break_bars),
+    "Sudoku XV": (make_marks, follows_marks, break_marks),
+    "Skyscraper Sudoku": (
+        make_skyscraper_clues,
+        follows_skyscraper_clues,
+        break_skyscraper_clues,
+    ),
+}
+CASES = [
+    (subtype, pb_encoding, seed)
+    for subtype in VARIANTS
+    for pb_encoding in (
+        common_ps.PB_ENCODINGS
+        if subtype == "Little Killer Sudoku"
+        else common_ps.PB_ENCODINGS[:1]
+    )
+    for seed in range(3)
+]
+
+
+@pytest.mark.parametrize(("subtype", "pb_encoding", "seed"), CASES)
+def test_variant_is_complete(subtype, pb_encoding, seed):
+    make, follows, _ = VARIANTS[subtype]
+    rng = random.Random(seed)
+    solution = checks.random_solution(rng)
+    constraints = make(rng, solution)
+    assert follows(solution, constraints)
+    spec = common_ps.PuzzleSpec(subtype, constraints, pb_encoding)
+
+    assert solving_headless.solve_grid(spec, solution) == solution
+
+    grid = checks.some_clues(rng, solution, 0.3)
+    found = solving_headless.solve_grid(spec, grid)
+    checks.assert_valid(spec, grid, found)
+    assert follows(found, constraints)
+
+
+@pytest.mark.parametrize(("subtype", "pb_encoding", "seed"), CASES)
+def test_variant_is_sound(subtype, pb_encoding, seed):
+    make, follows, break_one = VARIANTS[subtype]
+    rng = random.Random(seed)
+    solution = checks.random_solution(rng)
+    constraints = make(rng, solution)
+    break_one(rng, constraints)
+    assert not follows(solution, constraints)
+    spec = common_ps.PuzzleSpec(subtype, constraints, pb_encoding)
+
+    found = solving_headless.solve_grid(spec, solution)
+    assert found == solving_sltn.UNSOLVABLE